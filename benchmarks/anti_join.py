@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+# thoth-storages
+# Copyright(C) 2019 Fridolin Pokorny
+#
+# This program is free software: you can redistribute it and / or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+"""Benchmark queries for unsolved and unanalyzed packages using NOT IN filters and anti-joins.
+
+The benchmark seeds the database the adapter is configured to (see GraphDatabase configuration) with Python package
+version entities, solved packages and package-analyzer runs. Use an empty database dedicated to the benchmark.
+
+  python3 benchmarks/anti_join.py --seed --entities 2000000
+"""
+
+import logging
+import time
+from typing import Callable
+from typing import Dict
+from typing import Tuple
+
+import click
+from sqlalchemy import func
+from sqlalchemy import tuple_
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import Query
+from sqlalchemy.orm.session import Session
+
+from thoth.storages import GraphDatabase
+from thoth.storages.graph.models import PackageAnalyzerRun
+from thoth.storages.graph.models import PythonPackageIndex
+from thoth.storages.graph.models import PythonPackageVersion
+from thoth.storages.graph.models import PythonPackageVersionEntity
+
+_LOGGER = logging.getLogger("thoth.storages.benchmarks.anti_join")
+
+_OS_NAME = "fedora"
+_OS_VERSION = "31"
+_PYTHON_VERSIONS = ("3.6", "3.7", "3.8")
+_INDEX_URL = "https://pypi.org/simple"
+
+
+def _seed(graph: GraphDatabase, entities: int, solved_ratio: float, analyzed_ratio: float) -> None:
+    """Seed the database with entities, solved packages and package-analyzer runs."""
+    with graph._engine.begin() as connection:
+        index_id = connection.execute(
+            "INSERT INTO python_package_index (url, warehouse_api_url, verify_ssl, enabled) "
+            "VALUES (%s, NULL, true, true) RETURNING id",
+            _INDEX_URL,
+        ).scalar()
+
+        _LOGGER.info("Seeding %d Python package version entities", entities)
+        connection.execute(
+            "INSERT INTO python_package_version_entity (package_name, package_version, python_package_index_id) "
+            "SELECT 'package-' || (i / 20), (i % 20) || '.0.0', %s FROM generate_series(1, %s) AS i",
+            index_id,
+            entities,
+        )
+
+        for python_version in _PYTHON_VERSIONS:
+            _LOGGER.info("Seeding solved packages for Python %s", python_version)
+            connection.execute(
+                "INSERT INTO python_package_version "
+                "(package_name, package_version, os_name, os_version, python_version, entity_id, "
+                "python_package_index_id) "
+                "SELECT package_name, package_version, %s, %s, %s, id, python_package_index_id "
+                "FROM python_package_version_entity WHERE random() < %s",
+                _OS_NAME,
+                _OS_VERSION,
+                python_version,
+                solved_ratio,
+            )
+
+        _LOGGER.info("Seeding package-analyzer runs")
+        connection.execute(
+            "INSERT INTO package_analyzer_run "
+            "(package_analysis_document_id, datetime, debug, package_analyzer_error, "
+            "input_python_package_version_entity_id) "
+            "SELECT 'package-analyzer-' || id, now(), false, false, id "
+            "FROM python_package_version_entity WHERE random() < %s",
+            analyzed_ratio,
+        )
+
+    with graph._engine.connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+        connection.execute("VACUUM ANALYZE")
+
+
+def _not_in_unsolved_query(session: Session, python_version: str) -> Query:
+    """Construct query for unsolved Python package versions filtering using NOT IN."""
+    subquery = (
+        session.query(PythonPackageVersion)
+        .join(PythonPackageIndex)
+        .filter(PythonPackageVersion.os_name == _OS_NAME)
+        .filter(PythonPackageVersion.os_version == _OS_VERSION)
+        .filter(PythonPackageVersion.python_version == python_version)
+        .with_entities(PythonPackageVersion.entity_id)
+        .subquery()
+    )
+
+    return (
+        session.query(PythonPackageVersionEntity)
+        .filter(tuple_(PythonPackageVersionEntity.id).notin_(subquery))
+        .join(PythonPackageIndex)
+        .with_entities(
+            PythonPackageVersionEntity.package_name,
+            PythonPackageVersionEntity.package_version,
+            PythonPackageIndex.url,
+        )
+    )
+
+
+def _not_in_unanalyzed_query(session: Session) -> Query:
+    """Construct query for unanalyzed Python package versions filtering using NOT IN."""
+    subquery = (
+        session.query(PackageAnalyzerRun)
+        .join(PythonPackageVersionEntity)
+        .join(PythonPackageIndex)
+        .with_entities(
+            PythonPackageVersionEntity.package_name,
+            PythonPackageVersionEntity.package_version,
+            PythonPackageIndex.url,
+        )
+        .subquery()
+    )
+
+    return (
+        session.query(PythonPackageVersionEntity)
+        .join(PythonPackageIndex)
+        .filter(
+            tuple_(
+                PythonPackageVersionEntity.package_name,
+                PythonPackageVersionEntity.package_version,
+                PythonPackageIndex.url,
+            ).notin_(subquery)
+        )
+        .with_entities(
+            PythonPackageVersionEntity.package_name,
+            PythonPackageVersionEntity.package_version,
+            PythonPackageIndex.url,
+        )
+    )
+
+
+def _explain(session: Session, query: Query, repeat: int) -> Tuple[str, float]:
+    """Count results of the given query, return plan of the count query and the best time measured."""
+    count_query = session.query(func.count()).select_from(query.subquery())
+    statement = str(
+        count_query.statement.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True})
+    )
+
+    plan = "\n".join(row[0] for row in session.execute(f"EXPLAIN (ANALYZE, BUFFERS) {statement}"))
+
+    best = None
+    for _ in range(repeat):
+        start = time.monotonic()
+        session.execute(statement).scalar()
+        duration = time.monotonic() - start
+        best = duration if best is None else min(best, duration)
+
+    return plan, best
+
+
+@click.command()
+@click.option("--seed", is_flag=True, help="Seed the database with data before running the benchmark.")
+@click.option("--entities", type=int, default=2_000_000, show_default=True, help="Number of entities to seed.")
+@click.option(
+    "--solved-ratio", type=float, default=0.5, show_default=True, help="Ratio of entities solved per environment."
+)
+@click.option("--analyzed-ratio", type=float, default=0.3, show_default=True, help="Ratio of entities analyzed.")
+@click.option("--repeat", type=int, default=3, show_default=True, help="Number of runs of each query.")
+def cli(seed: bool, entities: int, solved_ratio: float, analyzed_ratio: float, repeat: int) -> None:
+    """Benchmark queries for unsolved and unanalyzed packages using NOT IN filters and anti-joins."""
+    logging.basicConfig(level=logging.INFO)
+
+    graph = GraphDatabase()
+    graph.connect()
+
+    if seed:
+        _seed(graph, entities, solved_ratio, analyzed_ratio)
+
+    python_version = _PYTHON_VERSIONS[0]
+    benchmarks: Dict[str, Tuple[Callable[[Session], Query], Callable[[Session], Query]]] = {
+        "unsolved Python package versions": (
+            lambda session: _not_in_unsolved_query(session, python_version),
+            lambda session: graph._construct_unsolved_python_package_versions_query(
+                session, os_name=_OS_NAME, os_version=_OS_VERSION, python_version=python_version
+            ),
+        ),
+        "unanalyzed Python package versions": (
+            _not_in_unanalyzed_query,
+            graph._construct_unanalyzed_python_package_versions_query,
+        ),
+    }
+
+    with graph._session_scope() as session:
+        for name, (not_in_query, anti_join_query) in benchmarks.items():
+            for variant, construct_query in (("NOT IN", not_in_query), ("anti-join", anti_join_query)):
+                plan, duration = _explain(session, construct_query(session), repeat)
+                click.echo(f"=== {name} using {variant}: {duration:.3f}s\n{plan}\n")
+
+
+if __name__ == "__main__":
+    cli()
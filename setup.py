@@ -93,6 +93,12 @@ setup(
     },
     zip_safe=False,
     install_requires=get_install_requires(),
+    extras_require={
+        # Incremental parsing of documents retrieved streamed.
+        'ijson': ['ijson'],
+        # Documents encoded using json+zstd codec.
+        'zstd': ['zstandard'],
+    },
     tests_require=get_test_requires(),
     cmdclass={'test': Test},
     entry_points={
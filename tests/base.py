@@ -92,17 +92,48 @@ class StorageBaseTest(ThothStoragesTest):
         # Just check that the request is properly propagated.
         flexmock(adapter.ceph). \
             should_receive('iterate_results'). \
-            with_args(). \
+            with_args(concurrency=None). \
             and_return(None). \
             once()
         assert adapter.iterate_results() is None
 
+    def test_iterate_results_concurrency(self, adapter):
+        """Test iterating over results stored on Ceph retrieved concurrently."""
+        # Just check that the request is properly propagated.
+        flexmock(adapter.ceph). \
+            should_receive('iterate_results'). \
+            with_args(concurrency=4). \
+            and_return(None). \
+            once()
+        assert adapter.iterate_results(concurrency=4) is None
+
+    def test_retrieve_many(self, adapter):
+        """Test retrieving documents stored on Ceph concurrently."""
+        # Just check that the request is properly propagated.
+        document_ids = ['foo', 'bar']
+        flexmock(adapter.ceph). \
+            should_receive('retrieve_many'). \
+            with_args(document_ids, concurrency=2, max_in_flight_bytes=1024). \
+            and_return(None). \
+            once()
+        assert adapter.retrieve_many(document_ids, concurrency=2, max_in_flight_bytes=1024) is None
+
     def test_get_document_listing(self, adapter):
         """Test document listing for build logs stored on Ceph."""
         # Just check that the request is properly propagated.
         flexmock(adapter.ceph). \
             should_receive('get_document_listing'). \
-            with_args(). \
+            with_args(start_after=None, limit=None, prefix=''). \
             and_return(None). \
             once()
         assert adapter.get_document_listing() is None
+
+    def test_get_document_listing_start_after(self, adapter):
+        """Test document listing starting after the given document for results stored on Ceph."""
+        # Just check that the request is properly propagated.
+        flexmock(adapter.ceph). \
+            should_receive('get_document_listing'). \
+            with_args(start_after='foo', limit=10, prefix='bar'). \
+            and_return(None). \
+            once()
+        assert adapter.get_document_listing(start_after='foo', limit=10, prefix='bar') is None
@@ -18,15 +18,21 @@
 
 """This is the tests."""
 
+import hashlib
+import zlib
+from types import SimpleNamespace
+
 import flexmock
 import pytest
 
 from thoth.storages import BuildLogsStore
+from thoth.storages import buildlogs
 
 from .base import StorageBaseTest
 from .test_ceph import CEPH_ENV_MAP
 from .test_ceph import CEPH_INIT_ENV
 from .test_ceph import CEPH_INIT_KWARGS
+from .utils import connected_ceph_adapter
 from .utils import with_adjusted_env
 
 _BUILDLOGS_INIT_KWARGS = {
@@ -113,3 +119,126 @@ class TestBuildLogsStore(StorageBaseTest):
             and_return(document_id). \
             once()
         assert adapter.store_document(document) == document_id
+
+    # Build logs stored in chunks are reassembled, results retrieved from Ceph are not returned as they are.
+
+    def test_iterate_results(self, adapter):
+        """Test iterating over results for build logs stored on Ceph."""
+        flexmock(adapter.ceph). \
+            should_receive('iterate_results'). \
+            with_args(concurrency=None). \
+            and_return(iter([('foo', {'foo': 'bar'})])). \
+            once()
+        assert list(adapter.iterate_results()) == [('foo', {'foo': 'bar'})]
+
+    def test_iterate_results_concurrency(self, adapter):
+        """Test iterating over results stored on Ceph retrieved concurrently."""
+        flexmock(adapter.ceph). \
+            should_receive('iterate_results'). \
+            with_args(concurrency=4). \
+            and_return(iter([('foo', {'foo': 'bar'})])). \
+            once()
+        assert list(adapter.iterate_results(concurrency=4)) == [('foo', {'foo': 'bar'})]
+
+    def test_retrieve_many(self, adapter):
+        """Test retrieving documents stored on Ceph concurrently."""
+        document_ids = ['foo', 'bar']
+        flexmock(adapter.ceph). \
+            should_receive('retrieve_many'). \
+            with_args(document_ids, concurrency=2, max_in_flight_bytes=1024). \
+            and_return(iter([('bar', {}), ('foo', {'foo': 'bar'})])). \
+            once()
+        assert list(adapter.retrieve_many(document_ids, concurrency=2, max_in_flight_bytes=1024)) == [
+            ('bar', {}),
+            ('foo', {'foo': 'bar'}),
+        ]
+
+    def test_store_document_chunked(self, adapter):
+        """Test storing build logs in content addressed chunks."""
+        adapter.chunked = True
+        log = ''.join(f"Collecting package-{i}\n  Downloading package-{i}.tar.gz\n" for i in range(20000))
+        document1 = {'build_log': log}
+        document2 = {'build_log': 'Step 1/3 : FROM fedora\n' + log}
+        with connected_ceph_adapter(adapter) as connected_adapter:
+            document1_id = connected_adapter.store_document(document1)
+            chunk_count = len(list(connected_adapter.chunks_ceph.get_document_listing()))
+            assert chunk_count > 1
+
+            document2_id = connected_adapter.store_document(document2)
+            # Chunks shared by build logs are stored once.
+            assert len(list(connected_adapter.chunks_ceph.get_document_listing())) < 2 * chunk_count
+
+            # Ids are the same as if build logs were not stored in chunks.
+            assert document1_id == hashlib.sha256(connected_adapter.ceph.dict2blob(document1)).hexdigest()
+            assert sorted(connected_adapter.get_document_listing()) == sorted([document1_id, document2_id])
+            assert connected_adapter.retrieve_document(document1_id) == document1
+            assert dict(connected_adapter.iterate_results(concurrency=2)) == {
+                document1_id: document1,
+                document2_id: document2,
+            }
+
+            # Build logs stored before are read as they are.
+            connected_adapter.chunked = False
+            document3 = {'build_log': 'foo'}
+            document3_id = connected_adapter.store_document(document3)
+            assert dict(connected_adapter.retrieve_many([document3_id, document2_id])) == {
+                document2_id: document2,
+                document3_id: document3,
+            }
+
+    def test_store_document_chunked_appended(self, adapter):
+        """Test storing a build log with lines appended uploads only chunks with the appended lines."""
+        adapter.chunked = True
+        log = ''.join(f"Collecting package-{i}\n  Downloading package-{i}.tar.gz\n" for i in range(20000))
+        appended = ''.join(f"Installing package-{i}\n" for i in range(2000))
+        with connected_ceph_adapter(adapter) as connected_adapter:
+            document1_id = connected_adapter.store_document({'build_log': log})
+            chunk_ids1 = connected_adapter.ceph.retrieve_document(document1_id)['chunked-build-log']['chunks']
+
+            chunk_count = len(list(connected_adapter.chunks_ceph.get_document_listing()))
+            document2_id = connected_adapter.store_document({'build_log': log + appended})
+            chunk_ids2 = connected_adapter.ceph.retrieve_document(document2_id)['chunked-build-log']['chunks']
+
+            # Only the last chunk, closing the JSON document, differs in the common part of both build logs.
+            assert chunk_ids2[:len(chunk_ids1) - 1] == chunk_ids1[:-1]
+            new_chunk_ids = chunk_ids2[len(chunk_ids1) - 1:]
+            assert len(list(connected_adapter.chunks_ceph.get_document_listing())) == chunk_count + len(new_chunk_ids)
+            assert connected_adapter.retrieve_document(document2_id) == {'build_log': log + appended}
+
+
+@pytest.mark.parametrize('first_line_size', [100, 1000])
+def test_iter_chunks_lines_checksummed(first_line_size):
+    """Test chunks end only with lines checksummed as a whole, also if the first line is longer than minimal size."""
+    blob = b'x' * first_line_size + b'\\n' + b''.join(b'line %d\\n' % i for i in range(1000))
+    checksummed = []
+
+    def crc32(data):
+        checksummed.append(bytes(data))
+        return zlib.crc32(data)
+
+    flexmock(buildlogs, zlib=SimpleNamespace(crc32=crc32))
+    chunks = list(buildlogs._iter_chunks(blob, 64, 256, 1024))
+
+    assert b''.join(chunks) == blob
+    assert checksummed[0] == b'x' * first_line_size + b'\\n'
+    for line in checksummed[1:]:
+        assert line.startswith(b'line ') and line.endswith(b'\\n')
+        assert line.count(b'\\n') == 1
+
+
+def test_iter_chunks_long_line():
+    """Test lines longer than the maximal size are checksummed only in their part close to the chunk."""
+    blob = b'line\\n' * 100 + b'x' * 5000 + b'\\n' + b'line\\n' * 100
+    checksummed = []
+
+    def crc32(data):
+        checksummed.append(bytes(data))
+        return zlib.crc32(data)
+
+    flexmock(buildlogs, zlib=SimpleNamespace(crc32=crc32))
+    chunks = list(buildlogs._iter_chunks(blob, 64, 256, 1024))
+
+    assert b''.join(chunks) == blob
+    assert all(len(chunk) <= 1024 for chunk in chunks)
+    # At most the maximal size before the minimal size and the maximal size after the chunk start.
+    assert all(len(line) <= 2 * 1024 for line in checksummed)
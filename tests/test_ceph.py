@@ -18,10 +18,13 @@
 
 """This is the tests."""
 
+import io
+
 import pytest
 from moto import mock_s3
 
 from thoth.storages import CephStore
+from thoth.storages.ceph import StreamedSection
 from thoth.storages.exceptions import NotFoundError
 
 from .base import ThothStoragesTest
@@ -129,6 +132,63 @@ class TestCephStore(ThothStoragesTest):
         assert document1_id in document_listing
         assert document2_id in document_listing
 
+    def test_get_document_listing_start_after(self, connected_adapter):
+        """Test listing of documents stored on Ceph starting after the given document."""
+        for document_id in ('a', 'b', 'c'):
+            connected_adapter.store_document({'foo': document_id}, document_id)
+
+        assert list(connected_adapter.get_document_listing(start_after='a')) == ['b', 'c']
+        assert list(connected_adapter.get_document_listing(start_after='c')) == []
+
+    def test_get_document_listing_limit_prefix(self, connected_adapter):
+        """Test listing of documents stored on Ceph limited in number of documents and by prefix."""
+        for document_id in ('a-1', 'a-2', 'a-3', 'b-1'):
+            connected_adapter.store_document({'foo': document_id}, document_id)
+
+        assert list(connected_adapter.get_document_listing(limit=2)) == ['a-1', 'a-2']
+        assert list(connected_adapter.get_document_listing(limit=0)) == []
+        assert list(connected_adapter.get_document_listing(prefix='b')) == ['b-1']
+        assert list(connected_adapter.get_document_listing(start_after='a-1', limit=1, prefix='a')) == ['a-2']
+        assert list(connected_adapter.get_document_listing(start_after='a-3', prefix='a')) == []
+
+    def test_get_document_count(self, connected_adapter):
+        """Test counting documents stored on Ceph."""
+        assert connected_adapter.get_document_count() == 0
+
+        for document_id in ('a-1', 'a-2', 'b-1'):
+            connected_adapter.store_document({'foo': document_id}, document_id)
+
+        assert connected_adapter.get_document_count() == 3
+        assert connected_adapter.get_document_count(prefix='a') == 2
+
+    @pytest.mark.parametrize('max_in_flight_bytes', [None, 1])
+    def test_retrieve_many(self, connected_adapter, max_in_flight_bytes):
+        """Test retrieving documents concurrently, also with documents exceeding in-flight bytes budget."""
+        documents = {str(idx): {'foo': idx} for idx in range(10)}
+        for document_id, document in documents.items():
+            connected_adapter.store_document(document, document_id)
+
+        result = connected_adapter.retrieve_many(
+            list(documents), concurrency=3, max_in_flight_bytes=max_in_flight_bytes
+        )
+        assert dict(result) == documents
+
+    def test_retrieve_many_not_found(self, connected_adapter):
+        """Test retrieving documents concurrently when a document does not exist."""
+        connected_adapter.store_document({'foo': 'bar'}, 'foo')
+
+        with pytest.raises(NotFoundError):
+            list(connected_adapter.retrieve_many(['foo', 'bar'], concurrency=2))
+
+    def test_iterate_results_concurrency(self, connected_adapter):
+        """Test iterating over results retrieved concurrently."""
+        documents = {str(idx): {'foo': idx} for idx in range(10)}
+        for document_id, document in documents.items():
+            connected_adapter.store_document(document, document_id)
+
+        assert dict(connected_adapter.iterate_results(concurrency=4)) == documents
+        assert dict(connected_adapter.iterate_results()) == documents
+
     def test_test_store_blob(self, connected_adapter):
         """Test storing binary objects onto Ceph."""
         blob = b'foo'
@@ -136,6 +196,39 @@ class TestCephStore(ThothStoragesTest):
         connected_adapter.store_blob(blob, key)
         assert connected_adapter.retrieve_blob(key) == blob
 
+    def test_store_blob_multipart(self, connected_adapter):
+        """Test storing binary objects larger than multipart threshold onto Ceph."""
+        # S3 requires parts of multipart uploads to be at least 5MiB.
+        connected_adapter.multipart_threshold = 5 * 1024 * 1024
+        connected_adapter.multipart_chunksize = 5 * 1024 * 1024
+        blob = bytes(range(256)) * (11 * 4096)
+        key = 'some-key'
+        assert connected_adapter.store_blob(blob, key) is None
+        assert connected_adapter.retrieve_blob(key) == blob
+        # ETag of objects uploaded in multiple parts states number of parts.
+        s3_object = connected_adapter._s3.Object(connected_adapter.bucket, f"{connected_adapter.prefix}{key}")
+        assert s3_object.e_tag.strip('"').endswith('-3')
+
+    @pytest.mark.parametrize('size', [3, 11 * 1024 * 1024])
+    def test_store_blob_file(self, connected_adapter, size):
+        """Test storing file-like objects onto Ceph."""
+        connected_adapter.multipart_threshold = 5 * 1024 * 1024
+        connected_adapter.multipart_chunksize = 5 * 1024 * 1024
+        blob = b'x' * size
+        key = 'some-key'
+        connected_adapter.store_blob(io.BytesIO(blob), key)
+        assert connected_adapter.retrieve_blob(key) == blob
+
+    @pytest.mark.parametrize('chunk_count', [0, 1, 3])
+    def test_store_blob_iterable(self, connected_adapter, chunk_count):
+        """Test storing binary objects streamed in chunks onto Ceph."""
+        connected_adapter.multipart_threshold = 5 * 1024 * 1024
+        connected_adapter.multipart_chunksize = 5 * 1024 * 1024
+        chunks = [bytes([idx]) * (3 * 1024 * 1024) for idx in range(chunk_count)]
+        key = 'some-key'
+        connected_adapter.store_blob(iter(chunks), key)
+        assert connected_adapter.retrieve_blob(key) == b''.join(chunks)
+
     def test_store_document(self, connected_adapter):
         """Test storing document on Ceph."""
         document, key = {'thoth': 'is awesome! ;-)'}, 'my-key'
@@ -144,6 +237,65 @@ class TestCephStore(ThothStoragesTest):
         connected_adapter.store_document(document, key)
         assert connected_adapter.retrieve_document(key) == document
 
+    @pytest.mark.parametrize('codec', ['json', 'json+gzip', 'json+zstd'])
+    def test_store_document_codec(self, connected_adapter, codec):
+        """Test storing document on Ceph encoded using the given codec."""
+        if codec == 'json+zstd':
+            pytest.importorskip('zstandard')
+
+        connected_adapter.codec = codec
+        document, key = {'thoth': 'is awesome! ;-)', 'items': list(range(100))}, 'my-key'
+        connected_adapter.store_document(document, key)
+
+        s3_object = connected_adapter._s3.Object(connected_adapter.bucket, f"{connected_adapter.prefix}{key}")
+        assert s3_object.metadata == {'codec': codec}
+        assert connected_adapter.retrieve_document(key) == document
+        assert dict(connected_adapter.retrieve_many([key])) == {key: document}
+
+    def test_retrieve_document_without_codec(self, connected_adapter):
+        """Test retrieving documents stored without codec recorded."""
+        document, key = {'thoth': 'is awesome! ;-)'}, 'my-key'
+        connected_adapter.store_blob(connected_adapter.dict2blob(document), key)
+        assert connected_adapter.retrieve_document(key) == document
+        assert dict(connected_adapter.retrieve_many([key])) == {key: document}
+
+    @pytest.mark.parametrize('codec', ['json', 'json+gzip'])
+    def test_retrieve_document_streamed(self, connected_adapter, codec):
+        """Test retrieving documents with sections parsed incrementally."""
+        pytest.importorskip('ijson')
+
+        connected_adapter.codec = codec
+        document = {
+            'metadata': {'hostname': 'localhost', 'duration': 1.5},
+            'result': {
+                'items': [{'name': 'foo', 'values': [1, 2]}, {'name': 'bar', 'values': []}],
+                'mapping': {'foo': ['a', 'b'], 'bar': []},
+                'nothing': None,
+                'rest': [1, 2, 3],
+            }
+        }
+        key = 'my-key'
+        connected_adapter.store_document(document, key)
+
+        streamed_paths = ('result.items', 'result.mapping', 'result.nothing')
+        streamed_document = connected_adapter.retrieve_document_streamed(key, streamed_paths)
+        assert streamed_document['metadata'] == document['metadata']
+        assert streamed_document['result']['rest'] == document['result']['rest']
+        for path in streamed_paths:
+            assert isinstance(streamed_document['result'][path.split('.')[-1]], StreamedSection)
+
+        # Sections can be iterated over multiple times.
+        for _ in range(2):
+            assert list(streamed_document['result']['items']) == document['result']['items']
+            assert dict(streamed_document['result']['mapping'].items()) == document['result']['mapping']
+            assert list(streamed_document['result']['nothing']) == []
+
+    @with_adjusted_env({**_ENV, 'THOTH_CEPH_CODEC': 'json+foo'})
+    def test_init_unknown_codec(self):
+        """Test initialization of Ceph adapter with an unknown codec."""
+        with pytest.raises(ValueError):
+            CephStore(_BUCKET_PREFIX)
+
     def test_iterate_results_empty(self, connected_adapter):
         assert list(connected_adapter.iterate_results()) == []
 
@@ -0,0 +1,372 @@
+#!/usr/bin/env python3
+# thoth-storages
+# Copyright(C) 2019 Fridolin Pokorny
+#
+# This program is free software: you can redistribute it and / or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+# type: ignore
+
+"""This is the tests."""
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import flexmock
+import pytest
+
+from thoth.storages import ceph_cache
+from thoth.storages.ceph_cache import CephCache
+from thoth.storages.ceph_cache import _BloomFilter
+from thoth.storages.ceph_cache import _LocalCache
+from thoth.storages.exceptions import CacheMiss
+
+from .test_ceph import CEPH_INIT_ENV
+from .test_ceph import CEPH_INIT_KWARGS
+from .utils import connected_ceph_adapter
+from .utils import with_adjusted_env
+
+_DEPLOYMENT_NAME = 'my-deployment'
+_BUCKET_PREFIX = 'prefix'
+
+
+class MyCache(CephCache):
+    """A derived class used in tests with mandatory RESULT_TYPE set."""
+
+    RESULT_TYPE = 'TEST-CACHE'
+
+
+def _get_adapter(env: dict = None) -> MyCache:
+    """Retrieve an adapter to cache configured using the given environment variables."""
+    return with_adjusted_env({**CEPH_INIT_ENV, **(env or {})})(MyCache)(
+        deployment_name=_DEPLOYMENT_NAME, prefix=_BUCKET_PREFIX, **CEPH_INIT_KWARGS
+    )
+
+
+class _FrozenTime:
+    """Time frozen unless explicitly moved forward, substituting the time module in tests of the local cache."""
+
+    def __init__(self):
+        self.now = 1000000.0
+
+    def time(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.now += seconds
+
+
+@pytest.fixture(name='frozen_time')
+def _fixture_frozen_time():
+    """Freeze time seen by the local cache."""
+    frozen_time = _FrozenTime()
+    flexmock(ceph_cache, time=frozen_time)
+    return frozen_time
+
+
+@pytest.fixture(name='adapter')
+def _fixture_adapter():
+    """Retrieve an adapter to cache with bloom filter enabled."""
+    return _get_adapter({'THOTH_STORAGES_CACHE_BLOOM_FILTER': '1'})
+
+
+class TestLocalCache:
+    """Test local tier of cache records."""
+
+    @staticmethod
+    def _get_local_cache(directory=None, **kwargs) -> _LocalCache:
+        """Get local cache with records and misses expiring in 10 and 5 seconds."""
+        return _LocalCache(
+            **{
+                'memory_bytes': 0,
+                'directory': str(directory) if directory else None,
+                'directory_bytes': 0,
+                'ttl': 10,
+                'miss_ttl': 5,
+                **kwargs,
+            }
+        )
+
+    def test_memory_eviction_order(self, frozen_time):
+        """Test least recently used records are evicted first once over the memory limit."""
+        # Each record takes 1 byte for key and 10 bytes for record.
+        local_cache = self._get_local_cache(memory_bytes=33)
+        local_cache.put('a', b'a' * 10)
+        local_cache.put('b', b'b' * 10)
+        local_cache.put('c', b'c' * 10)
+        assert local_cache.get('a') == (True, b'a' * 10)
+
+        local_cache.put('d', b'd' * 10)
+        assert local_cache.get('b') == (False, None)
+        assert local_cache.get('a') == (True, b'a' * 10)
+        assert local_cache.get('c') == (True, b'c' * 10)
+        assert local_cache.get('d') == (True, b'd' * 10)
+
+    def test_memory_too_large(self, frozen_time):
+        """Test records larger than the memory limit are not kept, the previous record is discarded."""
+        local_cache = self._get_local_cache(memory_bytes=10)
+        local_cache.put('a', b'a')
+        local_cache.put('a', b'a' * 10)
+        assert local_cache.get('a') == (False, None)
+
+    @pytest.mark.parametrize('tier', ['memory', 'directory'])
+    def test_ttl(self, frozen_time, tmp_path, tier):
+        """Test records expire after the configured time."""
+        if tier == 'memory':
+            local_cache = self._get_local_cache(memory_bytes=1024)
+        else:
+            local_cache = self._get_local_cache(tmp_path, directory_bytes=1024)
+
+        local_cache.put('a', b'foo')
+        frozen_time.sleep(9)
+        assert local_cache.get('a') == (True, b'foo')
+
+        frozen_time.sleep(1)
+        assert local_cache.get('a') == (False, None)
+        assert os.listdir(tmp_path) == []
+
+    @pytest.mark.parametrize('tier', ['memory', 'directory'])
+    def test_miss_ttl(self, frozen_time, tmp_path, tier):
+        """Test misses are kept and expire sooner than records."""
+        if tier == 'memory':
+            local_cache = self._get_local_cache(memory_bytes=1024)
+        else:
+            local_cache = self._get_local_cache(tmp_path, directory_bytes=1024)
+
+        local_cache.put('a', None)
+        frozen_time.sleep(4)
+        assert local_cache.get('a') == (True, None)
+
+        frozen_time.sleep(1)
+        assert local_cache.get('a') == (False, None)
+
+    def test_miss_ttl_disabled(self, frozen_time):
+        """Test misses are not kept if their time to live is not positive, a record cached before is discarded."""
+        local_cache = self._get_local_cache(memory_bytes=1024, miss_ttl=0)
+        local_cache.put('a', b'foo')
+        local_cache.put('a', None)
+        assert local_cache.get('a') == (False, None)
+
+    def test_directory_size_limit(self, frozen_time, tmp_path):
+        """Test files which expire first are evicted first once the directory grows over its limit."""
+        # Each file holds a prefix byte followed by 40 bytes of record.
+        local_cache = self._get_local_cache(tmp_path, directory_bytes=100)
+        local_cache.put('a', b'a' * 40)
+        frozen_time.sleep(1)
+        local_cache.put('b', b'b' * 40)
+        frozen_time.sleep(1)
+        # Misses expire sooner than records stored before.
+        local_cache.put('c', None)
+        local_cache.put('d', b'd' * 40)
+
+        assert local_cache.get('a') == (False, None)
+        assert local_cache.get('c') == (False, None)
+        assert local_cache.get('b') == (True, b'b' * 40)
+        assert local_cache.get('d') == (True, b'd' * 40)
+        assert sum(entry.stat().st_size for entry in os.scandir(tmp_path)) <= 100
+
+    def test_directory_too_large(self, frozen_time, tmp_path):
+        """Test records larger than the directory limit are not stored, the previous record is discarded."""
+        local_cache = self._get_local_cache(tmp_path, directory_bytes=10)
+        local_cache.put('a', b'a')
+        local_cache.put('a', b'a' * 10)
+        assert local_cache.get('a') == (False, None)
+        assert os.listdir(tmp_path) == []
+
+    def test_directory_shared(self, frozen_time, tmp_path):
+        """Test files stored by other processes are read and counted in the directory size."""
+        local_cache = self._get_local_cache(tmp_path, directory_bytes=100)
+        local_cache.put('a', b'a' * 40)
+        local_cache.put('b', None)
+
+        other_local_cache = self._get_local_cache(tmp_path, directory_bytes=100, memory_bytes=1024)
+        assert other_local_cache.get('a') == (True, b'a' * 40)
+        assert other_local_cache.get('b') == (True, None)
+
+        frozen_time.sleep(1)
+        other_local_cache.put('c', b'c' * 40)
+        other_local_cache.put('d', b'd' * 40)
+        assert local_cache.get('b') == (False, None)
+        assert local_cache.get('a') == (False, None)
+
+        # Records read from directory are kept in memory until they expire.
+        assert other_local_cache.get('a') == (True, b'a' * 40)
+        frozen_time.sleep(9)
+        assert other_local_cache.get('a') == (False, None)
+
+    def test_ceph_cache(self, frozen_time, tmp_path):
+        """Test records and misses retrieved from Ceph are kept in the local cache until they expire."""
+        adapter = _get_adapter(
+            {
+                'THOTH_STORAGES_CACHE_MEMORY_BYTES': '1024',
+                'THOTH_STORAGES_CACHE_DIRECTORY': str(tmp_path),
+                'THOTH_STORAGES_CACHE_TTL': '10',
+                'THOTH_STORAGES_CACHE_MISS_TTL': '5',
+            }
+        )
+        with connected_ceph_adapter(adapter) as connected_adapter:
+            connected_adapter.ceph.store_document({'foo': 'bar'}, 'foo')
+
+            flexmock(connected_adapter).should_call('retrieve_document').with_args('foo').twice()
+            flexmock(connected_adapter).should_call('retrieve_document').with_args('bar').twice()
+            assert connected_adapter.retrieve_document_record('foo') == {'foo': 'bar'}
+            assert connected_adapter.retrieve_document_record('foo') == {'foo': 'bar'}
+            with pytest.raises(CacheMiss):
+                connected_adapter.retrieve_document_record('bar')
+
+            # Records stored by other processes are seen once misses expire.
+            connected_adapter.ceph.store_document({'bar': 'baz'}, 'bar')
+            with pytest.raises(CacheMiss):
+                connected_adapter.retrieve_document_record('bar')
+
+            frozen_time.sleep(5)
+            assert connected_adapter.retrieve_document_records(['foo', 'bar']) == (
+                {'foo': {'foo': 'bar'}, 'bar': {'bar': 'baz'}},
+                set(),
+            )
+
+            frozen_time.sleep(5)
+            assert connected_adapter.retrieve_document_record('foo') == {'foo': 'bar'}
+
+
+class TestBloomFilter:
+    """Test bloom filter of document ids."""
+
+    def test_contains(self):
+        """Test ids added are always present."""
+        bloom_filter = _BloomFilter.for_capacity(1000, 0.01)
+        document_ids = [f'document-{i}' for i in range(1000)]
+        for document_id in document_ids:
+            bloom_filter.add(document_id)
+
+        assert all(document_id in bloom_filter for document_id in document_ids)
+
+    def test_false_positive_rate(self):
+        """Test ids not added are reported present at about the configured rate."""
+        bloom_filter = _BloomFilter.for_capacity(1000, 0.01)
+        for i in range(1000):
+            bloom_filter.add(f'document-{i}')
+
+        false_positives = sum(f'other-{i}' in bloom_filter for i in range(10000))
+        assert false_positives < 10000 * 0.01 * 2
+
+    def test_empty(self):
+        """Test an empty bloom filter reports no ids present."""
+        bloom_filter = _BloomFilter.for_capacity(0, 0.01)
+        assert 'document' not in bloom_filter
+
+    def test_serialization(self):
+        """Test bloom filter serialization round trip."""
+        bloom_filter = _BloomFilter.for_capacity(100, 0.01)
+        bloom_filter.add('foo')
+
+        restored = _BloomFilter.from_bytes(bloom_filter.to_bytes())
+        assert restored.bit_count == bloom_filter.bit_count
+        assert restored.hash_count == bloom_filter.hash_count
+        assert restored.bits == bloom_filter.bits
+        assert 'foo' in restored
+
+
+class TestCephCacheBloomFilter:
+    """Test bulk lookups of cache records using bloom filter snapshots."""
+
+    def test_retrieve_document_records(self, adapter):
+        """Test records missing in the snapshot are reported missing without being retrieved."""
+        with connected_ceph_adapter(adapter) as connected_adapter:
+            connected_adapter.store_document_record('foo', {'foo': 'bar'})
+            assert connected_adapter.build_bloom_filter() == 1
+
+            flexmock(connected_adapter).should_call('retrieve_document').with_args('foo').once()
+            flexmock(connected_adapter).should_call('retrieve_document').with_args('bar').never()
+            assert connected_adapter.retrieve_document_records(['foo', 'bar']) == ({'foo': {'foo': 'bar'}}, {'bar'})
+
+    def test_retrieve_document_records_stored_after_snapshot(self, adapter):
+        """Test records stored after the snapshot was built, also by other processes, are not reported missing."""
+        with connected_ceph_adapter(adapter) as connected_adapter:
+            connected_adapter.store_document_record('foo', {'foo': 'bar'})
+            connected_adapter.build_bloom_filter()
+            assert connected_adapter.retrieve_document_records(['foo', 'bar']) == ({'foo': {'foo': 'bar'}}, {'bar'})
+
+            other_adapter = _get_adapter({'THOTH_STORAGES_CACHE_BLOOM_FILTER': '1'})
+            other_adapter.connect()
+            other_adapter.store_document_record('bar', {'bar': 'baz'})
+
+            assert connected_adapter.retrieve_document_records(['foo', 'bar']) == (
+                {'foo': {'foo': 'bar'}, 'bar': {'bar': 'baz'}},
+                set(),
+            )
+
+    def test_build_bloom_filter_versions(self, adapter):
+        """Test rebuilding the snapshot stores a new version, older versions and markers are removed."""
+        with connected_ceph_adapter(adapter) as connected_adapter:
+            connected_adapter.store_document_record('foo', {'foo': 'bar'})
+            connected_adapter.build_bloom_filter()
+            connected_adapter.store_document_record('bar', {'bar': 'baz'})
+            snapshots, pending = connected_adapter._list_bloom_filter()
+            assert len(snapshots) == 1
+            assert pending == ['pending/bar']
+
+            assert connected_adapter.retrieve_document_records(['bar']) == ({'bar': {'bar': 'baz'}}, set())
+
+            assert connected_adapter.build_bloom_filter() == 2
+            new_snapshots, pending = connected_adapter._list_bloom_filter()
+            assert len(new_snapshots) == 1
+            assert new_snapshots != snapshots
+            assert pending == []
+
+            # The new version is loaded and includes the record marked before.
+            flexmock(connected_adapter.bloom_filter_ceph).should_call('retrieve_blob').with_args(
+                new_snapshots[0]
+            ).once()
+            assert connected_adapter.retrieve_document_records(['foo', 'bar', 'baz']) == (
+                {'foo': {'foo': 'bar'}, 'bar': {'bar': 'baz'}},
+                {'baz'},
+            )
+            assert connected_adapter.retrieve_document_records(['baz']) == ({}, {'baz'})
+
+    def test_retrieve_document_records_false_positive(self, adapter):
+        """Test records present in the snapshot but not stored are retrieved and reported missing."""
+        with connected_ceph_adapter(adapter) as connected_adapter:
+            connected_adapter.store_document_record('foo', {'foo': 'bar'})
+            connected_adapter.build_bloom_filter()
+            connected_adapter.ceph.delete_documents(['foo'])
+
+            flexmock(connected_adapter).should_call('retrieve_document').with_args('foo').once()
+            assert connected_adapter.retrieve_document_records(['foo']) == ({}, {'foo'})
+
+    def test_retrieve_document_records_no_snapshot(self, adapter):
+        """Test all the records are retrieved if no snapshot was built."""
+        with connected_ceph_adapter(adapter) as connected_adapter:
+            connected_adapter.store_document_record('foo', {'foo': 'bar'})
+
+            flexmock(connected_adapter).should_call('retrieve_document').twice()
+            assert connected_adapter.retrieve_document_records(['foo', 'bar']) == ({'foo': {'foo': 'bar'}}, {'bar'})
+
+    def test_retrieve_document_records_concurrent(self, adapter):
+        """Test concurrent bulk lookups, each retrieving records concurrently."""
+        documents = {f'document-{i}': {'i': i} for i in range(50)}
+        with connected_ceph_adapter(adapter) as connected_adapter:
+            for document_id, document in documents.items():
+                connected_adapter.store_document_record(document_id, document)
+
+            connected_adapter.build_bloom_filter()
+            document_ids = list(documents) + [f'missing-{i}' for i in range(50)]
+            with ThreadPoolExecutor(max_workers=4) as executor:
+                results = list(
+                    executor.map(
+                        lambda _: connected_adapter.retrieve_document_records(document_ids, concurrency=4), range(8)
+                    )
+                )
+
+            for records, misses in results:
+                assert records == documents
+                assert misses == {f'missing-{i}' for i in range(50)}
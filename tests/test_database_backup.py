@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+# thoth-storages
+# Copyright(C) 2018, 2019 Fridolin Pokorny
+#
+# This program is free software: you can redistribute it and / or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+# type: ignore
+
+"""This is the tests."""
+
+import hashlib
+import os
+
+import pytest
+
+from thoth.storages import DatabaseBackup
+from thoth.storages.exceptions import NotFoundError
+
+from .base import ThothStoragesTest
+from .test_ceph import CEPH_INIT_KWARGS
+from .utils import connected_ceph_adapter
+
+
+@pytest.fixture(name='adapter')
+def _fixture_adapter():
+    """Retrieve an adapter to database backups."""
+    return DatabaseBackup(deployment_name='testenv', bucket_prefix='thoth-test', **CEPH_INIT_KWARGS)
+
+
+class TestDatabaseBackup(ThothStoragesTest):
+    """Test operations on database backups."""
+
+    def test_init(self, adapter):
+        """Test adapter initialization, manifests are not stored together with backups."""
+        assert adapter.prefix == 'thoth-test/testenv/database-backup/'
+        assert adapter.ceph.prefix == adapter.prefix
+        assert adapter.manifest_ceph.prefix == 'thoth-test/testenv/database-backup-manifest/'
+
+    @pytest.mark.parametrize('size', [1024, 12 * 1024 * 1024 + 1])
+    def test_store_retrieve_backup(self, adapter, tmp_path, size):
+        """Test storing and retrieving backups, large backups are transferred in multiple parts."""
+        backup = os.urandom(size)
+        backup_path = tmp_path / 'thoth.sql'
+        backup_path.write_bytes(backup)
+
+        with connected_ceph_adapter(adapter) as connected_adapter:
+            connected_adapter.ceph.multipart_threshold = 5 * 1024 * 1024
+            connected_adapter.ceph.multipart_chunksize = 5 * 1024 * 1024
+
+            backup_id = connected_adapter.store_backup(str(backup_path))
+            assert backup_id == hashlib.sha256(backup).hexdigest()
+            assert list(connected_adapter.get_document_listing()) == [backup_id]
+            # Stored backups are not uploaded again.
+            assert connected_adapter.store_backup(str(backup_path)) == backup_id
+
+            manifest = connected_adapter.retrieve_backup(backup_id, str(tmp_path / 'retrieved.sql'))
+            assert (tmp_path / 'retrieved.sql').read_bytes() == backup
+            assert manifest['size'] == size
+            assert manifest['file_name'] == 'thoth.sql'
+            assert list(connected_adapter.get_backup_listing()) == [manifest]
+
+    def test_retrieve_backup_corrupted(self, adapter, tmp_path):
+        """Test retrieving a backup which does not match its manifest."""
+        backup_path = tmp_path / 'thoth.sql'
+        backup_path.write_bytes(b'foo')
+
+        with connected_ceph_adapter(adapter) as connected_adapter:
+            backup_id = connected_adapter.store_backup(str(backup_path))
+            connected_adapter.ceph.store_blob(b'bar', backup_id)
+
+            with pytest.raises(ValueError):
+                connected_adapter.retrieve_backup(backup_id, str(tmp_path / 'retrieved.sql'))
+
+            assert not (tmp_path / 'retrieved.sql').exists()
+
+    def test_table_rows_backup(self, adapter, tmp_path):
+        """Test storing incremental backups of table rows and restoring them in order."""
+        exported = {'python_package_version': [b'1', b'2'], 'solved': [b'3']}
+
+        class _Graph:
+            """Export one row per table on each backup, record rows imported."""
+
+            def __init__(self):
+                self.imported = []
+                self.pending_solve_populated = 0
+
+            def export_table_rows(self, directory, since_ids):
+                result = {}
+                for table_name, rows in exported.items():
+                    since_id = since_ids.get(table_name, 0)
+                    with open(os.path.join(directory, table_name), 'wb') as table_file:
+                        table_file.write(rows[since_id] if since_id < len(rows) else b'')
+                    result[table_name] = {'since_id': since_id, 'until_id': min(since_id + 1, len(rows))}
+                return result
+
+            def import_table_rows(self, directory, exports):
+                for table_name in sorted(exports):
+                    with open(os.path.join(directory, table_name), 'rb') as table_file:
+                        self.imported.append((table_name, table_file.read()))
+
+            def populate_pending_solve(self):
+                self.pending_solve_populated += 1
+                return 0, 0
+
+        graph = _Graph()
+        with connected_ceph_adapter(adapter) as connected_adapter:
+            with pytest.raises(NotFoundError):
+                connected_adapter.restore_table_rows_backup(graph)
+
+            base_id = connected_adapter.store_table_rows_backup(graph)
+            increment_id = connected_adapter.store_table_rows_backup(graph)
+            manifest = connected_adapter.retrieve_backup_manifest(increment_id)
+            assert manifest['parent'] == base_id
+            assert manifest['tables']['python_package_version'] == {'since_id': 1, 'until_id': 2}
+
+            assert connected_adapter.restore_table_rows_backup(graph) == [base_id, increment_id]
+            assert graph.imported == [
+                ('python_package_version', b'1'),
+                ('solved', b'3'),
+                ('python_package_version', b'2'),
+                ('solved', b''),
+            ]
+            # Rows of pending solve queue are not backed up, the queue is populated once all backups are replayed.
+            assert graph.pending_solve_populated == 1
+
+            graph.imported = []
+            assert connected_adapter.restore_table_rows_backup(graph, base_id) == [base_id]
+            assert graph.imported == [('python_package_version', b'1'), ('solved', b'3')]
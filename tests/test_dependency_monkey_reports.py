@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+# thoth-storages
+# Copyright(C) 2019 Fridolin Pokorny
+#
+# This program is free software: you can redistribute it and / or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+# type: ignore
+
+"""This is the tests."""
+
+import copy
+import json
+import os
+
+import flexmock
+import pytest
+
+from thoth.storages import DependencyMonkeyReportsStore
+
+from .base import ThothStoragesTest
+from .test_ceph import CEPH_INIT_KWARGS
+from .utils import connected_ceph_adapter
+
+_DEPLOYMENT_NAME = 'thoth-my-deployment'
+_BUCKET_PREFIX = 'some-reports'
+
+
+@pytest.fixture(name='adapter')
+def _fixture_adapter():
+    """Retrieve an adapter to Dependency Monkey reports."""
+    return DependencyMonkeyReportsStore(deployment_name=_DEPLOYMENT_NAME, prefix=_BUCKET_PREFIX, **CEPH_INIT_KWARGS)
+
+
+def _get_report(document_id: str, inspection_ids: list) -> dict:
+    """Get a Dependency Monkey report listing the given inspection ids, metadata are taken from an analyzer result."""
+    analyzer_dir = os.path.join(ThothStoragesTest.DATA_DIR, 'result', 'analyzer')
+    with open(os.path.join(analyzer_dir, sorted(os.listdir(analyzer_dir))[0])) as document_file:
+        document = json.load(document_file)
+
+    metadata = copy.deepcopy(document['metadata'])
+    # The last part of hostname identifies pod run for the job.
+    metadata['hostname'] = f'{document_id}-pod'
+    return {'metadata': metadata, 'result': {'output': inspection_ids}}
+
+
+class TestDependencyMonkeyReportsStore:
+    """Test adapter for Dependency Monkey reports."""
+
+    def test_store_document_index(self, adapter):
+        """Test inspection ids are indexed when reports are stored."""
+        with connected_ceph_adapter(adapter) as connected_adapter:
+            document_id = connected_adapter.store_document(_get_report('dm-1', ['inspection-1', 'inspection-2']))
+
+            assert document_id == 'dm-1'
+            assert list(connected_adapter.get_document_listing()) == ['dm-1']
+            assert list(connected_adapter.inspection_index.get_document_listing()) == ['dm-1']
+            assert connected_adapter.inspection_index.retrieve_document('dm-1') == {
+                'inspection_ids': ['inspection-1', 'inspection-2']
+            }
+
+    def test_iterate_inspection_ids(self, adapter):
+        """Test inspection ids of indexed reports are read from the index."""
+        with connected_ceph_adapter(adapter) as connected_adapter:
+            connected_adapter.store_document(_get_report('dm-1', ['inspection-1', 'inspection-2']))
+            connected_adapter.store_document(_get_report('dm-2', ['inspection-3']))
+
+            flexmock(connected_adapter.ceph).should_receive('retrieve_document').never()
+            assert sorted(connected_adapter.iterate_inspection_ids()) == [
+                'inspection-1',
+                'inspection-2',
+                'inspection-3',
+            ]
+
+    def test_index_inspection_ids(self, adapter):
+        """Test reports stored before the index was introduced are read, and indexed only explicitly."""
+        with connected_ceph_adapter(adapter) as connected_adapter:
+            connected_adapter.store_document(_get_report('dm-1', ['inspection-1']))
+            # Reports stored without the index.
+            connected_adapter.ceph.store_document(_get_report('dm-2', ['inspection-2']), 'dm-2')
+            connected_adapter.ceph.store_document(_get_report('dm-3', ['inspection-3']), 'dm-3')
+            inspection_ids = ['inspection-1', 'inspection-2', 'inspection-3']
+
+            assert sorted(connected_adapter.iterate_inspection_ids()) == inspection_ids
+            # Iterating does not modify the index.
+            assert list(connected_adapter.inspection_index.get_document_listing()) == ['dm-1']
+
+            assert connected_adapter.index_inspection_ids() == 2
+            assert sorted(connected_adapter.inspection_index.get_document_listing()) == ['dm-1', 'dm-2', 'dm-3']
+            assert connected_adapter.index_inspection_ids() == 0
+
+            flexmock(connected_adapter.ceph).should_receive('retrieve_document').never()
+            assert sorted(connected_adapter.iterate_inspection_ids()) == inspection_ids
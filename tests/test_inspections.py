@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+# thoth-storages
+# Copyright(C) 2019 Fridolin Pokorny
+#
+# This program is free software: you can redistribute it and / or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+# type: ignore
+
+"""This is the tests."""
+
+import flexmock
+import pytest
+
+from thoth.storages import InspectionResultsStore
+
+from .test_ceph import CEPH_INIT_KWARGS
+from .utils import connected_ceph_adapter
+
+_DEPLOYMENT_NAME = 'thoth-my-deployment'
+_BUCKET_PREFIX = 'some-inspections'
+
+
+@pytest.fixture(name='adapter')
+def _fixture_adapter():
+    """Retrieve an adapter to inspection results."""
+    return InspectionResultsStore(deployment_name=_DEPLOYMENT_NAME, prefix=_BUCKET_PREFIX, **CEPH_INIT_KWARGS)
+
+
+class TestInspectionResultsStore:
+    """Test adapter for inspection results."""
+
+    @pytest.mark.parametrize('concurrency', [None, 1])
+    def test_filter_document_ids(self, adapter, concurrency):
+        """Test filtering inspection ids by identifiers, identifiers being prefixes of others are not mixed."""
+        document_ids = [
+            'inspection-foo-a1b2c',
+            'inspection-foo-d3e4f',
+            'inspection-foo-bar-g5h6i',
+            'inspection-foobar-j7k8l',
+            'inspection-baz-m9n0o',
+        ]
+        with connected_ceph_adapter(adapter) as connected_adapter:
+            for document_id in document_ids:
+                connected_adapter.ceph.store_document({}, document_id)
+
+            assert connected_adapter.filter_document_ids(
+                ['foo', 'foo-bar', 'missing', ''], concurrency=concurrency
+            ) == {
+                'foo': ['inspection-foo-a1b2c', 'inspection-foo-d3e4f'],
+                'foo-bar': ['inspection-foo-bar-g5h6i'],
+                'missing': [],
+                '': [],
+            }
+
+    def test_filter_document_ids_manifest(self, adapter):
+        """Test filtering inspection ids based on manifest if enabled, documents are not listed on Ceph."""
+        document_ids = ['inspection-foo-d3e4f', 'inspection-foo-a1b2c', 'inspection-foo-bar-g5h6i', 'inspection-baz']
+        adapter.manifest_enabled = True
+        with connected_ceph_adapter(adapter) as connected_adapter:
+            for document_id in document_ids:
+                connected_adapter.ceph.store_document({}, document_id)
+            connected_adapter.index_manifest()
+
+            flexmock(connected_adapter.ceph).should_receive('get_document_listing').never()
+            assert connected_adapter.filter_document_ids(['foo', 'foo-bar', 'baz', '']) == {
+                'foo': ['inspection-foo-a1b2c', 'inspection-foo-d3e4f'],
+                'foo-bar': ['inspection-foo-bar-g5h6i'],
+                'baz': [],
+                '': [],
+            }
+
+    def test_filter_document_ids_no_identifiers(self, adapter):
+        """Test filtering with no identifiers given or only empty identifiers given."""
+        with connected_ceph_adapter(adapter) as connected_adapter:
+            connected_adapter.ceph.store_document({}, 'inspection-foo-a1b2c')
+
+            assert connected_adapter.filter_document_ids([]) == {}
+            assert connected_adapter.filter_document_ids(['']) == {'': []}
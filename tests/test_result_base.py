@@ -18,6 +18,8 @@
 
 """This is the tests."""
 
+import datetime
+
 import flexmock
 import pytest
 
@@ -65,6 +67,28 @@ class ResultBaseTest(StorageBaseTest):
             once()
         assert adapter.store_document(document) == document_id
 
+    def test_get_document_count(self, adapter):
+        """Test counting documents stored on Ceph."""
+        # Just check that the request is properly propagated.
+        flexmock(adapter.ceph). \
+            should_receive('get_document_count'). \
+            with_args(prefix='foo'). \
+            and_return(42). \
+            once()
+        assert adapter.get_document_count(prefix='foo') == 42
+
+    def test_retrieve_document_streamed(self, adapter):
+        """Test retrieving documents with sections parsed incrementally."""
+        # Just check that the request is properly propagated.
+        document_id = '<document_id>'
+        document = {'foo': 'bar'}
+        flexmock(adapter.ceph). \
+            should_receive('retrieve_document_streamed'). \
+            with_args(document_id, adapter.STREAMED_DOCUMENT_PATHS). \
+            and_return(document). \
+            once()
+        assert adapter.retrieve_document_streamed(document_id) == document
+
     def test_assertion_error(self):
         """Test assertion error if a developer RESULT_TYPE is empty."""
         with pytest.raises(AssertionError):
@@ -89,3 +113,94 @@ class TestResultBase(ResultBaseTest):
     We cannot directly use this class to derive from in result-specific adapters as pytest will run tests multiple
     times for it due to Test prefix. This is a simple workaround to avoid running tests multiple times.
     """
+
+    def test_store_document_manifest(self, adapter):
+        """Test maintaining manifest of stored documents."""
+        adapter.SCHEMA = None
+        adapter.manifest_enabled = True
+        day1, day2 = datetime.date(2019, 10, 1), datetime.date(2019, 10, 2)
+        with connected_ceph_adapter(adapter) as connected_adapter:
+            flexmock(connected_adapter).should_receive('_get_manifest_day').and_return(day1)
+            documents = [
+                {'metadata': {'hostname': hostname, 'datetime': 'now', 'analyzer_version': '1.0.0'}}
+                for hostname in ('a-pod', 'b-pod', 'c-pod')
+            ]
+            for document in documents:
+                connected_adapter.store_document(document)
+
+            assert sorted(connected_adapter.get_manifest_document_listing()) == ['a', 'b', 'c']
+            assert connected_adapter.compact_manifest(until=day2) == 3
+            assert connected_adapter.compact_manifest(until=day2) == 0
+            assert list(connected_adapter.manifest_ceph.get_document_listing()) == ['shard/2019-10-01']
+
+            flexmock(connected_adapter).should_receive('_get_manifest_day').and_return(day2)
+            connected_adapter.store_document({'metadata': {'hostname': 'a-pod'}})
+            connected_adapter.store_document({'metadata': {'hostname': 'd-pod'}})
+
+            # Documents are not listed in the manifest store, manifest does not appear in document listing.
+            assert list(connected_adapter.get_document_listing()) == ['a', 'b', 'c', 'd']
+            assert list(connected_adapter.get_manifest_document_listing()) == ['a', 'b', 'c', 'd']
+            assert connected_adapter.get_manifest_document_count() == 4
+            assert connected_adapter.get_manifest_document_count(since=day2) == 2
+            assert connected_adapter.get_manifest_document_count(until=day2) == 3
+
+            entries = list(connected_adapter.iterate_manifest(until=day2))
+            assert entries[0] == {
+                'document_id': 'a',
+                'size': len(connected_adapter.ceph.encode_document(documents[0])),
+                'datetime': 'now',
+                'analyzer_version': '1.0.0',
+            }
+            assert sorted(entry['document_id'] for entry in connected_adapter.iterate_manifest(since=day2)) == ['a', 'd']
+
+    def test_document_listing_manifest(self, adapter):
+        """Test documents are listed and counted based on manifest if enabled, without listing documents on Ceph."""
+        adapter.SCHEMA = None
+        adapter.manifest_enabled = True
+        with connected_ceph_adapter(adapter) as connected_adapter:
+            for hostname in ('b-pod', 'a-pod', 'ab-pod', 'c-pod'):
+                connected_adapter.store_document({'metadata': {'hostname': hostname}})
+
+            flexmock(connected_adapter.ceph).should_receive('get_document_listing').never()
+            flexmock(connected_adapter.ceph).should_receive('get_document_count').never()
+            assert list(connected_adapter.get_document_listing()) == ['a', 'ab', 'b', 'c']
+            assert list(connected_adapter.get_document_listing(start_after='a', limit=2)) == ['ab', 'b']
+            assert list(connected_adapter.get_document_listing(limit=0)) == []
+            assert list(connected_adapter.get_document_listing(prefix='a')) == ['a', 'ab']
+            assert connected_adapter.get_document_count() == 4
+            assert connected_adapter.get_document_count(prefix='a') == 2
+
+    def test_index_manifest(self, adapter):
+        """Test documents stored before manifest was enabled are indexed in manifest."""
+        adapter.SCHEMA = None
+        with connected_ceph_adapter(adapter) as connected_adapter:
+            document = {'metadata': {'hostname': 'a-pod', 'datetime': 'now', 'analyzer_version': '1.0.0'}}
+            connected_adapter.store_document(document)
+
+            connected_adapter.manifest_enabled = True
+            connected_adapter.store_document({'metadata': {'hostname': 'b-pod'}})
+            assert list(connected_adapter.get_document_listing()) == ['b']
+
+            assert connected_adapter.index_manifest() == 1
+            assert connected_adapter.index_manifest() == 0
+            assert list(connected_adapter.get_document_listing()) == ['a', 'b']
+            entries = {entry['document_id']: entry for entry in connected_adapter.iterate_manifest()}
+            assert entries['a'] == {
+                'document_id': 'a',
+                'size': len(connected_adapter.ceph.encode_document(document)),
+                'datetime': 'now',
+                'analyzer_version': '1.0.0',
+            }
+
+    def test_store_document_no_manifest(self, adapter):
+        """Test no manifest is maintained if not enabled, manifest store is connected only once it is used."""
+        adapter.SCHEMA = None
+        with connected_ceph_adapter(adapter) as connected_adapter:
+            connected_adapter.store_document({'metadata': {'hostname': 'a-pod'}})
+            assert not connected_adapter.manifest_ceph.is_connected()
+            assert list(connected_adapter.get_document_listing()) == ['a']
+            assert list(connected_adapter.get_manifest_document_listing()) == []
+            assert connected_adapter.get_manifest_document_count() == 0
+            assert list(connected_adapter.iterate_manifest()) == []
+            assert connected_adapter.compact_manifest() == 0
+            assert connected_adapter.manifest_ceph.is_connected()
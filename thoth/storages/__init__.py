@@ -26,6 +26,7 @@ from .buildlogs import BuildLogsStore
 from .buildlogs_analyses import BuildLogsAnalysisResultsStore
 from .buildlogs_analyses_cache import BuildLogsAnalysesCacheStore
 from .ceph import CephStore
+from .database_backup import DatabaseBackup
 from .dependency_monkey_reports import DependencyMonkeyReportsStore
 from .graph import GraphDatabase
 from .inspections import InspectionResultsStore
@@ -24,3 +24,11 @@ class AnalysisResultsStore(ResultStorageBase):
     """Store results of image analyzes."""
 
     RESULT_TYPE = "analysis"
+    # Image analyses can carry thousands of entries in these sections.
+    STREAMED_DOCUMENT_PATHS = (
+        "result.deb-dependencies",
+        "result.mercator",
+        "result.python-files",
+        "result.rpm-dependencies",
+        "result.system-symbols",
+    )
@@ -18,17 +18,67 @@
 """Adapter for storing build logs."""
 
 import hashlib
+import json
 import os
 import typing
+import zlib
+from concurrent.futures import ThreadPoolExecutor
 
 from .ceph import CephStore
 from .base import StorageBase
+from .exceptions import NotFoundError
+
+# Key of the only entry of documents describing build logs stored in chunks.
+_CHUNKED_MANIFEST_KEY = "chunked-build-log"
+# Build logs are stored as JSON documents, line breaks of logs are escaped in JSON strings.
+_LINE_BREAK = b"\\n"
+
+
+def _iter_chunks(blob: bytes, min_size: int, average_size: int, max_size: int) -> typing.Generator[bytes, None, None]:
+    """Split the given blob into content defined chunks, chunks end with lines selected based on their checksum.
+
+    Chunk boundaries depend only on the line before them so that data shared by blobs is split into same chunks
+    regardless of its offset. A line ends a chunk with probability proportional to its length, giving chunks
+    of the average size. Lines are looked up and checksummed in C (bytes.find and zlib.crc32) as rolling
+    hashes computed byte by byte in Python are too slow for large logs. Data without line breaks is cut
+    at the maximal size.
+    """
+    view = memoryview(blob)
+    start = 0
+    while start < len(blob):
+        end = min(start + max_size, len(blob))
+        cut = end
+        # A chunk can end only with the line break at the minimal size or any line break after it.
+        position = start + min_size - len(_LINE_BREAK)
+        # Lines longer than the maximal size are checksummed only in their part within the maximal size.
+        lower = max(position - max_size, 0)
+        # Line breaks ending before the minimal size can overlap the position line breaks are looked up from.
+        line_start = blob.rfind(_LINE_BREAK, lower, position + len(_LINE_BREAK) - 1)
+        line_start = line_start + len(_LINE_BREAK) if line_start != -1 else lower
+        while True:
+            line_end = blob.find(_LINE_BREAK, position, end)
+            if line_end == -1:
+                break
+
+            line_end += len(_LINE_BREAK)
+            if zlib.crc32(view[line_start:line_end]) % average_size < line_end - line_start:
+                cut = line_end
+                break
+
+            line_start = position = line_end
+
+        yield blob[start:cut]
+        start = cut
 
 
 class BuildLogsStore(StorageBase):
     """Adapter for storing build logs."""
 
     RESULT_TYPE = "buildlogs"
+    # Minimal, average and maximal size of chunks build logs are split into when stored in chunks.
+    CHUNK_MIN_SIZE = 16 * 1024
+    CHUNK_AVERAGE_SIZE = 64 * 1024
+    CHUNK_MAX_SIZE = 256 * 1024
 
     def __init__(
         self,
@@ -52,6 +102,16 @@ class BuildLogsStore(StorageBase):
         self.ceph = CephStore(
             self.prefix, host=host, key_id=key_id, secret_key=secret_key, bucket=bucket, region=region
         )
+        # Chunks are stored outside of prefix with documents so that they do not show up in document listing.
+        self.chunks_ceph = CephStore(
+            "{}-chunks".format(self.prefix.rstrip("/")),
+            host=host,
+            key_id=key_id,
+            secret_key=secret_key,
+            bucket=bucket,
+            region=region,
+        )
+        self.chunked = bool(int(os.getenv("THOTH_STORAGES_BUILDLOGS_CHUNKED", 0)))
 
     def is_connected(self) -> bool:
         """Check if the given database adapter is in connected state."""
@@ -61,21 +121,96 @@ class BuildLogsStore(StorageBase):
         """Connect the given storage adapter."""
         self.ceph.connect()
 
+    def _get_chunks_ceph(self) -> CephStore:
+        """Get connected store with chunks of build logs, the store is connected lazily."""
+        if not self.chunks_ceph.is_connected():
+            self.chunks_ceph.connect()
+
+        return self.chunks_ceph
+
+    def _store_chunk(self, chunk_id: str, chunk: bytes) -> None:
+        """Store the given chunk compressed unless it is already stored."""
+        chunks_ceph = self._get_chunks_ceph()
+        if not chunks_ceph.document_exists(chunk_id):
+            chunks_ceph.store_blob(zlib.compress(chunk), chunk_id)
+
+    def _store_chunked(self, blob: bytes, document_id: str) -> None:
+        """Store the given blob in content addressed chunks, a manifest listing chunks is stored as the document."""
+        chunks = {}
+        chunk_ids = []
+        for chunk in _iter_chunks(blob, self.CHUNK_MIN_SIZE, self.CHUNK_AVERAGE_SIZE, self.CHUNK_MAX_SIZE):
+            chunk_id = hashlib.sha256(chunk).hexdigest()
+            chunks[chunk_id] = chunk
+            chunk_ids.append(chunk_id)
+
+        with ThreadPoolExecutor(
+            max_workers=min(CephStore.DEFAULT_CONCURRENCY, len(chunks)), thread_name_prefix="buildlogs-chunks"
+        ) as executor:
+            # Raise the first error, if any.
+            list(executor.map(self._store_chunk, chunks.keys(), chunks.values()))
+
+        # The manifest is stored once all the chunks are stored so that there are no manifests with missing chunks.
+        manifest = {_CHUNKED_MANIFEST_KEY: {"chunks": chunk_ids, "compression": "zlib", "size": len(blob)}}
+        self.ceph.store_document(manifest, document_id)
+
+    def _reassemble(self, document_id: str, document: dict) -> dict:
+        """Reassemble a build log document if it was stored in chunks, other documents are returned as they are."""
+        if len(document) != 1 or _CHUNKED_MANIFEST_KEY not in document:
+            return document
+
+        chunks_ceph = self._get_chunks_ceph()
+        chunk_ids = document[_CHUNKED_MANIFEST_KEY]["chunks"]
+        if not chunk_ids:
+            raise NotFoundError(f"No chunks listed for build log {document_id!r}")
+
+        with ThreadPoolExecutor(
+            max_workers=min(CephStore.DEFAULT_CONCURRENCY, len(chunk_ids)), thread_name_prefix="buildlogs-chunks"
+        ) as executor:
+            blob = b"".join(zlib.decompress(chunk) for chunk in executor.map(chunks_ceph.retrieve_blob, chunk_ids))
+
+        if hashlib.sha256(blob).hexdigest() != document_id:
+            raise ValueError(f"Build log {document_id!r} reassembled from chunks does not match its id")
+
+        return json.loads(blob.decode())
+
     def store_document(self, document: dict) -> str:
-        """Store the given document in Ceph."""
+        """Store the given document in Ceph, the document is stored in chunks if chunked storage is enabled."""
         blob = self.ceph.dict2blob(document)
         document_id = hashlib.sha256(blob).hexdigest()
-        self.ceph.store_blob(blob, document_id)
+        if self.chunked:
+            self._store_chunked(blob, document_id)
+        else:
+            self.ceph.store_blob(blob, document_id)
         return document_id
 
     def retrieve_document(self, document_id: str) -> dict:
-        """Retrieve a document from Ceph by its id."""
-        return self.ceph.retrieve_document(document_id)
+        """Retrieve a document from Ceph by its id, documents stored in chunks are reassembled."""
+        return self._reassemble(document_id, self.ceph.retrieve_document(document_id))
+
+    def retrieve_many(
+        self,
+        document_ids: typing.Iterable[str],
+        *,
+        concurrency: typing.Optional[int] = None,
+        max_in_flight_bytes: typing.Optional[int] = None,
+    ) -> typing.Generator[typing.Tuple[str, dict], None, None]:
+        """Retrieve documents from Ceph concurrently, yield pairs of document id and document as retrieved."""
+        for document_id, document in self.ceph.retrieve_many(
+            document_ids, concurrency=concurrency, max_in_flight_bytes=max_in_flight_bytes
+        ):
+            yield document_id, self._reassemble(document_id, document)
+
+    def iterate_results(self, concurrency: typing.Optional[int] = None) -> typing.Generator[tuple, None, None]:
+        """Iterate over results available in the Ceph, retrieve them concurrently if concurrency is provided."""
+        for document_id, document in self.ceph.iterate_results(concurrency=concurrency):
+            yield document_id, self._reassemble(document_id, document)
 
-    def iterate_results(self) -> typing.Generator[tuple, None, None]:
-        """Iterate over results available in the Ceph."""
-        return self.ceph.iterate_results()
+    def get_document_listing(
+        self, start_after: typing.Optional[str] = None, *, limit: typing.Optional[int] = None, prefix: str = ""
+    ) -> typing.Generator[str, None, None]:
+        """Get listing of documents stored on the Ceph.
 
-    def get_document_listing(self) -> typing.Generator[str, None, None]:
-        """Get listing of documents stored on the Ceph."""
-        return self.ceph.get_document_listing()
+        Listing can start after the given document id, be limited to the given number of documents and to documents
+        with ids starting with the given prefix.
+        """
+        return self.ceph.get_document_listing(start_after=start_after, limit=limit, prefix=prefix)
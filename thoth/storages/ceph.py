@@ -17,20 +17,177 @@
 
 """Adapter for Ceph distributed object storage."""
 
+import gzip
+import io
+import itertools
 import json
+import logging
 import os
+import shutil
+import tempfile
+import threading
 import typing
+import weakref
+from contextlib import contextmanager
+from concurrent.futures import FIRST_COMPLETED
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import wait
 
 import boto3
 import botocore
+from boto3.s3.transfer import TransferConfig
 
 from .base import StorageBase
 from .exceptions import NotFoundError
 
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+try:
+    import ijson
+    from ijson.common import ObjectBuilder
+except ImportError:
+    ijson = None
+
+_LOGGER = logging.getLogger(__name__)
+
+# Key in object metadata under which codec used to encode the stored document is recorded.
+_CODEC_METADATA_KEY = "codec"
+
+
+class _ByteBudget:
+    """Limit number of bytes held by concurrently retrieved objects."""
+
+    def __init__(self, max_bytes: int):
+        """Initialize budget with the given number of bytes available."""
+        self.max_bytes = max_bytes
+        self._available = max_bytes
+        self._closed = False
+        self._condition = threading.Condition()
+
+    def acquire(self, size: int) -> int:
+        """Wait until the given number of bytes is available, objects larger than budget wait for the whole budget."""
+        size = min(size, self.max_bytes)
+        with self._condition:
+            self._condition.wait_for(lambda: self._closed or self._available >= size)
+            self._available -= size
+
+        return size
+
+    def release(self, size: int) -> None:
+        """Return the given number of bytes to the budget."""
+        with self._condition:
+            self._available += size
+            self._condition.notify_all()
+
+    def close(self) -> None:
+        """Stop limiting bytes held, unblock all the waiting threads."""
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+
+
+class _IterableStream(io.RawIOBase):
+    """Expose an iterable of bytes chunks as a readable file-like object."""
+
+    def __init__(self, iterable: typing.Iterable[bytes]):
+        """Initialize stream reading the given chunks."""
+        super().__init__()
+        self._iterator = iter(iterable)
+        self._buffer = b""
+
+    def readable(self) -> bool:
+        """The stream is readable."""
+        return True
+
+    def readinto(self, buffer) -> int:
+        """Read chunks into the given buffer, return 0 once all the chunks were read."""
+        while not self._buffer:
+            try:
+                self._buffer = next(self._iterator)
+            except StopIteration:
+                return 0
+
+        size = min(len(buffer), len(self._buffer))
+        buffer[:size] = self._buffer[:size]  # Ignore PycodestyleBear (E203)
+        self._buffer = self._buffer[size:]  # Ignore PycodestyleBear (E203)
+        return size
+
+
+class _SpooledBody:
+    """Body of a retrieved object spooled to a temporary file, the file is removed once the object is collected."""
+
+    def __init__(self, stream: typing.BinaryIO, codec: typing.Optional[str]):
+        """Spool the given stream of object body encoded using the given codec."""
+        fd, self.path = tempfile.mkstemp(prefix="thoth-storages-")
+        self._finalizer = weakref.finalize(self, os.remove, self.path)
+        with os.fdopen(fd, "wb") as spooled_file:
+            shutil.copyfileobj(stream, spooled_file)
+        self.codec = codec
+
+    @contextmanager
+    def open(self) -> typing.Generator[typing.BinaryIO, None, None]:
+        """Open the spooled body for reading, the body is decoded from the codec used."""
+        with open(self.path, "rb") as spooled_file:
+            if self.codec == "json+gzip":
+                with gzip.GzipFile(fileobj=spooled_file) as stream:
+                    yield stream
+            elif self.codec == "json+zstd":
+                if zstandard is None:
+                    raise ImportError("Package zstandard has to be installed to decode documents encoded using zstd")
+
+                with zstandard.ZstdDecompressor().stream_reader(spooled_file) as stream:
+                    yield stream
+            elif self.codec in (None, "json"):
+                yield spooled_file
+            else:
+                raise ValueError(f"Unknown codec {self.codec!r} used to encode the stored document")
+
+
+class StreamedSection:
+    """A section of a document retrieved from Ceph which is parsed incrementally each time it is iterated over.
+
+    Arrays are iterated over item by item, objects can be iterated over by their items.
+    """
+
+    __slots__ = ("_body", "_path")
+
+    def __init__(self, body: _SpooledBody, path: str):
+        """Initialize section stored under the given path in the document."""
+        self._body = body
+        self._path = path
+
+    def __iter__(self) -> typing.Generator[typing.Any, None, None]:
+        """Iterate over items of the array stored in this section."""
+        with self._body.open() as stream:
+            yield from ijson.items(stream, f"{self._path}.item", use_float=True)
+
+    def items(self) -> typing.Generator[typing.Tuple[str, typing.Any], None, None]:
+        """Iterate over key-value pairs of the object stored in this section."""
+        with self._body.open() as stream:
+            yield from ijson.kvitems(stream, self._path, use_float=True)
+
+    def __repr__(self) -> str:
+        """Represent the section by its path in the document."""
+        return f"{self.__class__.__name__}({self._path!r})"
+
 
 class CephStore(StorageBase):
     """Adapter for storing and retrieving data from Ceph - low level API."""
 
+    # Default number of objects retrieved concurrently and max number of bytes they can hold in memory.
+    DEFAULT_CONCURRENCY = 8
+    DEFAULT_MAX_IN_FLIGHT_BYTES = 64 * 1024 * 1024
+    # Default size of blobs uploaded in multiple parts, size of parts and number of parts uploaded in parallel.
+    DEFAULT_MULTIPART_THRESHOLD = 8 * 1024 * 1024
+    DEFAULT_MULTIPART_CHUNKSIZE = 8 * 1024 * 1024
+    DEFAULT_MULTIPART_CONCURRENCY = 4
+    # Codecs available for encoding documents, documents stored without codec recorded are plain JSON.
+    CODECS = frozenset(("json", "json+gzip", "json+zstd"))
+    DEFAULT_CODEC = "json"
+
     def __init__(
         self,
         prefix,
@@ -51,56 +208,292 @@ class CephStore(StorageBase):
         self.secret_key = secret_key or os.environ["THOTH_CEPH_SECRET_KEY"]
         self.bucket = bucket or os.environ["THOTH_CEPH_BUCKET"]
         self.region = region or os.getenv("THOTH_CEPH_REGION", None)
+        self.multipart_threshold = int(os.getenv("THOTH_CEPH_MULTIPART_THRESHOLD", self.DEFAULT_MULTIPART_THRESHOLD))
+        self.multipart_chunksize = int(os.getenv("THOTH_CEPH_MULTIPART_CHUNKSIZE", self.DEFAULT_MULTIPART_CHUNKSIZE))
+        self.multipart_concurrency = int(
+            os.getenv("THOTH_CEPH_MULTIPART_CONCURRENCY", self.DEFAULT_MULTIPART_CONCURRENCY)
+        )
+        self.codec = os.getenv("THOTH_CEPH_CODEC", self.DEFAULT_CODEC)
         self._s3 = None
         self.prefix = prefix
 
+        if self.codec not in self.CODECS:
+            raise ValueError(f"Unknown codec {self.codec!r} to encode documents, available: {sorted(self.CODECS)}")
+
         if not self.prefix.endswith("/"):
             self.prefix += "/"
 
-    def get_document_listing(self) -> typing.Generator[str, None, None]:
-        """Get listing of documents stored on the Ceph."""
-        for obj in self._s3.Bucket(self.bucket).objects.filter(Prefix=self.prefix).all():
-            yield obj.key[len(self.prefix) :]  # Ignore PycodestyleBear (E203)
+    def _iterate_listing_pages(
+        self, start_after: typing.Optional[str] = None, *, limit: typing.Optional[int] = None, prefix: str = ""
+    ) -> typing.Generator[dict, None, None]:
+        """Iterate over pages of object listing, each page lists up to 1000 objects."""
+        paginate_kwargs = {"Bucket": self.bucket, "Prefix": f"{self.prefix}{prefix}"}
+        if start_after is not None:
+            paginate_kwargs["StartAfter"] = f"{self.prefix}{start_after}"
+        if limit is not None:
+            paginate_kwargs["PaginationConfig"] = {"MaxItems": limit, "PageSize": min(limit, 1000)}
+
+        paginator = self._s3.meta.client.get_paginator("list_objects_v2")
+        yield from paginator.paginate(**paginate_kwargs)
+
+    def get_document_listing(
+        self, start_after: typing.Optional[str] = None, *, limit: typing.Optional[int] = None, prefix: str = ""
+    ) -> typing.Generator[str, None, None]:
+        """Get listing of documents stored on the Ceph.
+
+        Documents are listed in lexicographical order, listing can start after the given document id, be
+        limited to the given number of documents and to documents with ids starting with the given prefix.
+        """
+        if limit is not None and limit <= 0:
+            return
+
+        for page in self._iterate_listing_pages(start_after, limit=limit, prefix=prefix):
+            for obj in page.get("Contents", []):
+                yield obj["Key"][len(self.prefix) :]  # Ignore PycodestyleBear (E203)
+
+    def iterate_document_sizes(self, prefix: str = "") -> typing.Generator[typing.Tuple[str, int], None, None]:
+        """Iterate over pairs of document id and size of stored object, as listed in lexicographical order."""
+        for page in self._iterate_listing_pages(prefix=prefix):
+            for obj in page.get("Contents", []):
+                yield obj["Key"][len(self.prefix) :], obj["Size"]  # Ignore PycodestyleBear (E203)
+
+    def get_document_count(self, prefix: str = "") -> int:
+        """Get number of documents stored, only number of documents listed is kept while listing pages."""
+        return sum(page["KeyCount"] for page in self._iterate_listing_pages(prefix=prefix))
+
+    def _get_transfer_config(self) -> TransferConfig:
+        """Get configuration of transfers of large objects done in multiple parts."""
+        return TransferConfig(
+            multipart_threshold=self.multipart_threshold,
+            multipart_chunksize=self.multipart_chunksize,
+            max_concurrency=self.multipart_concurrency,
+        )
 
     def store_file(self, document: str, document_id: str) -> dict:
-        """Store a file on Ceph."""
-        response = self._s3.Object(self.bucket, f"{self.prefix}{document_id}").upload_file(Filename=document)
+        """Store a file on Ceph, large files are uploaded in multiple parts in parallel."""
+        response = self._s3.Object(self.bucket, f"{self.prefix}{document_id}").upload_file(
+            Filename=document, Config=self._get_transfer_config()
+        )
         return response
 
+    def retrieve_file(self, document_id: str, path: str) -> None:
+        """Retrieve an object to a file, large objects are downloaded in multiple parts in parallel."""
+        try:
+            self._s3.Object(self.bucket, f"{self.prefix}{document_id}").download_file(
+                Filename=path, Config=self._get_transfer_config()
+            )
+        except botocore.exceptions.ClientError as exc:
+            if exc.response["Error"]["Code"] in ("404", "NoSuchKey"):
+                raise NotFoundError(f"Failed to retrieve object, object {document_id!r} does not exist") from exc
+            raise
+
     @staticmethod
     def dict2blob(dictionary: dict) -> bytes:
         """Encode a dictionary to a blob so it can be stored on Ceph."""
         return json.dumps(dictionary, sort_keys=True, separators=(",", ": "), indent=2).encode()
 
-    def store_blob(self, blob: bytes, object_key: str) -> dict:
-        """Store a blob on Ceph."""
-        put_kwargs = {"Body": blob}
-        response = self._s3.Object(self.bucket, f"{self.prefix}{object_key}").put(**put_kwargs)
-        return response
+    def encode_document(self, document: dict) -> bytes:
+        """Encode a document to a blob using codec configured."""
+        blob = json.dumps(document, sort_keys=True, separators=(",", ":")).encode()
+        if self.codec == "json+gzip":
+            return gzip.compress(blob)
+        elif self.codec == "json+zstd":
+            if zstandard is None:
+                raise ImportError("Package zstandard has to be installed to encode documents using zstd")
+
+            return zstandard.ZstdCompressor().compress(blob)
+
+        return blob
+
+    @staticmethod
+    def blob2dict(blob: bytes, codec: typing.Optional[str] = None) -> dict:
+        """Decode a blob retrieved from Ceph to a dictionary, blobs stored without codec are plain JSON."""
+        if codec == "json+gzip":
+            blob = gzip.decompress(blob)
+        elif codec == "json+zstd":
+            if zstandard is None:
+                raise ImportError("Package zstandard has to be installed to decode documents encoded using zstd")
+
+            blob = zstandard.ZstdDecompressor().decompress(blob)
+        elif codec not in (None, "json"):
+            raise ValueError(f"Unknown codec {codec!r} used to encode the stored document")
+
+        return json.loads(blob.decode())
+
+    def store_blob(
+        self,
+        blob: typing.Union[bytes, typing.BinaryIO, typing.Iterable[bytes]],
+        object_key: str,
+        *,
+        metadata: typing.Optional[typing.Dict[str, str]] = None,
+    ) -> typing.Optional[dict]:
+        """Store a blob on Ceph, optionally with the given object metadata.
+
+        The blob can be also a file-like object or an iterable of bytes chunks to stream the blob content. Blobs
+        larger than multipart threshold and streamed blobs are uploaded in multiple parts in parallel, None is
+        returned in such cases instead of response to the put request.
+        """
+        s3_object = self._s3.Object(self.bucket, f"{self.prefix}{object_key}")
+        if isinstance(blob, (bytes, bytearray)):
+            if len(blob) <= self.multipart_threshold:
+                put_kwargs = {"Body": blob}
+                if metadata:
+                    put_kwargs["Metadata"] = metadata
+                response = s3_object.put(**put_kwargs)
+                return response
+
+            blob = io.BytesIO(blob)
+        elif not hasattr(blob, "read"):
+            blob = _IterableStream(blob)
+
+        s3_object.upload_fileobj(
+            blob, ExtraArgs={"Metadata": metadata} if metadata else None, Config=self._get_transfer_config()
+        )
+        return None
 
     def store_document(self, document: dict, document_id: str) -> dict:
-        """Store a document (dict) onto Ceph."""
-        blob = self.dict2blob(document)
-        return self.store_blob(blob, document_id)
+        """Store a document (dict) onto Ceph, the codec used is recorded in object metadata."""
+        return self.store_encoded_document(self.encode_document(document), document_id)
 
-    def retrieve_blob(self, object_key: str) -> bytes:
-        """Retrieve remote object content."""
+    def store_encoded_document(self, blob: bytes, document_id: str) -> dict:
+        """Store a document already encoded using encode_document onto Ceph."""
+        return self.store_blob(blob, document_id, metadata={_CODEC_METADATA_KEY: self.codec})
+
+    def delete_documents(self, document_ids: typing.Iterable[str]) -> None:
+        """Delete the given documents, deletion of documents which do not exist is not reported."""
+        document_ids = iter(document_ids)
+        while True:
+            # Up to 1000 objects can be deleted in a single request.
+            batch = [{"Key": f"{self.prefix}{document_id}"} for document_id in itertools.islice(document_ids, 1000)]
+            if not batch:
+                break
+
+            self._s3.meta.client.delete_objects(Bucket=self.bucket, Delete={"Objects": batch, "Quiet": True})
+
+    def _get_object(self, object_key: str) -> dict:
+        """Retrieve remote object, thread safe."""
         try:
-            return self._s3.Object(self.bucket, f"{self.prefix}{object_key}").get()["Body"].read()
+            return self._s3.meta.client.get_object(Bucket=self.bucket, Key=f"{self.prefix}{object_key}")
         except botocore.exceptions.ClientError as exc:
             if exc.response["Error"]["Code"] in ("404", "NoSuchKey"):
                 raise NotFoundError("Failed to retrieve object, object {!r} does not exist".format(object_key)) from exc
             raise
 
-    def iterate_results(self) -> typing.Generator[tuple, None, None]:
-        """Iterate over results available in the Ceph."""
+    def retrieve_blob(self, object_key: str) -> bytes:
+        """Retrieve remote object content."""
+        return self._get_object(object_key)["Body"].read()
+
+    def _retrieve_blob_sized(
+        self, object_key: str, budget: _ByteBudget
+    ) -> typing.Tuple[bytes, typing.Optional[str], int]:
+        """Retrieve remote object content and codec once there is enough bytes in the budget, thread safe."""
+        response = self._get_object(object_key)
+        acquired = budget.acquire(response["ContentLength"])
+        try:
+            return response["Body"].read(), response["Metadata"].get(_CODEC_METADATA_KEY), acquired
+        except Exception:
+            budget.release(acquired)
+            raise
+
+    def retrieve_many(
+        self,
+        document_ids: typing.Iterable[str],
+        *,
+        concurrency: typing.Optional[int] = None,
+        max_in_flight_bytes: typing.Optional[int] = None,
+    ) -> typing.Generator[typing.Tuple[str, dict], None, None]:
+        """Retrieve documents concurrently, yield pairs of document id and document as they are retrieved.
+
+        Documents are retrieved in a pool of threads, memory used is bounded by number of bytes of documents
+        retrieved and not yet consumed.
+        """
+        concurrency = concurrency or self.DEFAULT_CONCURRENCY
+        budget = _ByteBudget(max_in_flight_bytes or self.DEFAULT_MAX_IN_FLIGHT_BYTES)
+        document_ids = iter(document_ids)
+        in_flight = {}
+
+        with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="ceph-retrieve") as executor:
+            try:
+                while True:
+                    # Do not exhaust listing upfront, keep just enough documents scheduled.
+                    for document_id in document_ids:
+                        in_flight[executor.submit(self._retrieve_blob_sized, document_id, budget)] = document_id
+                        if len(in_flight) >= 2 * concurrency:
+                            break
+
+                    if not in_flight:
+                        break
+
+                    done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        document_id = in_flight.pop(future)
+                        blob, codec, acquired = future.result()
+                        try:
+                            document = self.blob2dict(blob, codec)
+                        finally:
+                            budget.release(acquired)
+
+                        yield document_id, document
+            finally:
+                for future in in_flight:
+                    future.cancel()
+
+                # Unblock workers waiting for budget so that the pool can be shut down.
+                budget.close()
+
+    def iterate_results(self, concurrency: typing.Optional[int] = None) -> typing.Generator[tuple, None, None]:
+        """Iterate over results available in the Ceph.
+
+        If concurrency is provided, documents are retrieved concurrently and yielded as they are retrieved.
+        """
+        if concurrency is not None:
+            yield from self.retrieve_many(self.get_document_listing(), concurrency=concurrency)
+            return
+
         for document_id in self.get_document_listing():
             document = self.retrieve_document(document_id)
             yield document_id, document
 
     def retrieve_document(self, document_id: str) -> dict:
-        """Retrieve a dictionary stored as JSON from S3."""
-        return json.loads(self.retrieve_blob(document_id).decode())
+        """Retrieve a dictionary stored as JSON from S3, decode it based on codec recorded in object metadata."""
+        response = self._get_object(document_id)
+        return self.blob2dict(response["Body"].read(), response["Metadata"].get(_CODEC_METADATA_KEY))
+
+    def retrieve_document_streamed(self, document_id: str, streamed_paths: typing.Iterable[str]) -> dict:
+        """Retrieve a dictionary stored as JSON from S3, parse sections under the given paths incrementally.
+
+        Object body is spooled to a temporary file. Sections stored under the given paths (dot separated keys, e.g.
+        "result.system-symbols") are not materialized, they are represented as StreamedSection which parses the
+        section from the spooled body each time it is iterated over. If ijson is not installed, the whole document
+        is parsed.
+        """
+        if ijson is None:
+            _LOGGER.warning("Package ijson is not installed, document %r will be parsed as a whole", document_id)
+            return self.retrieve_document(document_id)
+
+        streamed_paths = frozenset(streamed_paths)
+        response = self._get_object(document_id)
+        body = _SpooledBody(response["Body"], response["Metadata"].get(_CODEC_METADATA_KEY))
+
+        builder = ObjectBuilder()
+        skipped_path = None
+        with body.open() as stream:
+            for prefix, event, value in ijson.parse(stream, use_float=True):
+                if skipped_path is not None:
+                    if prefix == skipped_path or prefix.startswith(f"{skipped_path}."):
+                        continue
+
+                    skipped_path = None
+
+                builder.event(event, value)
+                if event == "map_key":
+                    path = f"{prefix}.{value}" if prefix else value
+                    if path in streamed_paths:
+                        # Assign the streamed section as a value of the key, skip parsing the section.
+                        builder.event("string", StreamedSection(body, path))
+                        skipped_path = path
+
+        return builder.value
 
     def is_connected(self) -> bool:
         """Check whether adapter is connected to the remote Ceph storage."""
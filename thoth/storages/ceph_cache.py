@@ -17,22 +17,486 @@
 
 """A base class for implementing caches based on Ceph."""
 
+import datetime
+import hashlib
+import json
+import logging
+import math
+import os
+import struct
+import tempfile
+import threading
+import time
+import typing
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 
+from .ceph import CephStore
 from .exceptions import CacheMiss
 from .exceptions import NotFoundError
 from .result_base import ResultStorageBase
 
+_LOGGER = logging.getLogger(__name__)
+
+
+class _LocalCache:
+    """Local tier of cache records - an in-memory LRU bounded by bytes and optionally a directory on disk.
+
+    Records are kept as JSON encoded blobs, misses are kept as None so that they are not re-fetched until they
+    expire. Files in the directory are named by hash of the record key, modification time of a file is set to
+    its expiration time and files which expire first are evicted first once the directory grows over its limit.
+    """
+
+    # Prefixes of file content distinguishing records from misses.
+    _FILE_HIT = b"1"
+    _FILE_MISS = b"0"
+
+    def __init__(
+        self,
+        *,
+        memory_bytes: int,
+        directory: typing.Optional[str],
+        directory_bytes: int,
+        ttl: float,
+        miss_ttl: float,
+    ):
+        """Initialize local tier, directory is created if it does not exist."""
+        self.memory_bytes = memory_bytes
+        self.directory = directory
+        self.directory_bytes = directory_bytes
+        self.ttl = ttl
+        self.miss_ttl = miss_ttl
+        self._memory = OrderedDict()
+        self._memory_size = 0
+        self._directory_size = None
+        self._lock = threading.Lock()
+
+        if self.directory:
+            os.makedirs(self.directory, exist_ok=True)
+
+    def _get_path(self, key: str) -> str:
+        """Get path to file holding record stored under the given key."""
+        return os.path.join(self.directory, hashlib.sha256(key.encode()).hexdigest())
+
+    def _pop_memory(self, key: str) -> None:
+        """Remove record from memory, lock has to be held."""
+        _, blob = self._memory.pop(key)
+        self._memory_size -= len(key) + len(blob or b"")
+
+    def _get_memory(self, key: str, now: float) -> typing.Tuple[bool, typing.Optional[bytes]]:
+        """Get record from memory, expired records are removed."""
+        with self._lock:
+            item = self._memory.get(key)
+            if item is None:
+                return False, None
+
+            expires, blob = item
+            if expires <= now:
+                self._pop_memory(key)
+                return False, None
+
+            self._memory.move_to_end(key)
+            return True, blob
+
+    def _put_memory(self, key: str, blob: typing.Optional[bytes], expires: float) -> None:
+        """Put record to memory, least recently used records are evicted to stay in the memory limit."""
+        size = len(key) + len(blob or b"")
+        with self._lock:
+            if key in self._memory:
+                self._pop_memory(key)
+
+            if size > self.memory_bytes:
+                return
+
+            self._memory[key] = (expires, blob)
+            self._memory_size += size
+            while self._memory_size > self.memory_bytes:
+                self._pop_memory(next(iter(self._memory)))
+
+    def _get_directory(self, key: str, now: float) -> typing.Tuple[bool, typing.Optional[bytes], float]:
+        """Get record from directory together with its expiration time, expired records are removed."""
+        path = self._get_path(key)
+        try:
+            expires = os.stat(path).st_mtime
+            if expires <= now:
+                self._remove_file(path)
+                return False, None, 0.0
+
+            with open(path, "rb") as cache_file:
+                content = cache_file.read()
+        except FileNotFoundError:
+            return False, None, 0.0
+
+        if content.startswith(self._FILE_MISS):
+            return True, None, expires
+
+        return True, content[len(self._FILE_HIT) :], expires  # Ignore PycodestyleBear (E203)
+
+    def _remove_file(self, path: str) -> None:
+        """Remove a file from directory, files removed concurrently by other processes are ignored."""
+        try:
+            size = os.stat(path).st_size
+            os.remove(path)
+        except FileNotFoundError:
+            return
+
+        with self._lock:
+            if self._directory_size is not None:
+                self._directory_size -= size
+
+    def _put_directory(self, key: str, blob: typing.Optional[bytes], expires: float) -> None:
+        """Put record to directory, files which expire first are evicted to stay in the directory size limit."""
+        path = self._get_path(key)
+        content = self._FILE_MISS if blob is None else self._FILE_HIT + blob
+        if len(content) > self.directory_bytes:
+            self._remove_file(path)
+            return
+
+        # Write to a temporary file first so that readers never see partially written records.
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as tmp_file:
+                tmp_file.write(content)
+
+            os.utime(tmp_path, (expires, expires))
+            try:
+                replaced_size = os.stat(path).st_size
+            except FileNotFoundError:
+                replaced_size = 0
+
+            os.replace(tmp_path, path)
+        except Exception:
+            os.remove(tmp_path)
+            raise
+
+        with self._lock:
+            if self._directory_size is None:
+                # Files can be present from previous runs.
+                self._directory_size = sum(entry.stat().st_size for entry in os.scandir(self.directory))
+            else:
+                self._directory_size += len(content) - replaced_size
+
+            evict = self._directory_size > self.directory_bytes
+
+        if evict:
+            self._evict_directory()
+
+    def _evict_directory(self) -> None:
+        """Evict files from directory until it fits into its size limit.
+
+        Size of the directory is recomputed as the directory can be shared with other processes.
+        """
+        entries = []
+        directory_size = 0
+        for entry in os.scandir(self.directory):
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue
+
+            directory_size += stat.st_size
+            if not entry.name.startswith(".tmp-"):
+                # Files being written are not evicted.
+                entries.append((stat.st_mtime, entry.path))
+
+        with self._lock:
+            self._directory_size = directory_size
+
+        for _, path in sorted(entries):
+            with self._lock:
+                if self._directory_size <= self.directory_bytes:
+                    break
+
+            self._remove_file(path)
+
+    def get(self, key: str) -> typing.Tuple[bool, typing.Optional[bytes]]:
+        """Get record stored under the given key, return a flag whether the record is cached and the record.
+
+        A record cached as a miss is returned as None.
+        """
+        now = time.time()
+        if self.memory_bytes > 0:
+            found, blob = self._get_memory(key, now)
+            if found:
+                return True, blob
+
+        if self.directory:
+            found, blob, expires = self._get_directory(key, now)
+            if found:
+                if self.memory_bytes > 0:
+                    self._put_memory(key, blob, expires)
+                return True, blob
+
+        return False, None
+
+    def put(self, key: str, blob: typing.Optional[bytes]) -> None:
+        """Put record under the given key, None records a miss."""
+        ttl = self.miss_ttl if blob is None else self.ttl
+        if ttl <= 0:
+            self.discard(key)
+            return
+
+        expires = time.time() + ttl
+        if self.memory_bytes > 0:
+            self._put_memory(key, blob, expires)
+        if self.directory:
+            self._put_directory(key, blob, expires)
+
+    def discard(self, key: str) -> None:
+        """Remove record stored under the given key."""
+        if self.memory_bytes > 0:
+            with self._lock:
+                if key in self._memory:
+                    self._pop_memory(key)
+        if self.directory:
+            self._remove_file(self._get_path(key))
+
+
+class _BloomFilter:
+    """A bloom filter of document ids, answers whether a document id is definitely not present."""
+
+    # Serialized as number of bits and number of hash functions followed by bits.
+    _HEADER = struct.Struct(">QI")
+
+    def __init__(self, bit_count: int, hash_count: int, bits: typing.Optional[bytearray] = None):
+        """Initialize an empty bloom filter or a bloom filter with the given bits set."""
+        self.bit_count = bit_count
+        self.hash_count = hash_count
+        self.bits = bits if bits is not None else bytearray((bit_count + 7) // 8)
+
+    @classmethod
+    def for_capacity(cls, capacity: int, false_positive_rate: float) -> "_BloomFilter":
+        """Create a bloom filter sized for the given number of document ids and false positive rate."""
+        capacity = max(capacity, 1)
+        bit_count = max(int(math.ceil(-capacity * math.log(false_positive_rate) / math.log(2) ** 2)), 8)
+        hash_count = max(int(round(bit_count / capacity * math.log(2))), 1)
+        return cls(bit_count, hash_count)
+
+    def _iter_positions(self, document_id: str) -> typing.Generator[int, None, None]:
+        """Iterate over positions of bits for the given document id, double hashing is used."""
+        digest = hashlib.sha256(document_id.encode()).digest()
+        h1 = int.from_bytes(digest[:8], "big")
+        h2 = int.from_bytes(digest[8:16], "big") | 1
+        for i in range(self.hash_count):
+            yield (h1 + i * h2) % self.bit_count
+
+    def add(self, document_id: str) -> None:
+        """Add the given document id to the bloom filter."""
+        for position in self._iter_positions(document_id):
+            self.bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, document_id: str) -> bool:
+        """Check whether the given document id can be present, False is returned only for absent ids."""
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._iter_positions(document_id))
+
+    def to_bytes(self) -> bytes:
+        """Serialize the bloom filter."""
+        return self._HEADER.pack(self.bit_count, self.hash_count) + bytes(self.bits)
+
+    @classmethod
+    def from_bytes(cls, blob: bytes) -> "_BloomFilter":
+        """Deserialize the bloom filter."""
+        bit_count, hash_count = cls._HEADER.unpack_from(blob)
+        return cls(bit_count, hash_count, bytearray(blob[cls._HEADER.size :]))  # Ignore PycodestyleBear (E203)
+
 
 class CephCache(ResultStorageBase):
-    """A base class implementing cache interface."""
+    """A base class implementing cache interface.
+
+    Records can be cached locally in memory and in a directory on disk, see README for configuration.
+    """
+
+    # Default time in seconds records and misses are kept in the local cache.
+    DEFAULT_LOCAL_CACHE_TTL = 300
+    DEFAULT_LOCAL_CACHE_MISS_TTL = 60
+    DEFAULT_LOCAL_CACHE_DIRECTORY_BYTES = 256 * 1024 * 1024
+    # Default false positive rate of bloom filter snapshots.
+    DEFAULT_BLOOM_FILTER_FALSE_POSITIVE_RATE = 0.01
+    # Snapshots are versioned by time they were built, records stored since are marked as pending.
+    _BLOOM_FILTER_SNAPSHOT_PREFIX = "snapshot/"
+    _BLOOM_FILTER_PENDING_PREFIX = "pending/"
+
+    def __init__(self, *args, **kwargs):
+        """Initialize cache adapter, local cache and use of bloom filter is configured using env variables."""
+        super().__init__(*args, **kwargs)
+        memory_bytes = int(os.getenv("THOTH_STORAGES_CACHE_MEMORY_BYTES", 0))
+        directory = os.getenv("THOTH_STORAGES_CACHE_DIRECTORY")
+
+        self._local_cache = None
+        if memory_bytes > 0 or directory:
+            self._local_cache = _LocalCache(
+                memory_bytes=memory_bytes,
+                directory=os.path.join(directory, self.RESULT_TYPE) if directory else None,
+                directory_bytes=int(
+                    os.getenv("THOTH_STORAGES_CACHE_DIRECTORY_BYTES", self.DEFAULT_LOCAL_CACHE_DIRECTORY_BYTES)
+                ),
+                ttl=float(os.getenv("THOTH_STORAGES_CACHE_TTL", self.DEFAULT_LOCAL_CACHE_TTL)),
+                miss_ttl=float(os.getenv("THOTH_STORAGES_CACHE_MISS_TTL", self.DEFAULT_LOCAL_CACHE_MISS_TTL)),
+            )
+
+        # Records are stored under prefix with a trailing slash, the snapshot is not listed together with records.
+        self.bloom_filter_ceph = CephStore(
+            f"{self.prefix}-bloom-filter",
+            host=self.ceph.host,
+            key_id=self.ceph.key_id,
+            secret_key=self.ceph.secret_key,
+            bucket=self.ceph.bucket,
+            region=self.ceph.region,
+        )
+        self.bloom_filter_enabled = bool(int(os.getenv("THOTH_STORAGES_CACHE_BLOOM_FILTER", 0)))
+        self._bloom_filter = None
+        self._bloom_filter_snapshot = None
+        self._bloom_filter_lock = threading.Lock()
+
+    def _get_bloom_filter_ceph(self) -> CephStore:
+        """Get connected store with bloom filter snapshot, the store is connected lazily as it is rarely used."""
+        if not self.bloom_filter_ceph.is_connected():
+            self.bloom_filter_ceph.connect()
+
+        return self.bloom_filter_ceph
+
+    def _list_bloom_filter(self) -> typing.Tuple[typing.List[str], typing.List[str]]:
+        """List versions of bloom filter snapshots and markers of records stored since, in a single listing."""
+        snapshots, pending = [], []
+        for key in self._get_bloom_filter_ceph().get_document_listing():
+            if key.startswith(self._BLOOM_FILTER_SNAPSHOT_PREFIX):
+                snapshots.append(key)
+            elif key.startswith(self._BLOOM_FILTER_PENDING_PREFIX):
+                pending.append(key)
+
+        return snapshots, pending
+
+    def build_bloom_filter(self, false_positive_rate: typing.Optional[float] = None) -> int:
+        """Build a bloom filter of records present in the cache and store a new snapshot version next to the records.
+
+        Markers of records stored since the previous snapshot and previous snapshots are removed once the new
+        snapshot is stored. Returns number of records in the snapshot.
+        """
+        # Records of markers listed were stored before records are listed, they are present in the new snapshot.
+        snapshots, pending = self._list_bloom_filter()
+        document_ids = list(self.get_document_listing())
+        bloom_filter = _BloomFilter.for_capacity(
+            len(document_ids), false_positive_rate or self.DEFAULT_BLOOM_FILTER_FALSE_POSITIVE_RATE
+        )
+        for document_id in document_ids:
+            bloom_filter.add(document_id)
+
+        snapshot = self._BLOOM_FILTER_SNAPSHOT_PREFIX + datetime.datetime.utcnow().strftime("%Y%m%d%H%M%S%f")
+        bloom_filter_ceph = self._get_bloom_filter_ceph()
+        bloom_filter_ceph.store_blob(bloom_filter.to_bytes(), snapshot)
+        bloom_filter_ceph.delete_documents(pending + [key for key in snapshots if key < snapshot])
+        return len(document_ids)
+
+    def _get_bloom_filter(self) -> typing.Tuple[typing.Optional[_BloomFilter], typing.Set[str]]:
+        """Get the latest bloom filter snapshot if enabled together with ids of records stored since it was built.
+
+        Snapshots and markers of records stored since are listed on each call, which is a single request unless
+        there are many markers. The snapshot is retrieved only if a new version was built.
+        """
+        if not self.bloom_filter_enabled:
+            return None, set()
+
+        snapshots, pending = self._list_bloom_filter()
+        # Markers are listed before snapshots, a marker removed once listed is included in a snapshot listed.
+        pending = {key[len(self._BLOOM_FILTER_PENDING_PREFIX) :] for key in pending}  # Ignore PycodestyleBear (E203)
+        if not snapshots:
+            _LOGGER.warning(
+                "No bloom filter snapshot found for %r, build one using build_bloom_filter", self.RESULT_TYPE
+            )
+            return None, pending
+
+        snapshot = max(snapshots)
+        with self._bloom_filter_lock:
+            if snapshot != self._bloom_filter_snapshot:
+                try:
+                    blob = self._get_bloom_filter_ceph().retrieve_blob(snapshot)
+                except NotFoundError:
+                    # Replaced by a newer snapshot meanwhile, markers listed do not cover records it includes.
+                    _LOGGER.debug("Bloom filter snapshot %r for %r was replaced", snapshot, self.RESULT_TYPE)
+                    return None, pending
+
+                self._bloom_filter = _BloomFilter.from_bytes(blob)
+                self._bloom_filter_snapshot = snapshot
+
+            return self._bloom_filter, pending
+
+    def _retrieve_record(self, document_id: str) -> typing.Optional[dict]:
+        """Retrieve record from Ceph and keep it in local cache, None is returned if there is no record."""
+        try:
+            document = self.retrieve_document(document_id)
+        except NotFoundError:
+            if self._local_cache is not None:
+                self._local_cache.put(document_id, None)
+            return None
+
+        if self._local_cache is not None:
+            self._local_cache.put(document_id, json.dumps(document).encode())
+
+        return document
 
     def retrieve_document_record(self, document_id: str) -> dict:
         """Check whether the given record exists in the cache for the requested document."""
-        try:
-            return self.retrieve_document(document_id)
-        except NotFoundError as exc:
-            raise CacheMiss(f"There was no record found in the cache for {document_id!r}") from exc
+        if self._local_cache is not None:
+            found, blob = self._local_cache.get(document_id)
+            if found:
+                if blob is None:
+                    raise CacheMiss(f"There was no record found in the cache for {document_id!r}")
+
+                return json.loads(blob)
+
+        document = self._retrieve_record(document_id)
+        if document is None:
+            raise CacheMiss(f"There was no record found in the cache for {document_id!r}")
+
+        return document
+
+    def retrieve_document_records(
+        self, document_ids: typing.Iterable[str], *, concurrency: typing.Optional[int] = None
+    ) -> typing.Tuple[typing.Dict[str, dict], typing.Set[str]]:
+        """Check which of the given records exist in the cache, return records found and ids of records missing.
+
+        Records are looked up in local cache first, records not cached locally are retrieved concurrently. If bloom
+        filter is enabled, records which are definitely not present based on its latest snapshot and which were
+        not stored since the snapshot was built are reported missing without being retrieved.
+        """
+        records, misses, to_retrieve = {}, set(), []
+        bloom_filter, pending = self._get_bloom_filter()
+        for document_id in dict.fromkeys(document_ids):
+            if self._local_cache is not None:
+                found, blob = self._local_cache.get(document_id)
+                if found:
+                    if blob is None:
+                        misses.add(document_id)
+                    else:
+                        records[document_id] = json.loads(blob)
+                    continue
+
+            if bloom_filter is not None and document_id not in bloom_filter and document_id not in pending:
+                misses.add(document_id)
+                continue
+
+            to_retrieve.append(document_id)
+
+        if not to_retrieve:
+            return records, misses
+
+        concurrency = min(concurrency or CephStore.DEFAULT_CONCURRENCY, len(to_retrieve))
+        with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="cache-retrieve") as executor:
+            for document_id, document in zip(to_retrieve, executor.map(self._retrieve_record, to_retrieve)):
+                if document is None:
+                    misses.add(document_id)
+                else:
+                    records[document_id] = document
+
+        return records, misses
 
     def store_document_record(self, document_id: str, document: dict) -> str:
         """Store the given document record in the cache."""
         self.ceph.store_document(document, document_id)
+        if self._local_cache is not None:
+            # Records stored by other processes are seen once miss records kept locally expire.
+            self._local_cache.put(document_id, json.dumps(document).encode())
+
+        if self.bloom_filter_enabled:
+            # Records stored after a bloom filter snapshot was built are marked so that they are not reported missing.
+            self._get_bloom_filter_ceph().store_blob(b"", self._BLOOM_FILTER_PENDING_PREFIX + document_id)
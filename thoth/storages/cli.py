@@ -88,5 +88,43 @@ def generate_schema(schema_file: str):
     graph.write_png(schema_file)
 
 
+@cli.command("backup-table-rows")
+def backup_table_rows():
+    """Store an incremental backup of rows inserted into the database since the last backup of table rows."""
+    from thoth.storages import DatabaseBackup
+    from thoth.storages import GraphDatabase
+
+    graph = GraphDatabase()
+    graph.connect()
+    database_backup = DatabaseBackup()
+    database_backup.connect()
+
+    backup_id = database_backup.store_table_rows_backup(graph)
+    _LOGGER.info("Table rows were stored in backup %r", backup_id)
+
+
+@cli.command("restore-table-rows")
+@click.option(
+    "--backup-id",
+    type=str,
+    metavar="ID",
+    envvar="THOTH_STORAGES_BACKUP_ID",
+    help="Restore table rows up to the given backup, the latest backup is restored if not provided.",
+)
+def restore_table_rows(backup_id: str = None):
+    """Restore table rows from the base backup and subsequent incremental backups into an empty database."""
+    from thoth.storages import DatabaseBackup
+    from thoth.storages import GraphDatabase
+
+    graph = GraphDatabase()
+    graph.connect()
+    graph.initialize_schema()
+    database_backup = DatabaseBackup()
+    database_backup.connect()
+
+    backup_ids = database_backup.restore_table_rows_backup(graph, backup_id)
+    _LOGGER.info("Table rows were restored from backups %r", backup_ids)
+
+
 if __name__ == "__main__":
     cli()
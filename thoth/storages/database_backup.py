@@ -17,18 +17,30 @@
 
 """Adapter for storing database backups."""
 
+import datetime
 import hashlib
+import logging
 import os
+import tarfile
+import tempfile
 import typing
 
 from .ceph import CephStore
 from .base import StorageBase
+from .exceptions import NotFoundError
+from .graph import GraphDatabase
+
+_LOGGER = logging.getLogger(__name__)
 
 
 class DatabaseBackup(StorageBase):
     """Adapter for storing database backups."""
 
     RESULT_TYPE = "database-backup"
+    # Size of blocks read when computing digest of backup files.
+    _DIGEST_BLOCK_SIZE = 8 * 1024 * 1024
+    # Type of backups of table rows recorded in their manifests.
+    _TABLE_ROWS_BACKUP_TYPE = "table-rows"
 
     def __init__(
         self,
@@ -52,6 +64,15 @@ class DatabaseBackup(StorageBase):
         self.ceph = CephStore(
             self.prefix, host=host, key_id=key_id, secret_key=secret_key, bucket=bucket, region=region
         )
+        # Manifests are stored outside of prefix with backups so that they do not show up in backup listing.
+        self.manifest_ceph = CephStore(
+            "{}-manifest".format(self.prefix.rstrip("/")),
+            host=host,
+            key_id=key_id,
+            secret_key=secret_key,
+            bucket=bucket,
+            region=region,
+        )
 
     def is_connected(self) -> bool:
         """Check if the given database adapter is in connected state."""
@@ -60,22 +81,183 @@ class DatabaseBackup(StorageBase):
     def connect(self) -> None:
         """Connect the given storage adapter."""
         self.ceph.connect()
+        self.manifest_ceph.connect()
+
+    @classmethod
+    def _compute_digest(cls, path: str) -> typing.Tuple[str, int]:
+        """Compute sha256 digest and size of the given file, the file is read in blocks."""
+        digest = hashlib.sha256()
+        size = 0
+        with open(path, "rb") as backup_file:
+            for block in iter(lambda: backup_file.read(cls._DIGEST_BLOCK_SIZE), b""):
+                digest.update(block)
+                size += len(block)
+
+        return digest.hexdigest(), size
+
+    def store_backup(self, backup_file: str, *, manifest: typing.Optional[dict] = None) -> str:
+        """Store the given backup file (e.g. produced by pg_dump) in Ceph, return id of the stored backup.
+
+        The backup is identified by sha256 digest of its content, backups already stored are not uploaded again.
+        Large files are uploaded in multiple parts in parallel, see multipart configuration of CephStore. A
+        manifest describing the backup, optionally extended with the given entries, is stored next to it once the
+        backup is uploaded.
+        """
+        backup_id, size = self._compute_digest(backup_file)
+        if self.manifest_ceph.document_exists(backup_id):
+            return backup_id
+
+        self.ceph.store_file(backup_file, backup_id)
+        manifest = {
+            **(manifest or {}),
+            "backup_id": backup_id,
+            "sha256": backup_id,
+            "size": size,
+            "file_name": os.path.basename(backup_file),
+            "datetime": datetime.datetime.utcnow().isoformat(),
+        }
+        self.manifest_ceph.store_document(manifest, backup_id)
+        return backup_id
+
+    def retrieve_backup_manifest(self, backup_id: str) -> dict:
+        """Retrieve manifest describing the given backup."""
+        return self.manifest_ceph.retrieve_document(backup_id)
+
+    def retrieve_backup(self, backup_id: str, path: str) -> dict:
+        """Retrieve the given backup to a file, return manifest describing the backup.
+
+        Large backups are downloaded in multiple parts in parallel. The downloaded file is checked against sha256
+        digest recorded in the manifest, it is removed if it does not match.
+        """
+        manifest = self.retrieve_backup_manifest(backup_id)
+        self.ceph.retrieve_file(backup_id, path)
+
+        digest, size = self._compute_digest(path)
+        if digest != manifest["sha256"] or size != manifest["size"]:
+            os.remove(path)
+            raise ValueError(
+                f"Backup {backup_id!r} retrieved does not match its manifest (sha256 {digest!r}, size {size})"
+            )
+
+        return manifest
+
+    def _get_table_rows_manifests(self) -> typing.Dict[str, dict]:
+        """Get manifests of backups of table rows keyed by backup id."""
+        return {
+            manifest["backup_id"]: manifest
+            for manifest in self.get_backup_listing()
+            if manifest.get("type") == self._TABLE_ROWS_BACKUP_TYPE
+        }
+
+    def store_table_rows_backup(self, graph: GraphDatabase) -> str:
+        """Store an incremental backup of rows inserted into the database since the last backup of table rows.
+
+        The first backup of table rows is a base backup holding all the rows. Rows of each table are exported
+        from the connected database based on their ids using binary COPY format (see
+        GraphDatabase.export_table_rows), exports are stored compressed in a single backup. Returns id of the
+        stored backup.
+        """
+        manifests = self._get_table_rows_manifests()
+        parent = max(manifests.values(), key=lambda manifest: manifest["datetime"], default=None)
+        since_ids = {}
+        if parent is not None:
+            since_ids = {table_name: export["until_id"] for table_name, export in parent["tables"].items()}
 
-    def store_backup(self, backup_file: str) -> str:
-        """Store the given file in Ceph."""
-        blob = self.ceph.dict2blob(document)
-        document_id = hashlib.sha256(blob).hexdigest()
-        self.ceph.store_blob(blob, document_id)
-        return document_id
+        with tempfile.TemporaryDirectory() as directory:
+            tables_directory = os.path.join(directory, "tables")
+            os.mkdir(tables_directory)
+            tables = graph.export_table_rows(tables_directory, since_ids)
+
+            archive_path = os.path.join(
+                directory, "table-rows-{}.tar.gz".format(datetime.datetime.utcnow().strftime("%Y%m%d%H%M%S"))
+            )
+            with tarfile.open(archive_path, "w:gz", compresslevel=6) as archive:
+                for table_name in tables:
+                    archive.add(os.path.join(tables_directory, table_name), arcname=table_name)
+
+            manifest = {
+                "type": self._TABLE_ROWS_BACKUP_TYPE,
+                "parent": parent["backup_id"] if parent is not None else None,
+                "tables": tables,
+            }
+            return self.store_backup(archive_path, manifest=manifest)
+
+    def restore_table_rows_backup(
+        self, graph: GraphDatabase, backup_id: typing.Optional[str] = None
+    ) -> typing.List[str]:
+        """Restore table rows from the base backup and increments up to the given backup (the latest by default).
+
+        Backups are replayed in order in which they were created into the connected database, the database should
+        have schema initialized and it should hold no data. The queue of packages pending solve is not backed up,
+        it is populated once rows are restored. Returns ids of backups replayed.
+        """
+        manifests = self._get_table_rows_manifests()
+        if backup_id is None:
+            if not manifests:
+                raise NotFoundError("No backups of table rows found")
+
+            backup_id = max(manifests.values(), key=lambda manifest: manifest["datetime"])["backup_id"]
+
+        chain = []
+        while backup_id is not None:
+            if backup_id not in manifests:
+                raise NotFoundError(f"No backup of table rows with id {backup_id!r} found")
+
+            chain.append(manifests[backup_id])
+            backup_id = manifests[backup_id]["parent"]
+
+        for manifest in reversed(chain):
+            _LOGGER.info("Restoring table rows from backup %r", manifest["backup_id"])
+            with tempfile.TemporaryDirectory() as directory:
+                archive_path = os.path.join(directory, manifest["file_name"])
+                self.retrieve_backup(manifest["backup_id"], archive_path)
+                tables_directory = os.path.join(directory, "tables")
+                with tarfile.open(archive_path, "r:gz") as archive:
+                    # Extract only exports listed in the manifest.
+                    for table_name in manifest["tables"]:
+                        archive.extract(archive.getmember(table_name), tables_directory)
+
+                graph.import_table_rows(tables_directory, manifest["tables"])
+
+        enqueued, _ = graph.populate_pending_solve()
+        _LOGGER.info("Enqueued %d packages pending solve for restored table rows", enqueued)
+        return [manifest["backup_id"] for manifest in reversed(chain)]
+
+    def get_backup_listing(self) -> typing.Generator[dict, None, None]:
+        """Get manifests of backups stored, manifests are small compared to backups."""
+        for backup_id in self.manifest_ceph.get_document_listing():
+            try:
+                yield self.retrieve_backup_manifest(backup_id)
+            except NotFoundError:
+                # Removed in the meantime.
+                continue
 
     def retrieve_document(self, document_id: str) -> dict:
         """Retrieve a document from Ceph by its id."""
         return self.ceph.retrieve_document(document_id)
 
-    def iterate_results(self) -> typing.Generator[tuple, None, None]:
-        """Iterate over results available in the Ceph."""
-        return self.ceph.iterate_results()
+    def retrieve_many(
+        self,
+        document_ids: typing.Iterable[str],
+        *,
+        concurrency: typing.Optional[int] = None,
+        max_in_flight_bytes: typing.Optional[int] = None,
+    ) -> typing.Generator[typing.Tuple[str, dict], None, None]:
+        """Retrieve documents from Ceph concurrently, yield pairs of document id and document as retrieved."""
+        return self.ceph.retrieve_many(
+            document_ids, concurrency=concurrency, max_in_flight_bytes=max_in_flight_bytes
+        )
+
+    def iterate_results(self, concurrency: typing.Optional[int] = None) -> typing.Generator[tuple, None, None]:
+        """Iterate over results available in the Ceph, retrieve them concurrently if concurrency is provided."""
+        return self.ceph.iterate_results(concurrency=concurrency)
 
-    def get_document_listing(self) -> typing.Generator[str, None, None]:
-        """Get listing of documents stored on the Ceph."""
-        return self.ceph.get_document_listing()
+    def get_document_listing(
+        self, start_after: typing.Optional[str] = None, *, limit: typing.Optional[int] = None, prefix: str = ""
+    ) -> typing.Generator[str, None, None]:
+        """Get listing of documents stored on the Ceph.
+
+        Listing can start after the given document id, be limited to the given number of documents and to documents
+        with ids starting with the given prefix.
+        """
+        return self.ceph.get_document_listing(start_after=start_after, limit=limit, prefix=prefix)
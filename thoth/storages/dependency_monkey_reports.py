@@ -17,6 +17,9 @@
 
 """Adapter for persisting reports from Dependency Monkey runs."""
 
+import typing
+
+from .ceph import CephStore
 from .result_base import ResultStorageBase
 
 
@@ -25,8 +28,71 @@ class DependencyMonkeyReportsStore(ResultStorageBase):
 
     RESULT_TYPE = "dependency-monkey-reports"
 
-    def iterate_inspection_ids(self) -> str:
-        """Iterate over all inspection ids that were run."""
-        for _, report in self.iterate_results():
+    def __init__(self, *args, **kwargs):
+        """Initialize adapter, inspection ids of reports are indexed next to reports."""
+        super().__init__(*args, **kwargs)
+        # Reports are stored under prefix with a trailing slash, the index is not listed together with reports.
+        self.inspection_index = CephStore(
+            f"{self.prefix}-inspection-ids",
+            host=self.ceph.host,
+            key_id=self.ceph.key_id,
+            secret_key=self.ceph.secret_key,
+            bucket=self.ceph.bucket,
+            region=self.ceph.region,
+        )
+
+    def _get_inspection_index(self) -> CephStore:
+        """Get connected store with index of inspection ids, the index is connected lazily as it is rarely used."""
+        if not self.inspection_index.is_connected():
+            self.inspection_index.connect()
+
+        return self.inspection_index
+
+    def _store_inspection_ids(self, document_id: str, inspection_ids: typing.List[str]) -> None:
+        """Store inspection ids of the given report to the index."""
+        self._get_inspection_index().store_document({"inspection_ids": inspection_ids}, document_id)
+
+    def store_document(self, document: dict) -> str:
+        """Store the given report in Ceph, index inspection ids run in the report."""
+        document_id = super().store_document(document)
+        self._store_inspection_ids(document_id, document["result"]["output"])
+        return document_id
+
+    def index_inspection_ids(self) -> int:
+        """Index inspection ids of reports which were not indexed yet (e.g. stored before the index was introduced).
+
+        Returns number of reports indexed.
+        """
+        indexed = set(self._get_inspection_index().get_document_listing())
+        not_indexed = (document_id for document_id in self.get_document_listing() if document_id not in indexed)
+
+        count = 0
+        for document_id, document in self.retrieve_many(not_indexed):
+            self._store_inspection_ids(document_id, document["result"]["output"])
+            count += 1
+
+        return count
+
+    def iterate_inspection_ids(self) -> typing.Generator[str, None, None]:
+        """Iterate over all inspection ids that were run.
+
+        Inspection ids are read from the index, reports are retrieved only if they were not indexed yet (e.g. they
+        were stored before the index was introduced). Use index_inspection_ids to index such reports.
+        """
+        index = self._get_inspection_index()
+        indexed = set(index.get_document_listing())
+        not_indexed = []
+
+        def to_retrieve() -> typing.Generator[str, None, None]:
+            for document_id in self.get_document_listing():
+                if document_id in indexed:
+                    yield document_id
+                else:
+                    not_indexed.append(document_id)
+
+        for _, entry in index.retrieve_many(to_retrieve()):
             # Yield inspections.
-            yield from report["result"]["output"]
+            yield from entry["inspection_ids"]
+
+        for _, document in self.retrieve_many(not_indexed):
+            yield from document["result"]["output"]
@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+# thoth-storages
+# Copyright(C) 2019 Fridolin Pokorny
+#
+# This program is free software: you can redistribute it and / or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+"""Materialized views holding aggregated counts of records, used to answer statistics queries cheaply."""
+
+from typing import Callable
+from typing import Dict
+from typing import Tuple
+
+import attr
+from sqlalchemy import and_
+from sqlalchemy import exists
+from sqlalchemy import func
+from sqlalchemy.orm import Query
+from sqlalchemy.orm.session import Session
+from sqlalchemy.sql import column
+from sqlalchemy.sql import table
+from sqlalchemy.sql.expression import TableClause
+
+from .models import EcosystemSolver
+from .models import PackageAnalyzerRun
+from .models import PythonPackageIndex
+from .models import PythonPackageVersion
+from .models import PythonPackageVersionEntity
+
+
+@attr.s(slots=True, frozen=True)
+class CountView:
+    """A materialized view holding number of records per key columns, records are counted in the count column."""
+
+    name = attr.ib(type=str)
+    key_columns = attr.ib(type=Tuple[str, ...])
+    # Construct query defining the view, the query has to return key columns and count.
+    construct_query = attr.ib(type=Callable[[Session], Query])
+
+    @property
+    def table(self) -> TableClause:
+        """Get table construct used to query the view."""
+        return table(self.name, *(column(name) for name in self.key_columns + ("count",)))
+
+
+def _construct_python_package_version_count_query(session: Session) -> Query:
+    """Count Python package versions per environment."""
+    return (
+        session.query(PythonPackageVersion)
+        .join(PythonPackageIndex)
+        .with_entities(
+            PythonPackageVersion.package_name.label("package_name"),
+            PythonPackageVersion.package_version.label("package_version"),
+            PythonPackageIndex.url.label("index_url"),
+            PythonPackageVersion.os_name.label("os_name"),
+            PythonPackageVersion.os_version.label("os_version"),
+            PythonPackageVersion.python_version.label("python_version"),
+            func.count().label("count"),
+        )
+        .group_by(
+            PythonPackageVersion.package_name,
+            PythonPackageVersion.package_version,
+            PythonPackageIndex.url,
+            PythonPackageVersion.os_name,
+            PythonPackageVersion.os_version,
+            PythonPackageVersion.python_version,
+        )
+    )
+
+
+def _construct_unsolved_python_package_version_count_query(session: Session) -> Query:
+    """Count Python package version entities not solved per environment of registered Python ecosystem solvers."""
+    return (
+        session.query(PythonPackageVersionEntity)
+        .join(PythonPackageIndex)
+        .filter(EcosystemSolver.ecosystem == "python")
+        .filter(
+            ~exists().where(
+                and_(
+                    PythonPackageVersion.entity_id == PythonPackageVersionEntity.id,
+                    PythonPackageVersion.os_name == EcosystemSolver.os_name,
+                    PythonPackageVersion.os_version == EcosystemSolver.os_version,
+                    PythonPackageVersion.python_version == EcosystemSolver.python_version,
+                )
+            )
+        )
+        .with_entities(
+            PythonPackageVersionEntity.package_name.label("package_name"),
+            PythonPackageVersionEntity.package_version.label("package_version"),
+            PythonPackageIndex.url.label("index_url"),
+            EcosystemSolver.os_name.label("os_name"),
+            EcosystemSolver.os_version.label("os_version"),
+            EcosystemSolver.python_version.label("python_version"),
+            # Multiple solvers (e.g. in different versions) can run in the same environment.
+            func.count(PythonPackageVersionEntity.id.distinct()).label("count"),
+        )
+        .group_by(
+            PythonPackageVersionEntity.package_name,
+            PythonPackageVersionEntity.package_version,
+            PythonPackageIndex.url,
+            EcosystemSolver.os_name,
+            EcosystemSolver.os_version,
+            EcosystemSolver.python_version,
+        )
+    )
+
+
+def _construct_analyzed_python_package_version_count_query(session: Session) -> Query:
+    """Count package-analyzer runs per Python package version."""
+    return (
+        session.query(PackageAnalyzerRun)
+        .join(PythonPackageVersionEntity)
+        .join(PythonPackageIndex)
+        .with_entities(
+            PythonPackageVersionEntity.package_name.label("package_name"),
+            PythonPackageVersionEntity.package_version.label("package_version"),
+            PythonPackageIndex.url.label("index_url"),
+            func.count().label("count"),
+        )
+        .group_by(
+            PythonPackageVersionEntity.package_name,
+            PythonPackageVersionEntity.package_version,
+            PythonPackageIndex.url,
+        )
+    )
+
+
+def _construct_unanalyzed_python_package_version_count_query(session: Session) -> Query:
+    """Count Python package version entities which were not analyzed."""
+    return (
+        session.query(PythonPackageVersionEntity)
+        .join(PythonPackageIndex)
+        .filter(
+            ~exists().where(PackageAnalyzerRun.input_python_package_version_entity_id == PythonPackageVersionEntity.id)
+        )
+        .with_entities(
+            PythonPackageVersionEntity.package_name.label("package_name"),
+            PythonPackageVersionEntity.package_version.label("package_version"),
+            PythonPackageIndex.url.label("index_url"),
+            func.count().label("count"),
+        )
+        .group_by(
+            PythonPackageVersionEntity.package_name,
+            PythonPackageVersionEntity.package_version,
+            PythonPackageIndex.url,
+        )
+    )
+
+
+_ENVIRONMENT_KEY_COLUMNS = ("package_name", "package_version", "index_url", "os_name", "os_version", "python_version")
+_KEY_COLUMNS = ("package_name", "package_version", "index_url")
+
+COUNT_VIEWS: Dict[str, CountView] = {
+    count_view.name: count_view
+    for count_view in (
+        CountView(
+            name="python_package_version_count",
+            key_columns=_ENVIRONMENT_KEY_COLUMNS,
+            construct_query=_construct_python_package_version_count_query,
+        ),
+        CountView(
+            name="unsolved_python_package_version_count",
+            key_columns=_ENVIRONMENT_KEY_COLUMNS,
+            construct_query=_construct_unsolved_python_package_version_count_query,
+        ),
+        CountView(
+            name="analyzed_python_package_version_count",
+            key_columns=_KEY_COLUMNS,
+            construct_query=_construct_analyzed_python_package_version_count_query,
+        ),
+        CountView(
+            name="unanalyzed_python_package_version_count",
+            key_columns=_KEY_COLUMNS,
+            construct_query=_construct_unanalyzed_python_package_version_count_query,
+        ),
+    )
+}
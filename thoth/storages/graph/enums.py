@@ -70,3 +70,12 @@ class QuerySortTypeEnum(Enum):
 
     PACKAGE_NAME = "package_name"
     PACKAGE_VERSION = "package_version"
+
+
+class TransitiveDependenciesEngineEnum(Enum):
+    """Class for the engines computing transitive dependencies of a Python package."""
+
+    # Traverse the dependency graph in Python, issuing queries for each level of the graph.
+    GRAPH_WALK = "GRAPH_WALK"
+    # Compute the whole transitive closure on the database side in one query.
+    RECURSIVE_CTE = "RECURSIVE_CTE"
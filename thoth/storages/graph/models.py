@@ -83,6 +83,7 @@ class PythonPackageVersion(Base, BaseExtension):
                 "package_name", "package_version", "python_package_index_id", "os_name", "os_version", "python_version"
             ),
             Index("python_package_version_idx", "package_name", "package_version", "python_package_index_id"),
+            Index("python_package_version_entity_id_idx", "entity_id", "os_name", "os_version", "python_version"),
         ]
     )
 
@@ -133,6 +134,7 @@ class PythonPackageVersionEntity(Base, BaseExtension):
     """Representation of a Python package not running in any environment."""
 
     __tablename__ = "python_package_version_entity"
+    _GET_OR_CREATE_CACHED = True
 
     id = Column(Integer, primary_key=True, autoincrement=True, unique=True)
 
@@ -151,6 +153,7 @@ class PythonPackageVersionEntity(Base, BaseExtension):
     # user_software_stacks = relationship("PythonSoftwareStack", back_populates="python_package_version_entity")
     index = relationship("PythonPackageIndex", back_populates="python_package_version_entities")
     python_package_versions = relationship("PythonPackageVersion", back_populates="entity")
+    pending_solves = relationship("PendingSolve", back_populates="entity")
     python_artifacts = relationship("HasArtifact", back_populates="python_package_version_entity")
     python_software_stacks = relationship(
         "ExternalPythonRequirementsLock", back_populates="python_package_version_entity"
@@ -222,6 +225,40 @@ class EcosystemSolver(Base, BaseExtension):
     )
 
 
+class PendingSolve(Base, BaseExtension):
+    """A Python package version entity waiting to be solved in a software environment.
+
+    The table is maintained incrementally on syncs and serves as a work queue for solver scheduling, it can be
+    recomputed from solved packages and registered ecosystem solvers at any time.
+    """
+
+    __tablename__ = "pending_solve"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    entity_id = Column(Integer, ForeignKey("python_package_version_entity.id", ondelete="CASCADE"), nullable=False)
+    os_name = Column(String(256), nullable=False)
+    os_version = Column(String(256), nullable=False)
+    python_version = Column(String(256), nullable=False)
+    # Set once the record is handed out to a scheduler, the record is handed out again after the lease expires.
+    dequeued = Column(DateTime(timezone=False), nullable=True)
+
+    entity = relationship("PythonPackageVersionEntity", back_populates="pending_solves")
+
+    __table_args__ = (
+        UniqueConstraint("entity_id", "os_name", "os_version", "python_version"),
+        Index("pending_solve_environment_idx", "os_name", "os_version", "python_version", "id"),
+    )
+
+
+class CountViewRefresh(Base, BaseExtension):
+    """Time of the last refresh of a materialized count view, kept apart as the view can hold no records."""
+
+    __tablename__ = "count_view_refresh"
+
+    name = Column(String(256), primary_key=True)
+    refreshed = Column(DateTime(timezone=False), nullable=False)
+
+
 class PackageExtractRun(Base, BaseExtension):
     """A class representing a single package-extract (image analysis) run."""
 
@@ -397,6 +434,10 @@ class PackageAnalyzerRun(Base, BaseExtension):
     python_artifacts = relationship("Investigated", back_populates="package_analyzer_run")
     python_files = relationship("InvestigatedFile", back_populates="package_analyzer_run")
 
+    __table_args__ = (
+        Index("package_analyzer_run_input_entity_idx", "input_python_package_version_entity_id"),
+    )
+
 
 class PythonArtifact(Base, BaseExtension):
     """An artifact for a python package in a specific version."""
@@ -743,6 +784,7 @@ class PythonPackageIndex(Base, BaseExtension):
     """Representation of a Python package Index."""
 
     __tablename__ = "python_package_index"
+    _GET_OR_CREATE_CACHED = True
 
     id = Column(Integer, primary_key=True, autoincrement=True)
 
@@ -795,6 +837,7 @@ class RPMRequirement(Base, BaseExtension):
     """Requirement of an RPM as stated in a spec file."""
 
     __tablename__ = "rpm_requirement"
+    _GET_OR_CREATE_CACHED = True
 
     id = Column(Integer, primary_key=True, autoincrement=True)
 
@@ -1093,6 +1136,7 @@ class DebDependency(Base, BaseExtension):
     """A Debian dependency."""
 
     __tablename__ = "deb_dependency"
+    _GET_OR_CREATE_CACHED = True
 
     id = Column(Integer, primary_key=True, autoincrement=True)
 
@@ -1107,6 +1151,7 @@ class VersionedSymbol(Base, BaseExtension):
     """A system symbol."""
 
     __tablename__ = "versioned_symbol"
+    _GET_OR_CREATE_CACHED = True
 
     id = Column(Integer, primary_key=True, autoincrement=True)
 
@@ -18,11 +18,18 @@
 """A base and utilities for implementing SQLAlchemy based models."""
 
 import logging
+from typing import Any
+from typing import Optional
+from typing import Dict
 from typing import Union
 from itertools import combinations
 from typing import List
 
+import attr
 from sqlalchemy import Index
+from sqlalchemy import tuple_
+from sqlalchemy import UniqueConstraint
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import class_mapper
 from sqlalchemy.orm import ColumnProperty
@@ -34,14 +41,80 @@ Base = declarative_base()
 
 _LOGGER = logging.getLogger(__name__)
 
+# Key under which GetOrCreateCache is stored in session info.
+GET_OR_CREATE_CACHE_KEY = "get_or_create_cache"
+
+
+@attr.s(slots=True)
+class GetOrCreateCache:
+    """Memoize entities looked up or created during a session, see BaseExtension.get_or_create."""
+
+    entries = attr.ib(type=dict, factory=dict)
+    hits = attr.ib(type=int, default=0)
+    misses = attr.ib(type=int, default=0)
+
 
 class BaseExtension:
     """Extend base class with additional functionality."""
 
+    # Memoize entities of this model if the session has GetOrCreateCache assigned.
+    _GET_OR_CREATE_CACHED = False
+
+    @classmethod
+    def _get_or_create_cache_key(cls, session, kwargs: Dict[str, Any]) -> Optional[tuple]:
+        """Get key to the session cache, return None if the given entity lookup should not be memoized."""
+        if not cls._GET_OR_CREATE_CACHED or GET_OR_CREATE_CACHE_KEY not in session.info:
+            return None
+
+        key = (cls, tuple(sorted(kwargs.items())))
+        try:
+            hash(key)
+        except TypeError:
+            return None
+
+        return key
+
+    @classmethod
+    def get_first(cls, session, **kwargs):
+        """Query for the given entity, return None if it does not exist."""
+        key = cls._get_or_create_cache_key(session, kwargs)
+        if key is None:
+            return session.query(cls).filter_by(**kwargs).first()
+
+        cache = session.info[GET_OR_CREATE_CACHE_KEY]
+        instance = cache.entries.get(key)
+        if instance is not None:
+            cache.hits += 1
+            return instance
+
+        cache.misses += 1
+        instance = session.query(cls).filter_by(**kwargs).first()
+        if instance is not None:
+            cache.entries[key] = instance
+
+        return instance
+
+    @classmethod
+    def _get_unique_constraint_conflict(cls, session, kwargs: Dict[str, Any]) -> Optional["BaseExtension"]:
+        """Query for an entity which has the same values as the given attributes on any of unique constraints."""
+        for constraint in cls.__table__.constraints:
+            if not isinstance(constraint, UniqueConstraint):
+                continue
+
+            columns = [column.name for column in constraint.columns]
+            if not all(column in kwargs for column in columns):
+                continue
+
+            instance = session.query(cls).filter_by(**{column: kwargs[column] for column in columns}).first()
+            if instance is not None:
+                return instance
+
+        return None
+
     @classmethod
     def get_or_create(cls, session, **kwargs):
         """Query for the given entity, create if it does not exist yet."""
-        instance = session.query(cls).filter_by(**kwargs).first()
+        instance = cls.get_first(session, **kwargs)
         if instance:
             return instance, True
         else:
@@ -50,7 +123,6 @@ class BaseExtension:
                 instance = cls(**kwargs)
                 session.add(instance)
                 session.commit()
-                return instance, False
             except IntegrityError as exc:
                 session.rollback()
                 _LOGGER.warning(
@@ -59,7 +131,97 @@ class BaseExtension:
                     kwargs,
                     str(exc),
                 )
-                return session.query(cls).filter_by(**kwargs).one(), True
+                instance = session.query(cls).filter_by(**kwargs).first()
+                if instance is None:
+                    # The record created concurrently can differ in attributes not being part of the constraint.
+                    instance = cls._get_unique_constraint_conflict(session, kwargs)
+                    if instance is None:
+                        raise
+
+                existed = True
+            else:
+                existed = False
+
+            key = cls._get_or_create_cache_key(session, kwargs)
+            if key is not None:
+                session.info[GET_OR_CREATE_CACHE_KEY].entries[key] = instance
+
+            return instance, existed
+
+    @classmethod
+    def bulk_get_or_create(cls, session, rows: List[Dict[str, Any]], *, batch_size: int = 1000) -> List[int]:
+        """Query for the given entities, create the ones which do not exist yet in batches.
+
+        Semantics respect get_or_create called for each row, ids of entities are returned in the order of rows.
+        Entities are matched on client side so values have to be of types as returned by the database driver.
+        """
+        result = [None] * len(rows)
+
+        # Rows with different columns are matched differently, as done in get_or_create.
+        groups = {}
+        for idx, row in enumerate(rows):
+            groups.setdefault(tuple(sorted(row.keys())), []).append(idx)
+
+        for columns, indexes in groups.items():
+            keys = {}
+            for idx in indexes:
+                keys.setdefault(tuple(rows[idx][column] for column in columns), []).append(idx)
+
+            ids = {}
+            all_keys = list(keys.keys())
+            for i in range(0, len(all_keys), batch_size):
+                batch = all_keys[i : i + batch_size]  # Ignore PycodestyleBear (E203)
+                ids.update(cls._bulk_get(session, columns, batch))
+
+                to_create = [key for key in batch if key not in ids]
+                if to_create:
+                    statement = (
+                        insert(cls)
+                        .values([dict(zip(columns, key)) for key in to_create])
+                        .on_conflict_do_nothing()
+                        .returning(cls.id, *(getattr(cls, column) for column in columns))
+                    )
+                    for item in session.execute(statement):
+                        ids[tuple(item[1:])] = item[0]
+
+                    # Conflicts due to concurrent writes to database, the given entities exist now.
+                    conflicting = [key for key in to_create if key not in ids]
+                    if conflicting:
+                        _LOGGER.warning(
+                            "Integrity error on creating %d new records of %r; this can be due to "
+                            "concurrent writes to database, recovering",
+                            len(conflicting),
+                            cls.__name__,
+                        )
+                        ids.update(cls._bulk_get(session, columns, conflicting))
+
+            for key, key_indexes in keys.items():
+                for idx in key_indexes:
+                    result[idx] = ids[key]
+
+        return result
+
+    @classmethod
+    def _bulk_get(cls, session, columns: tuple, keys: List[tuple]) -> Dict[tuple, int]:
+        """Retrieve ids of existing entities matching the given keys."""
+        # Columns with NULL values cannot be used in IN, they are matched on client side.
+        in_columns = [idx for idx, _ in enumerate(columns) if all(key[idx] is not None for key in keys)]
+        query = session.query(cls.id, *(getattr(cls, column) for column in columns))
+        if in_columns:
+            query = query.filter(
+                tuple_(*(getattr(cls, columns[idx]) for idx in in_columns)).in_(
+                    list({tuple(key[idx] for idx in in_columns) for key in keys})
+                )
+            )
+
+        keys = set(keys)
+        result = {}
+        for item in query:
+            key = tuple(item[1:])
+            if key in keys and key not in result:
+                result[key] = item[0]
+
+        return result
 
     @classmethod
     def attribute_names(cls):
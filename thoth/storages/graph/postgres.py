@@ -17,10 +17,15 @@
 
 """An SQL database for storing Thoth data."""
 
+import base64
+import binascii
 import logging
 import json
 import os
 import itertools
+import time
+from datetime import datetime
+from datetime import timedelta
 from typing import List
 from typing import Set
 from typing import Tuple
@@ -29,17 +34,27 @@ from typing import FrozenSet
 from typing import Dict
 from typing import Union
 from typing import Any
-from collections import deque
 from contextlib import contextmanager
 
 import attr
 from methodtools import lru_cache
+from sqlalchemy import BigInteger
+from sqlalchemy import String
+from sqlalchemy import and_
+from sqlalchemy import bindparam
+from sqlalchemy import cast
 from sqlalchemy import create_engine
 from sqlalchemy import desc
+from sqlalchemy import exists
+from sqlalchemy import false
 from sqlalchemy import func
+from sqlalchemy import literal
 from sqlalchemy import tuple_
 from sqlalchemy import or_
+from sqlalchemy import text
+from sqlalchemy import true
 from sqlalchemy.orm import Query
+from sqlalchemy.orm import aliased
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.orm.session import Session
 from sqlalchemy.dialects.postgresql import insert
@@ -50,10 +65,12 @@ from thoth.python import PackageVersion
 from thoth.python import Pipfile
 from thoth.python import PipfileLock
 from thoth.common.helpers import format_datetime
+from thoth.common.helpers import parse_datetime
 from thoth.common import OpenShift
 
 from .models import AdviserRun
 from .models import CVE
+from .models import CountViewRefresh
 from .models import DebDependency
 from .models import DebPackageVersion
 from .models import DependencyMonkeyRun
@@ -65,6 +82,7 @@ from .models import HardwareInformation
 from .models import InspectionRun
 from .models import PackageAnalyzerRun
 from .models import PackageExtractRun
+from .models import PendingSolve
 from .models import ProvenanceCheckerRun
 from .models import PythonArtifact
 from .models import PythonFileDigest
@@ -125,13 +143,18 @@ from .models_performance import ALL_PERFORMANCE_MODELS, PERFORMANCE_MODEL_BY_NAM
 from collections import Counter
 
 from .sql_base import SQLBase
+from .count_views import COUNT_VIEWS
+from .count_views import CountView
 from .models_base import Base
+from .models_base import GetOrCreateCache
+from .models_base import GET_OR_CREATE_CACHE_KEY
 from .query_result_base import QueryResult
 from .enums import EnvironmentTypeEnum
 from .enums import SoftwareStackTypeEnum
 from .enums import InspectionSyncStateEnum
 from .enums import MetadataDistutilsTypeEnum
 from .enums import QuerySortTypeEnum
+from .enums import TransitiveDependenciesEngineEnum
 
 from ..analyses import AnalysisResultsStore
 from ..dependency_monkey_reports import DependencyMonkeyReportsStore
@@ -162,6 +185,31 @@ class GraphDatabase(SQLBase):
     _DECLARATIVE_BASE = Base
     DEFAULT_COUNT = 100
 
+    # Engine used to compute transitive dependencies if not stated explicitly on retrieval.
+    transitive_dependencies_engine = attr.ib(
+        type=TransitiveDependenciesEngineEnum,
+        default=attr.Factory(
+            lambda: os.getenv(
+                "THOTH_STORAGES_TRANSITIVE_DEPENDENCIES_ENGINE", TransitiveDependenciesEngineEnum.GRAPH_WALK.value
+            )
+        ),
+        converter=TransitiveDependenciesEngineEnum,
+    )
+    # Create records in batches when syncing documents, if not stated explicitly on sync.
+    bulk_sync = attr.ib(
+        type=bool, default=attr.Factory(lambda: bool(int(os.getenv("THOTH_STORAGES_BULK_SYNC", 0)))), converter=bool
+    )
+    # Maximum age in seconds of counts served from materialized count views, older views are refreshed on use.
+    count_views_max_age = attr.ib(
+        type=int,
+        default=attr.Factory(lambda: int(os.getenv("THOTH_STORAGES_COUNT_VIEWS_MAX_AGE", 3600))),
+        converter=int,
+    )
+    # Query results retrieved in batches, consumed by methods with memory caches.
+    _prefetched = attr.ib(type=dict, factory=dict, init=False, repr=False)
+    # Statistics of get_or_create caches used in sessions, aggregated by session name.
+    _get_or_create_cache_stats = attr.ib(type=dict, factory=dict, init=False, repr=False)
+
     def __del__(self) -> None:
         """Destruct adapter object."""
         if int(bool(os.getenv("THOTH_STORAGES_LOG_STATS", 0))):
@@ -186,9 +234,16 @@ class GraphDatabase(SQLBase):
         return connection_string
 
     @contextmanager
-    def _session_scope(self) -> Session:
-        """Handle session commit and rollback."""
+    def _session_scope(self, get_or_create_cache: Optional[str] = None) -> Session:
+        """Handle session commit and rollback.
+
+        If get_or_create_cache is provided, entities looked up or created using get_or_create are memoized
+        for the session lifetime, cache statistics are aggregated under the given name.
+        """
         session = self._sessionmaker()
+        if get_or_create_cache:
+            session.info[GET_OR_CREATE_CACHE_KEY] = GetOrCreateCache()
+
         try:
             yield session
             session.commit()
@@ -196,8 +251,48 @@ class GraphDatabase(SQLBase):
             session.rollback()
             raise
         finally:
+            if get_or_create_cache:
+                cache = session.info.pop(GET_OR_CREATE_CACHE_KEY)
+                stats = self._get_or_create_cache_stats.setdefault(get_or_create_cache, {"hits": 0, "misses": 0})
+                stats["hits"] += cache.hits
+                stats["misses"] += cache.misses
+                _LOGGER.debug(
+                    "Cache statistics for get_or_create in %r: %d hits, %d misses",
+                    get_or_create_cache,
+                    cache.hits,
+                    cache.misses,
+                )
+
             session.close()
 
+    @staticmethod
+    def _encode_continuation_token(last_id: int) -> str:
+        """Encode a continuation token for keyset pagination, the token is opaque for callers."""
+        return base64.urlsafe_b64encode(json.dumps({"id": last_id}).encode()).decode()
+
+    @staticmethod
+    def _decode_continuation_token(continuation_token: str) -> int:
+        """Decode a continuation token for keyset pagination."""
+        try:
+            return int(json.loads(base64.urlsafe_b64decode(continuation_token.encode()))["id"])
+        except (binascii.Error, ValueError, TypeError, KeyError) as exc:
+            raise ValueError(f"Invalid continuation token {continuation_token!r}") from exc
+
+    def _query_keyset_page(
+        self, query: Query, key_column: Any, continuation_token: Optional[str], count: int
+    ) -> Tuple[List[tuple], Optional[str]]:
+        """Retrieve a page of query results ordered by the given unique key column, seek past the continuation token.
+
+        Unlike pagination using offset, earlier results are not scanned again to retrieve a page. Returns results
+        and continuation token to retrieve the next page, None is returned if there are no more results.
+        """
+        if continuation_token is not None:
+            query = query.filter(key_column > self._decode_continuation_token(continuation_token))
+
+        result = query.add_columns(key_column).order_by(key_column).limit(count).all()
+        next_token = self._encode_continuation_token(result[-1][-1]) if result and len(result) == count else None
+        return [tuple(item[:-1]) for item in result], next_token
+
     def connect(self):
         """Connect to the database."""
         if self.is_connected():
@@ -251,6 +346,8 @@ class GraphDatabase(SQLBase):
 
     def drop_all(self):
         """Drop all content stored in the database."""
+        # Materialized views depend on tables dropped.
+        self.drop_count_views()
         super().drop_all()
         # Drop alembic version to be able re-run alembic migrations next time.
         self._engine.execute("DROP TABLE alembic_version;")
@@ -701,6 +798,7 @@ class GraphDatabase(SQLBase):
         os_version: str = None,
         python_version: str = None,
         distinct: bool = False,
+        use_cached: bool = False,
     ) -> Dict[Tuple[str, str, str], int]:
         """Retrieve number of Python Package (package_name, package_version, index_url) solved in Thoth Database.
 
@@ -722,6 +820,7 @@ class GraphDatabase(SQLBase):
         os_version: str = None,
         python_version: str = None,
         distinct: bool = False,
+        use_cached: bool = False,
     ) -> Dict[str, Dict[Tuple[str, str], int]]:
         """Retrieve number of solved Python package versions per index url in Thoth Database.
 
@@ -743,6 +842,7 @@ class GraphDatabase(SQLBase):
         os_version: str = None,
         python_version: str = None,
         distinct: bool = False,
+        use_cached: bool = False,
     ) -> Dict[str, Dict[str, int]]:
         """Retrieve number of solved Python package versions per package version in Thoth Database.
 
@@ -807,6 +907,35 @@ class GraphDatabase(SQLBase):
 
             return query.all()
 
+    def get_solved_python_package_versions_all_keyset(
+        self,
+        package_name: str = None,
+        package_version: str = None,
+        index_url: str = None,
+        *,
+        continuation_token: Optional[str] = None,
+        count: int = DEFAULT_COUNT,
+        os_name: str = None,
+        os_version: str = None,
+        python_version: str = None,
+    ) -> Tuple[List[Tuple[str, str, str]], Optional[str]]:
+        """Retrieve solved Python package versions in Thoth Database, paginated using continuation tokens.
+
+        See get_python_packages_all_keyset for details on pagination.
+        """
+        with self._session_scope() as session:
+            query = self._construct_solved_python_package_versions_query(
+                session,
+                package_name=package_name,
+                package_version=package_version,
+                index_url=index_url,
+                os_name=os_name,
+                os_version=os_version,
+                python_version=python_version
+            )
+
+            return self._query_keyset_page(query, PythonPackageVersion.id, continuation_token, count)
+
     def get_solved_python_package_versions_count_all(
         self,
         package_name: str = None,
@@ -817,8 +946,21 @@ class GraphDatabase(SQLBase):
         os_version: str = None,
         python_version: str = None,
         distinct: bool = False,
+        use_cached: bool = False,
     ) -> int:
         """Retrieve solved Python package versions number in Thoth Database."""
+        if use_cached:
+            return self.get_python_package_versions_count_all(
+                package_name=package_name,
+                package_version=package_version,
+                index_url=index_url,
+                os_name=os_name,
+                os_version=os_version,
+                python_version=python_version,
+                distinct=distinct,
+                use_cached=True,
+            )
+
         with self._session_scope() as session:
             query = self._construct_solved_python_package_versions_query(
                 session,
@@ -948,44 +1090,30 @@ class GraphDatabase(SQLBase):
 
             return query.count()
 
-    def _construct_solved_query(
-        self,
-        session: Session,
-        package_name: str = None,
-        package_version: str = None,
-        index_url: str = None,
+    @staticmethod
+    def _construct_unsolved_filter(
         *,
         os_name: str = None,
         os_version: str = None,
         python_version: str = None
-    ) -> Query:
-        """Construct solved query to retrive unsolved packages, the query is not executed."""
-        query = (
-            session.query(PythonPackageVersion)
-            .join(PythonPackageIndex)
-        )
-
-        if index_url is not None:
-            query = query.filter(PythonPackageIndex.url == index_url)
-
-        if package_name is not None:
-            package_name = self.normalize_python_package_name(package_name)
-            query = query.filter(PythonPackageVersion.package_name == package_name)
+    ) -> Any:
+        """Construct filter matching Python package version entities not solved in the given environment.
 
-        if package_version is not None:
-            package_version = self.normalize_python_package_version(package_version)
-            query = query.filter(PythonPackageVersion.package_version == package_version)
+        The filter is an anti-join correlated with the Python package version entity of the enclosing query so that
+        PostgreSQL can stop at the first solved record found using index on entity of solved packages.
+        """
+        solved = exists().where(PythonPackageVersion.entity_id == PythonPackageVersionEntity.id)
 
         if os_name is not None:
-            query = query.filter(PythonPackageVersion.os_name == os_name)
+            solved = solved.where(PythonPackageVersion.os_name == os_name)
 
         if os_version is not None:
-            query = query.filter(PythonPackageVersion.os_version == os_version)
+            solved = solved.where(PythonPackageVersion.os_version == os_version)
 
         if python_version is not None:
-            query = query.filter(PythonPackageVersion.python_version == python_version)
+            solved = solved.where(PythonPackageVersion.python_version == python_version)
 
-        return query
+        return ~solved
 
     def get_unsolved_python_packages_all(
         self,
@@ -1006,21 +1134,13 @@ class GraphDatabase(SQLBase):
         [('regex', 'https://pypi.org/simple'), ('tensorflow', 'https://pypi.org/simple')]
         """
         with self._session_scope() as session:
-            solved = self._construct_solved_query(
-                session,
-                os_name=os_name,
-                os_version=os_version,
-                python_version=python_version
-            )
-
-            subquery = solved.with_entities(PythonPackageVersion.entity_id).subquery()
             query = (
                 session.query(PythonPackageVersionEntity)
                 .filter(
-                    tuple_(
-                        PythonPackageVersionEntity.id)
-                    .notin_(
-                        subquery
+                    self._construct_unsolved_filter(
+                        os_name=os_name,
+                        os_version=os_version,
+                        python_version=python_version
                     )
                 ).join(PythonPackageIndex)
                 .with_entities(PythonPackageVersionEntity.package_name, PythonPackageIndex.url)
@@ -1042,22 +1162,13 @@ class GraphDatabase(SQLBase):
         python_version: str = None,
     ) -> Query:
         """Construct query for unsolved Python packages functions, the query is not executed."""
-        solved = self._construct_solved_query(
-            session,
-            os_name=os_name,
-            os_version=os_version,
-            python_version=python_version
-        )
-
-        subquery = solved.with_entities(PythonPackageVersion.entity_id).subquery()
-
         query = (
             session.query(PythonPackageVersionEntity.id)
             .filter(
-                tuple_(
-                    PythonPackageVersionEntity.id)
-                .notin_(
-                    subquery
+                self._construct_unsolved_filter(
+                    os_name=os_name,
+                    os_version=os_version,
+                    python_version=python_version
                 )
             ).join(PythonPackageIndex)
             .with_entities(
@@ -1144,6 +1255,7 @@ class GraphDatabase(SQLBase):
         start_offset: int = 0,
         count: int = DEFAULT_COUNT,
         distinct: bool = False,
+        use_cached: bool = False,
     ) -> Dict[Tuple[str, Optional[str], Optional[str]], int]:
         """Retrieve number of unsolved versions per Python package in Thoth Database.
 
@@ -1154,39 +1266,41 @@ class GraphDatabase(SQLBase):
         {('absl-py', '0.1.10', 'https://pypi.org/simple'): 1, ('absl-py', '0.2.1', 'https://pypi.org/simple'): 1}
         """
         with self._session_scope() as session:
-            solved = self._construct_solved_query(
-                session,
-                os_name=os_name,
-                os_version=os_version,
-                python_version=python_version
-            )
-
-            subquery = solved.with_entities(PythonPackageVersion.entity_id).subquery()
-
-            query = (
-                session.query(PythonPackageVersionEntity.id)
-                .filter(
-                    tuple_(
-                        PythonPackageVersionEntity.id)
-                    .notin_(
-                        subquery
-                    )
-                ).join(PythonPackageIndex)
-                .with_entities(
-                    PythonPackageVersionEntity.package_name,
-                    PythonPackageVersionEntity.package_version,
-                    PythonPackageIndex.url,
-                    func.count(
-                        tuple_(
-                            PythonPackageVersionEntity.package_name,
-                            PythonPackageVersionEntity.package_version,
-                            PythonPackageIndex.url)
-                            ))
-                .group_by(
-                    PythonPackageVersionEntity.package_name,
-                    PythonPackageVersionEntity.package_version,
-                    PythonPackageIndex.url)
+            if use_cached:
+                self._check_unsolved_count_view_environment(os_name, os_version, python_version)
+                query = self._construct_count_view_query(
+                    session,
+                    "unsolved_python_package_version_count",
+                    ("package_name", "package_version", "index_url"),
+                    os_name=os_name,
+                    os_version=os_version,
+                    python_version=python_version,
                 )
+            else:
+                query = (
+                    session.query(PythonPackageVersionEntity.id)
+                    .filter(
+                        self._construct_unsolved_filter(
+                            os_name=os_name,
+                            os_version=os_version,
+                            python_version=python_version
+                        )
+                    ).join(PythonPackageIndex)
+                    .with_entities(
+                        PythonPackageVersionEntity.package_name,
+                        PythonPackageVersionEntity.package_version,
+                        PythonPackageIndex.url,
+                        func.count(
+                            tuple_(
+                                PythonPackageVersionEntity.package_name,
+                                PythonPackageVersionEntity.package_version,
+                                PythonPackageIndex.url)
+                                ))
+                    .group_by(
+                        PythonPackageVersionEntity.package_name,
+                        PythonPackageVersionEntity.package_version,
+                        PythonPackageIndex.url)
+                    )
 
             query = query.offset(start_offset).limit(count)
 
@@ -1214,6 +1328,7 @@ class GraphDatabase(SQLBase):
         start_offset: int = 0,
         count: int = DEFAULT_COUNT,
         distinct: bool = False,
+        use_cached: bool = False,
     ) -> Dict[str, Dict[Tuple[str, Optional[str]], int]]:
         """Retrieve number of unsolved Python package versions per index url in Thoth Database.
 
@@ -1224,42 +1339,44 @@ class GraphDatabase(SQLBase):
         {'https://pypi.org/simple': {('absl-py', '0.1.10'): 1, ('absl-py', '0.2.1'): 1}}
         """
         with self._session_scope() as session:
-            solved = self._construct_solved_query(
-                session,
-                index_url=index_url,
-                os_name=os_name,
-                os_version=os_version,
-                python_version=python_version
-            )
-
-            subquery = solved.with_entities(PythonPackageVersion.entity_id).subquery()
-
-            query = (
-                session.query(PythonPackageVersionEntity.id)
-                .filter(
-                    tuple_(
-                        PythonPackageVersionEntity.id)
-                    .notin_(
-                        subquery
-                    )
-                )
-                .join(PythonPackageIndex)
-                .filter(PythonPackageIndex.url == index_url)
-                .with_entities(
-                    PythonPackageVersionEntity.package_name,
-                    PythonPackageVersionEntity.package_version,
-                    PythonPackageIndex.url,
-                    func.count(
-                        tuple_(
-                            PythonPackageVersionEntity.package_name,
-                            PythonPackageVersionEntity.package_version,
-                            PythonPackageIndex.url)
-                            ))
-                .group_by(
-                    PythonPackageVersionEntity.package_name,
-                    PythonPackageVersionEntity.package_version,
-                    PythonPackageIndex.url)
+            if use_cached:
+                self._check_unsolved_count_view_environment(os_name, os_version, python_version)
+                query = self._construct_count_view_query(
+                    session,
+                    "unsolved_python_package_version_count",
+                    ("package_name", "package_version", "index_url"),
+                    index_url=index_url,
+                    os_name=os_name,
+                    os_version=os_version,
+                    python_version=python_version,
                 )
+            else:
+                query = (
+                    session.query(PythonPackageVersionEntity.id)
+                    .filter(
+                        self._construct_unsolved_filter(
+                            os_name=os_name,
+                            os_version=os_version,
+                            python_version=python_version
+                        )
+                    )
+                    .join(PythonPackageIndex)
+                    .filter(PythonPackageIndex.url == index_url)
+                    .with_entities(
+                        PythonPackageVersionEntity.package_name,
+                        PythonPackageVersionEntity.package_version,
+                        PythonPackageIndex.url,
+                        func.count(
+                            tuple_(
+                                PythonPackageVersionEntity.package_name,
+                                PythonPackageVersionEntity.package_version,
+                                PythonPackageIndex.url)
+                                ))
+                    .group_by(
+                        PythonPackageVersionEntity.package_name,
+                        PythonPackageVersionEntity.package_version,
+                        PythonPackageIndex.url)
+                    )
 
             query = query.offset(start_offset).limit(count)
 
@@ -1290,6 +1407,7 @@ class GraphDatabase(SQLBase):
         os_version: str = None,
         python_version: str = None,
         distinct: bool = False,
+        use_cached: bool = False,
     ) -> Dict[Optional[str], Dict[Optional[str], int]]:
         """Retrieve number of unsolved Python package versions per package version in Thoth Database.
 
@@ -1300,45 +1418,47 @@ class GraphDatabase(SQLBase):
         {'1.14.0rc0': {'https://pypi.org/simple': 1}, '1.13.0rc2': {'https://pypi.org/simple': 1}}
         """
         with self._session_scope() as session:
-            solved = self._construct_solved_query(
-                session,
-                package_name=package_name,
-                os_name=os_name,
-                os_version=os_version,
-                python_version=python_version
-            )
-
-            subquery = solved.with_entities(PythonPackageVersion.entity_id).subquery()
-
             if package_name is not None:
                 package_name = self.normalize_python_package_name(package_name)
 
-            query = (
-                session.query(PythonPackageVersionEntity.id)
-                .filter(
-                    tuple_(
-                        PythonPackageVersionEntity.id)
-                    .notin_(
-                        subquery
-                    )
-                )
-                .join(PythonPackageIndex)
-                .filter(PythonPackageVersionEntity.package_name == package_name)
-                .with_entities(
-                    PythonPackageVersionEntity.package_name,
-                    PythonPackageVersionEntity.package_version,
-                    PythonPackageIndex.url,
-                    func.count(
-                        tuple_(
-                            PythonPackageVersionEntity.package_name,
-                            PythonPackageVersionEntity.package_version,
-                            PythonPackageIndex.url)
-                            ))
-                .group_by(
-                    PythonPackageVersionEntity.package_name,
-                    PythonPackageVersionEntity.package_version,
-                    PythonPackageIndex.url)
+            if use_cached:
+                self._check_unsolved_count_view_environment(os_name, os_version, python_version)
+                query = self._construct_count_view_query(
+                    session,
+                    "unsolved_python_package_version_count",
+                    ("package_name", "package_version", "index_url"),
+                    package_name=package_name,
+                    os_name=os_name,
+                    os_version=os_version,
+                    python_version=python_version,
                 )
+            else:
+                query = (
+                    session.query(PythonPackageVersionEntity.id)
+                    .filter(
+                        self._construct_unsolved_filter(
+                            os_name=os_name,
+                            os_version=os_version,
+                            python_version=python_version
+                        )
+                    )
+                    .join(PythonPackageIndex)
+                    .filter(PythonPackageVersionEntity.package_name == package_name)
+                    .with_entities(
+                        PythonPackageVersionEntity.package_name,
+                        PythonPackageVersionEntity.package_version,
+                        PythonPackageIndex.url,
+                        func.count(
+                            tuple_(
+                                PythonPackageVersionEntity.package_name,
+                                PythonPackageVersionEntity.package_version,
+                                PythonPackageIndex.url)
+                                ))
+                    .group_by(
+                        PythonPackageVersionEntity.package_name,
+                        PythonPackageVersionEntity.package_version,
+                        PythonPackageIndex.url)
+                    )
 
             query = query.offset(start_offset).limit(count)
 
@@ -1372,27 +1492,33 @@ class GraphDatabase(SQLBase):
         python_version: str = None
     ) -> Query:
         """Construct query for unsolved Python packages versions functions, the query is not executed."""
-        solved = self._construct_solved_query(
-            session,
-            package_name=package_name,
-            package_version=package_version,
-            index_url=index_url,
-            os_name=os_name,
-            os_version=os_version,
-            python_version=python_version
-        )
-
-        subquery = solved.with_entities(PythonPackageVersion.entity_id).subquery()
-
         query = (
-            session.query(PythonPackageVersionEntity.id)
+            session.query(PythonPackageVersionEntity)
             .filter(
-                tuple_(
-                    PythonPackageVersionEntity.id)
-                .notin_(
-                    subquery
+                self._construct_unsolved_filter(
+                    os_name=os_name,
+                    os_version=os_version,
+                    python_version=python_version
                 )
-            ))
+            )
+            .join(PythonPackageIndex)
+            .with_entities(
+                PythonPackageVersionEntity.package_name,
+                PythonPackageVersionEntity.package_version,
+                PythonPackageIndex.url
+            )
+        )
+
+        if index_url is not None:
+            query = query.filter(PythonPackageIndex.url == index_url)
+
+        if package_name is not None:
+            package_name = self.normalize_python_package_name(package_name)
+            query = query.filter(PythonPackageVersionEntity.package_name == package_name)
+
+        if package_version is not None:
+            package_version = self.normalize_python_package_version(package_version)
+            query = query.filter(PythonPackageVersionEntity.package_version == package_version)
 
         return query
 
@@ -1429,23 +1555,6 @@ class GraphDatabase(SQLBase):
                 python_version=python_version
             )
 
-            query = query.join(PythonPackageIndex).with_entities(
-                PythonPackageVersionEntity.package_name,
-                PythonPackageVersionEntity.package_version,
-                PythonPackageIndex.url
-            )
-
-            if index_url is not None:
-                query = query.filter(PythonPackageIndex.url == index_url)
-
-            if package_name is not None:
-                package_name = self.normalize_python_package_name(package_name)
-                query = query.filter(PythonPackageVersionEntity.package_name == package_name)
-
-            if package_version is not None:
-                package_version = self.normalize_python_package_version(package_version)
-                query = query.filter(PythonPackageVersionEntity.package_version == package_version)
-
             if randomize:
                 query = query.order_by(func.random())
 
@@ -1456,18 +1565,22 @@ class GraphDatabase(SQLBase):
 
             return query.all()
 
-    def get_unsolved_python_package_versions_count_all(
+    def get_unsolved_python_package_versions_all_keyset(
         self,
         package_name: str = None,
         package_version: str = None,
         index_url: str = None,
         *,
+        continuation_token: Optional[str] = None,
+        count: int = DEFAULT_COUNT,
         os_name: str = None,
         os_version: str = None,
         python_version: str = None,
-        distinct: bool = False,
-    ) -> int:
-        """Retrieve unsolved Python package versions number in Thoth Database."""
+    ) -> Tuple[List[Tuple[str, Optional[str], Optional[str]]], Optional[str]]:
+        """Retrieve unsolved Python package versions in Thoth Database, paginated using continuation tokens.
+
+        See get_python_packages_all_keyset for details on pagination.
+        """
         with self._session_scope() as session:
             query = self._construct_unsolved_python_package_versions_query(
                 session,
@@ -1479,28 +1592,240 @@ class GraphDatabase(SQLBase):
                 python_version=python_version
             )
 
-            query = query.join(PythonPackageIndex).with_entities(
-                    PythonPackageVersionEntity.package_name,
-                    PythonPackageVersionEntity.package_version,
-                    PythonPackageIndex.url
-            )
+            return self._query_keyset_page(query, PythonPackageVersionEntity.id, continuation_token, count)
 
-            if index_url is not None:
-                query = query.filter(PythonPackageIndex.url == index_url)
+    def get_unsolved_python_package_versions_count_all(
+        self,
+        package_name: str = None,
+        package_version: str = None,
+        index_url: str = None,
+        *,
+        os_name: str = None,
+        os_version: str = None,
+        python_version: str = None,
+        distinct: bool = False,
+        use_cached: bool = False,
+    ) -> int:
+        """Retrieve unsolved Python package versions number in Thoth Database."""
+        if use_cached:
+            self._check_unsolved_count_view_environment(os_name, os_version, python_version)
 
             if package_name is not None:
                 package_name = self.normalize_python_package_name(package_name)
-                query = query.filter(PythonPackageVersionEntity.package_name == package_name)
 
             if package_version is not None:
                 package_version = self.normalize_python_package_version(package_version)
-                query = query.filter(PythonPackageVersionEntity.package_version == package_version)
+
+            return self._get_count_view_count_all(
+                "unsolved_python_package_version_count",
+                distinct=distinct,
+                package_name=package_name,
+                package_version=package_version,
+                index_url=index_url,
+                os_name=os_name,
+                os_version=os_version,
+                python_version=python_version,
+            )
+
+        with self._session_scope() as session:
+            query = self._construct_unsolved_python_package_versions_query(
+                session,
+                package_name=package_name,
+                package_version=package_version,
+                index_url=index_url,
+                os_name=os_name,
+                os_version=os_version,
+                python_version=python_version
+            )
 
             if distinct:
                 query = query.distinct()
 
             return query.count()
 
+    def _enqueue_pending_solve(self, session: Session, entity_ids: Optional[List[int]] = None) -> int:
+        """Enqueue the given Python package version entities to be solved in environments they were not solved in.
+
+        Environments are the ones of registered Python ecosystem solvers, all entities are considered if
+        no entity ids are given. Returns number of newly enqueued records.
+        """
+        query = (
+            session.query(PythonPackageVersionEntity)
+            .join(PythonPackageIndex)
+            .filter(EcosystemSolver.ecosystem == "python")
+            .filter(
+                ~exists().where(
+                    and_(
+                        PythonPackageVersion.entity_id == PythonPackageVersionEntity.id,
+                        PythonPackageVersion.os_name == EcosystemSolver.os_name,
+                        PythonPackageVersion.os_version == EcosystemSolver.os_version,
+                        PythonPackageVersion.python_version == EcosystemSolver.python_version,
+                    )
+                )
+            )
+            .with_entities(
+                PythonPackageVersionEntity.id,
+                EcosystemSolver.os_name,
+                EcosystemSolver.os_version,
+                EcosystemSolver.python_version,
+            )
+            .distinct()
+        )
+
+        if entity_ids is not None:
+            if not entity_ids:
+                return 0
+
+            query = query.filter(PythonPackageVersionEntity.id.in_(entity_ids))
+
+        statement = (
+            insert(PendingSolve)
+            .from_select(["entity_id", "os_name", "os_version", "python_version"], query.statement)
+            .on_conflict_do_nothing()
+        )
+        return session.execute(statement).rowcount
+
+    @staticmethod
+    def _delete_pending_solve(
+        session: Session, entity_ids: List[int], *, os_name: str, os_version: str, python_version: str
+    ) -> None:
+        """Remove the given Python package version entities solved in the given environment from the queue."""
+        if not entity_ids:
+            return
+
+        session.query(PendingSolve).filter(
+            PendingSolve.entity_id.in_(entity_ids),
+            PendingSolve.os_name == os_name,
+            PendingSolve.os_version == os_version,
+            PendingSolve.python_version == python_version,
+        ).delete(synchronize_session=False)
+
+    def _get_or_create_python_package_version_entity(
+        self,
+        session: Session,
+        *,
+        package_name: str,
+        package_version: Optional[str],
+        python_package_index_id: Optional[int],
+    ) -> Tuple[PythonPackageVersionEntity, bool]:
+        """Get or create a Python package version entity, newly created entities are enqueued to be solved."""
+        entity, existed = PythonPackageVersionEntity.get_or_create(
+            session,
+            package_name=package_name,
+            package_version=package_version,
+            python_package_index_id=python_package_index_id,
+        )
+
+        if not existed:
+            self._enqueue_pending_solve(session, [entity.id])
+
+        return entity, existed
+
+    def populate_pending_solve(self) -> Tuple[int, int]:
+        """Reconcile the queue of pending solves with Python package versions solved.
+
+        All Python package version entities not solved in environments of registered solvers are enqueued,
+        records of entities already solved in their environment (e.g. by syncs not maintaining the queue)
+        and records of environments no solver is registered for are removed. The queue is maintained on syncs,
+        reconciling is needed when a solver is introduced or removed, or on deployments with data created before
+        the queue was introduced. Returns number of enqueued and number of removed records.
+        """
+        with self._session_scope() as session, session.begin(subtransactions=True):
+            enqueued = self._enqueue_pending_solve(session)
+
+            solved = exists().where(
+                and_(
+                    PythonPackageVersion.entity_id == PendingSolve.entity_id,
+                    PythonPackageVersion.os_name == PendingSolve.os_name,
+                    PythonPackageVersion.os_version == PendingSolve.os_version,
+                    PythonPackageVersion.python_version == PendingSolve.python_version,
+                )
+            )
+            registered = exists().where(
+                and_(
+                    EcosystemSolver.ecosystem == "python",
+                    EcosystemSolver.os_name == PendingSolve.os_name,
+                    EcosystemSolver.os_version == PendingSolve.os_version,
+                    EcosystemSolver.python_version == PendingSolve.python_version,
+                )
+            )
+            removed = (
+                session.query(PendingSolve)
+                .filter(or_(solved, ~registered))
+                .delete(synchronize_session=False)
+            )
+
+            return enqueued, removed
+
+    def dequeue_pending_solve(
+        self,
+        *,
+        os_name: str,
+        os_version: str,
+        python_version: str,
+        count: int = DEFAULT_COUNT,
+        lease: int = 3600,
+    ) -> List[Tuple[str, Optional[str], str]]:
+        """Retrieve a batch of Python package versions waiting to be solved in the given environment.
+
+        Records are locked while retrieved, concurrent callers skip locked records and thus obtain disjoint batches.
+        Retrieved records stay in the queue until the solver result is synced, they are not handed out again
+        until the lease (in seconds) expires so packages are retrieved again if solvers do not finish.
+
+        Examples:
+        >>> from thoth.storages import GraphDatabase
+        >>> graph = GraphDatabase()
+        >>> graph.dequeue_pending_solve(os_name="fedora", os_version="31", python_version="3.7")
+        [('regex', '2018.11.7', 'https://pypi.org/simple'), ('tensorflow', '1.11.0', 'https://pypi.org/simple')]
+        """
+        now = datetime.utcnow()
+
+        with self._session_scope() as session:
+            result = (
+                session.query(PendingSolve)
+                .filter(PendingSolve.os_name == os_name)
+                .filter(PendingSolve.os_version == os_version)
+                .filter(PendingSolve.python_version == python_version)
+                .filter(or_(PendingSolve.dequeued.is_(None), PendingSolve.dequeued < now - timedelta(seconds=lease)))
+                .join(PythonPackageVersionEntity)
+                .join(PythonPackageIndex)
+                .with_entities(
+                    PendingSolve.id,
+                    PythonPackageVersionEntity.package_name,
+                    PythonPackageVersionEntity.package_version,
+                    PythonPackageIndex.url,
+                )
+                .order_by(PendingSolve.id)
+                .limit(count)
+                .with_for_update(skip_locked=True, of=PendingSolve)
+                .all()
+            )
+
+            if result:
+                session.query(PendingSolve).filter(PendingSolve.id.in_([item[0] for item in result])).update(
+                    {PendingSolve.dequeued: now}, synchronize_session=False
+                )
+
+            return [tuple(item[1:]) for item in result]
+
+    def get_pending_solve_count_all(
+        self, *, os_name: str = None, os_version: str = None, python_version: str = None
+    ) -> int:
+        """Retrieve number of Python package versions waiting to be solved."""
+        with self._session_scope() as session:
+            query = session.query(PendingSolve)
+
+            if os_name is not None:
+                query = query.filter(PendingSolve.os_name == os_name)
+
+            if os_version is not None:
+                query = query.filter(PendingSolve.os_version == os_version)
+
+            if python_version is not None:
+                query = query.filter(PendingSolve.python_version == python_version)
+
+            return query.count()
+
     def get_analyzed_python_packages_all(
         self,
         *,
@@ -1669,6 +1994,29 @@ class GraphDatabase(SQLBase):
 
             return query.all()
 
+    def get_analyzed_python_package_versions_all_keyset(
+        self,
+        package_name: str = None,
+        package_version: str = None,
+        index_url: str = None,
+        *,
+        continuation_token: Optional[str] = None,
+        count: int = DEFAULT_COUNT,
+    ) -> Tuple[List[Tuple[str, str, str]], Optional[str]]:
+        """Retrieve analyzed Python package versions in Thoth Database, paginated using continuation tokens.
+
+        See get_python_packages_all_keyset for details on pagination.
+        """
+        with self._session_scope() as session:
+            query = self._construct_analyzed_python_package_versions_query(
+                session,
+                package_name=package_name,
+                package_version=package_version,
+                index_url=index_url,
+            )
+
+            return self._query_keyset_page(query, PackageAnalyzerRun.id, continuation_token, count)
+
     def get_analyzed_python_package_versions_count_all(
         self,
         package_name: str = None,
@@ -1676,8 +2024,24 @@ class GraphDatabase(SQLBase):
         index_url: str = None,
         *,
         distinct: bool = False,
+        use_cached: bool = False,
     ) -> int:
         """Retrieve analyzed Python package versions number in Thoth Database."""
+        if use_cached:
+            if package_name is not None:
+                package_name = self.normalize_python_package_name(package_name)
+
+            if package_version is not None:
+                package_version = self.normalize_python_package_version(package_version)
+
+            return self._get_count_view_count_all(
+                "analyzed_python_package_version_count",
+                distinct=distinct,
+                package_name=package_name,
+                package_version=package_version,
+                index_url=index_url,
+            )
+
         with self._session_scope() as session:
             query = self._construct_analyzed_python_package_versions_query(
                 session,
@@ -1697,6 +2061,7 @@ class GraphDatabase(SQLBase):
         start_offset: int = 0,
         count: int = DEFAULT_COUNT,
         distinct: bool = False,
+        use_cached: bool = False,
     ) -> Dict[Tuple[str, str, str], int]:
         """Retrieve number of versions per analyzed Python package in Thoth Database.
 
@@ -1707,25 +2072,32 @@ class GraphDatabase(SQLBase):
         {('absl-py', '0.1.10', 'https://pypi.org/simple'): 1, ('absl-py', '0.2.1', 'https://pypi.org/simple'): 1}
         """
         with self._session_scope() as session:
-            query = (
-                session.query(PackageAnalyzerRun)
-                .join(PythonPackageVersionEntity)
-                .join(PythonPackageIndex)
-                .with_entities(
-                    PythonPackageVersionEntity.package_name,
-                    PythonPackageVersionEntity.package_version,
-                    PythonPackageIndex.url,
-                    func.count(
-                        tuple_(
-                            PythonPackageVersionEntity.package_name,
-                            PythonPackageVersionEntity.package_version,
-                            PythonPackageIndex.url)
-                            ))
-                .group_by(
-                    PythonPackageVersionEntity.package_name,
-                    PythonPackageVersionEntity.package_version,
-                    PythonPackageIndex.url)
+            if use_cached:
+                query = self._construct_count_view_query(
+                    session,
+                    "analyzed_python_package_version_count",
+                    ("package_name", "package_version", "index_url"),
                 )
+            else:
+                query = (
+                    session.query(PackageAnalyzerRun)
+                    .join(PythonPackageVersionEntity)
+                    .join(PythonPackageIndex)
+                    .with_entities(
+                        PythonPackageVersionEntity.package_name,
+                        PythonPackageVersionEntity.package_version,
+                        PythonPackageIndex.url,
+                        func.count(
+                            tuple_(
+                                PythonPackageVersionEntity.package_name,
+                                PythonPackageVersionEntity.package_version,
+                                PythonPackageIndex.url)
+                                ))
+                    .group_by(
+                        PythonPackageVersionEntity.package_name,
+                        PythonPackageVersionEntity.package_version,
+                        PythonPackageIndex.url)
+                    )
 
             query = query.offset(start_offset).limit(count)
 
@@ -1750,6 +2122,7 @@ class GraphDatabase(SQLBase):
         start_offset: int = 0,
         count: int = DEFAULT_COUNT,
         distinct: bool = False,
+        use_cached: bool = False,
     ) -> Dict[str, Dict[Tuple[str, str], int]]:
         """Retrieve number of analyzed Python package versions per index url in Thoth Database.
 
@@ -1760,26 +2133,34 @@ class GraphDatabase(SQLBase):
         {'https://pypi.org/simple': {('absl-py', '0.1.10'): 1, ('absl-py', '0.2.1'): 1}}
         """
         with self._session_scope() as session:
-            query = (
-                session.query(PackageAnalyzerRun)
-                .join(PythonPackageVersionEntity)
-                .join(PythonPackageIndex)
-                .filter(PythonPackageIndex.url == index_url)
-                .with_entities(
-                    PythonPackageVersionEntity.package_name,
-                    PythonPackageVersionEntity.package_version,
-                    PythonPackageIndex.url,
-                    func.count(
-                        tuple_(
-                            PythonPackageVersionEntity.package_name,
-                            PythonPackageVersionEntity.package_version,
-                            PythonPackageIndex.url)
-                            ))
-                .group_by(
-                    PythonPackageVersionEntity.package_name,
-                    PythonPackageVersionEntity.package_version,
-                    PythonPackageIndex.url)
+            if use_cached:
+                query = self._construct_count_view_query(
+                    session,
+                    "analyzed_python_package_version_count",
+                    ("package_name", "package_version", "index_url"),
+                    index_url=index_url,
                 )
+            else:
+                query = (
+                    session.query(PackageAnalyzerRun)
+                    .join(PythonPackageVersionEntity)
+                    .join(PythonPackageIndex)
+                    .filter(PythonPackageIndex.url == index_url)
+                    .with_entities(
+                        PythonPackageVersionEntity.package_name,
+                        PythonPackageVersionEntity.package_version,
+                        PythonPackageIndex.url,
+                        func.count(
+                            tuple_(
+                                PythonPackageVersionEntity.package_name,
+                                PythonPackageVersionEntity.package_version,
+                                PythonPackageIndex.url)
+                                ))
+                    .group_by(
+                        PythonPackageVersionEntity.package_name,
+                        PythonPackageVersionEntity.package_version,
+                        PythonPackageIndex.url)
+                    )
 
             query = query.offset(start_offset).limit(count)
 
@@ -1804,6 +2185,7 @@ class GraphDatabase(SQLBase):
         start_offset: int = 0,
         count: int = DEFAULT_COUNT,
         distinct: bool = False,
+        use_cached: bool = False,
     ) -> Dict[str, Dict[str, int]]:
         """Retrieve number of analyzed Python package versions per index url in Thoth Database.
 
@@ -1816,26 +2198,34 @@ class GraphDatabase(SQLBase):
         package_name = self.normalize_python_package_name(package_name)
 
         with self._session_scope() as session:
-            query = (
-                session.query(PackageAnalyzerRun)
-                .join(PythonPackageVersionEntity)
-                .filter(PythonPackageVersionEntity.package_name == package_name)
-                .join(PythonPackageIndex)
-                .with_entities(
-                    PythonPackageVersionEntity.package_name,
-                    PythonPackageVersionEntity.package_version,
-                    PythonPackageIndex.url,
-                    func.count(
-                        tuple_(
-                            PythonPackageVersionEntity.package_name,
-                            PythonPackageVersionEntity.package_version,
-                            PythonPackageIndex.url)
-                            ))
-                .group_by(
-                    PythonPackageVersionEntity.package_name,
-                    PythonPackageVersionEntity.package_version,
-                    PythonPackageIndex.url)
+            if use_cached:
+                query = self._construct_count_view_query(
+                    session,
+                    "analyzed_python_package_version_count",
+                    ("package_name", "package_version", "index_url"),
+                    package_name=package_name,
                 )
+            else:
+                query = (
+                    session.query(PackageAnalyzerRun)
+                    .join(PythonPackageVersionEntity)
+                    .filter(PythonPackageVersionEntity.package_name == package_name)
+                    .join(PythonPackageIndex)
+                    .with_entities(
+                        PythonPackageVersionEntity.package_name,
+                        PythonPackageVersionEntity.package_version,
+                        PythonPackageIndex.url,
+                        func.count(
+                            tuple_(
+                                PythonPackageVersionEntity.package_name,
+                                PythonPackageVersionEntity.package_version,
+                                PythonPackageIndex.url)
+                                ))
+                    .group_by(
+                        PythonPackageVersionEntity.package_name,
+                        PythonPackageVersionEntity.package_version,
+                        PythonPackageIndex.url)
+                    )
 
             query = query.offset(start_offset).limit(count)
 
@@ -1945,6 +2335,16 @@ class GraphDatabase(SQLBase):
 
             return query.count()
 
+    @staticmethod
+    def _construct_unanalyzed_filter() -> Any:
+        """Construct filter matching Python package version entities which were not analyzed.
+
+        The filter is an anti-join correlated with the Python package version entity of the enclosing query.
+        """
+        return ~exists().where(
+            PackageAnalyzerRun.input_python_package_version_entity_id == PythonPackageVersionEntity.id
+        )
+
     def get_unanalyzed_python_packages_all(
         self,
         *,
@@ -1961,20 +2361,10 @@ class GraphDatabase(SQLBase):
         [('regex', 'https://pypi.org/simple'), ('tensorflow', 'https://pypi.org/simple')]
         """
         with self._session_scope() as session:
-            analyzed = self._construct_analyzed_python_packages_query(session)
-
-            subquery = analyzed.subquery()
-
             query = (
                 session.query(PythonPackageVersionEntity)
                 .join(PythonPackageIndex)
-                .filter(
-                    tuple_(
-                        PythonPackageVersionEntity.package_name,
-                        PythonPackageVersionEntity.package_version,
-                        PythonPackageIndex.url,
-                    ).notin_(subquery)
-                )
+                .filter(self._construct_unanalyzed_filter())
                 .with_entities(
                     PythonPackageVersionEntity.package_name,
                     PythonPackageIndex.url,
@@ -1992,20 +2382,10 @@ class GraphDatabase(SQLBase):
 
     def _construct_unanalyzed_python_packages_query(self, session: Session) -> Query:
         """Construct query for unanalyzed Python packages functions, the query is not executed."""
-        analyzed = self._construct_analyzed_python_packages_query(session)
-
-        subquery = analyzed.subquery()
-
         query = (
             session.query(PythonPackageVersionEntity)
             .join(PythonPackageIndex)
-            .filter(
-                tuple_(
-                    PythonPackageVersionEntity.package_name,
-                    PythonPackageVersionEntity.package_version,
-                    PythonPackageIndex.url,
-                ).notin_(subquery)
-            )
+            .filter(self._construct_unanalyzed_filter())
             .with_entities(
                 PythonPackageVersionEntity.package_name,
                 PythonPackageVersionEntity.package_version,
@@ -2070,25 +2450,10 @@ class GraphDatabase(SQLBase):
         index_url: str = None
     ) -> Query:
         """Construct query for unanalyzed Python packages versions functions, the query is not executed."""
-        analyzed = self._construct_analyzed_python_package_versions_query(
-            session,
-            package_name=package_name,
-            package_version=package_version,
-            index_url=index_url,
-        )
-
-        subquery = analyzed.subquery()
-
         query = (
             session.query(PythonPackageVersionEntity)
             .join(PythonPackageIndex)
-            .filter(
-                tuple_(
-                    PythonPackageVersionEntity.package_name,
-                    PythonPackageVersionEntity.package_version,
-                    PythonPackageIndex.url,
-                ).notin_(subquery)
-            )
+            .filter(self._construct_unanalyzed_filter())
             .with_entities(
                 PythonPackageVersionEntity.package_name,
                 PythonPackageVersionEntity.package_version,
@@ -2146,21 +2511,60 @@ class GraphDatabase(SQLBase):
 
             return query.all()
 
-    def get_unanalyzed_python_package_versions_count_all(
+    def get_unanalyzed_python_package_versions_all_keyset(
         self,
         package_name: str = None,
         package_version: str = None,
         index_url: str = None,
         *,
-        distinct: bool = False,
-    ) -> int:
-        """Retrieve unanalyzed Python package versions number in Thoth Database."""
+        continuation_token: Optional[str] = None,
+        count: int = DEFAULT_COUNT,
+    ) -> Tuple[List[Tuple[str, Optional[str], str]], Optional[str]]:
+        """Retrieve unanalyzed Python package versions in Thoth Database, paginated using continuation tokens.
+
+        See get_python_packages_all_keyset for details on pagination.
+        """
         with self._session_scope() as session:
             query = self._construct_unanalyzed_python_package_versions_query(
                 session,
                 package_name=package_name,
                 package_version=package_version,
-                index_url=index_url
+                index_url=index_url,
+            )
+
+            return self._query_keyset_page(query, PythonPackageVersionEntity.id, continuation_token, count)
+
+    def get_unanalyzed_python_package_versions_count_all(
+        self,
+        package_name: str = None,
+        package_version: str = None,
+        index_url: str = None,
+        *,
+        distinct: bool = False,
+        use_cached: bool = False,
+    ) -> int:
+        """Retrieve unanalyzed Python package versions number in Thoth Database."""
+        if use_cached:
+            if package_name is not None:
+                package_name = self.normalize_python_package_name(package_name)
+
+            if package_version is not None:
+                package_version = self.normalize_python_package_version(package_version)
+
+            return self._get_count_view_count_all(
+                "unanalyzed_python_package_version_count",
+                distinct=distinct,
+                package_name=package_name,
+                package_version=package_version,
+                index_url=index_url,
+            )
+
+        with self._session_scope() as session:
+            query = self._construct_unanalyzed_python_package_versions_query(
+                session,
+                package_name=package_name,
+                package_version=package_version,
+                index_url=index_url
             )
 
             if distinct:
@@ -2174,6 +2578,7 @@ class GraphDatabase(SQLBase):
         start_offset: int = 0,
         count: int = DEFAULT_COUNT,
         distinct: bool = False,
+        use_cached: bool = False,
     ) -> Dict[Tuple[str, str, str], int]:
         """Retrieve number of versions per unanalyzed Python package in Thoth Database.
 
@@ -2184,35 +2589,32 @@ class GraphDatabase(SQLBase):
         {('absl-py', '0.1.10', 'https://pypi.org/simple'): 1, ('absl-py', '0.2.1', 'https://pypi.org/simple'): 1}
         """
         with self._session_scope() as session:
-            analyzed = self._construct_analyzed_python_package_versions_query(session)
-
-            subquery = analyzed.subquery()
-
-            query = (
-                session.query(PythonPackageVersionEntity)
-                .join(PythonPackageIndex)
-                .filter(
-                    tuple_(
+            if use_cached:
+                query = self._construct_count_view_query(
+                    session,
+                    "unanalyzed_python_package_version_count",
+                    ("package_name", "package_version", "index_url"),
+                )
+            else:
+                query = (
+                    session.query(PythonPackageVersionEntity)
+                    .join(PythonPackageIndex)
+                    .filter(self._construct_unanalyzed_filter())
+                    .with_entities(
                         PythonPackageVersionEntity.package_name,
                         PythonPackageVersionEntity.package_version,
                         PythonPackageIndex.url,
-                    ).notin_(subquery)
-                )
-                .with_entities(
-                    PythonPackageVersionEntity.package_name,
-                    PythonPackageVersionEntity.package_version,
-                    PythonPackageIndex.url,
-                    func.count(
-                        tuple_(
-                            PythonPackageVersionEntity.package_name,
-                            PythonPackageVersionEntity.package_version,
-                            PythonPackageIndex.url)
-                            ))
-                .group_by(
-                    PythonPackageVersionEntity.package_name,
-                    PythonPackageVersionEntity.package_version,
-                    PythonPackageIndex.url)
-                )
+                        func.count(
+                            tuple_(
+                                PythonPackageVersionEntity.package_name,
+                                PythonPackageVersionEntity.package_version,
+                                PythonPackageIndex.url)
+                                ))
+                    .group_by(
+                        PythonPackageVersionEntity.package_name,
+                        PythonPackageVersionEntity.package_version,
+                        PythonPackageIndex.url)
+                    )
 
             query = query.offset(start_offset).limit(count)
 
@@ -2237,6 +2639,7 @@ class GraphDatabase(SQLBase):
         start_offset: int = 0,
         count: int = DEFAULT_COUNT,
         distinct: bool = False,
+        use_cached: bool = False,
     ) -> Dict[str, Dict[Tuple[str, str], int]]:
         """Retrieve number of unanalyzed Python package versions per index url in Thoth Database.
 
@@ -2247,39 +2650,34 @@ class GraphDatabase(SQLBase):
         {'https://pypi.org/simple': {('absl-py', '0.1.10'): 1, ('absl-py', '0.2.1'): 1}}
         """
         with self._session_scope() as session:
-            analyzed = self._construct_analyzed_python_package_versions_query(
-                session,
-                index_url=index_url,
-            )
-
-            subquery = analyzed.subquery()
-
-            query = (
-                session.query(PythonPackageVersionEntity)
-                .join(PythonPackageIndex)
-                .filter(PythonPackageIndex.url == index_url)
-                .filter(
-                    tuple_(
+            if use_cached:
+                query = self._construct_count_view_query(
+                    session,
+                    "unanalyzed_python_package_version_count",
+                    ("package_name", "package_version", "index_url"),
+                    index_url=index_url,
+                )
+            else:
+                query = (
+                    session.query(PythonPackageVersionEntity)
+                    .join(PythonPackageIndex)
+                    .filter(PythonPackageIndex.url == index_url)
+                    .filter(self._construct_unanalyzed_filter())
+                    .with_entities(
                         PythonPackageVersionEntity.package_name,
                         PythonPackageVersionEntity.package_version,
                         PythonPackageIndex.url,
-                    ).notin_(subquery)
-                )
-                .with_entities(
-                    PythonPackageVersionEntity.package_name,
-                    PythonPackageVersionEntity.package_version,
-                    PythonPackageIndex.url,
-                    func.count(
-                        tuple_(
-                            PythonPackageVersionEntity.package_name,
-                            PythonPackageVersionEntity.package_version,
-                            PythonPackageIndex.url)
-                            ))
-                .group_by(
-                    PythonPackageVersionEntity.package_name,
-                    PythonPackageVersionEntity.package_version,
-                    PythonPackageIndex.url)
-                )
+                        func.count(
+                            tuple_(
+                                PythonPackageVersionEntity.package_name,
+                                PythonPackageVersionEntity.package_version,
+                                PythonPackageIndex.url)
+                                ))
+                    .group_by(
+                        PythonPackageVersionEntity.package_name,
+                        PythonPackageVersionEntity.package_version,
+                        PythonPackageIndex.url)
+                    )
 
             query = query.offset(start_offset).limit(count)
 
@@ -2304,6 +2702,7 @@ class GraphDatabase(SQLBase):
         start_offset: int = 0,
         count: int = DEFAULT_COUNT,
         distinct: bool = False,
+        use_cached: bool = False,
     ) -> Dict[str, Dict[str, int]]:
         """Retrieve number of unanalyzed Python package versions per index url in Thoth Database.
 
@@ -2316,39 +2715,34 @@ class GraphDatabase(SQLBase):
         package_name = self.normalize_python_package_name(package_name)
 
         with self._session_scope() as session:
-            analyzed = self._construct_analyzed_python_package_versions_query(
-                session,
-                package_name=package_name
-            )
-
-            subquery = analyzed.subquery()
-
-            query = (
-                session.query(PythonPackageVersionEntity)
-                .join(PythonPackageIndex)
-                .filter(PythonPackageVersionEntity.package_name == package_name)
-                .filter(
-                    tuple_(
+            if use_cached:
+                query = self._construct_count_view_query(
+                    session,
+                    "unanalyzed_python_package_version_count",
+                    ("package_name", "package_version", "index_url"),
+                    package_name=package_name,
+                )
+            else:
+                query = (
+                    session.query(PythonPackageVersionEntity)
+                    .join(PythonPackageIndex)
+                    .filter(PythonPackageVersionEntity.package_name == package_name)
+                    .filter(self._construct_unanalyzed_filter())
+                    .with_entities(
                         PythonPackageVersionEntity.package_name,
                         PythonPackageVersionEntity.package_version,
                         PythonPackageIndex.url,
-                    ).notin_(subquery)
-                )
-                .with_entities(
-                    PythonPackageVersionEntity.package_name,
-                    PythonPackageVersionEntity.package_version,
-                    PythonPackageIndex.url,
-                    func.count(
-                        tuple_(
-                            PythonPackageVersionEntity.package_name,
-                            PythonPackageVersionEntity.package_version,
-                            PythonPackageIndex.url)
-                            ))
-                .group_by(
-                    PythonPackageVersionEntity.package_name,
-                    PythonPackageVersionEntity.package_version,
-                    PythonPackageIndex.url)
-                )
+                        func.count(
+                            tuple_(
+                                PythonPackageVersionEntity.package_name,
+                                PythonPackageVersionEntity.package_version,
+                                PythonPackageIndex.url)
+                                ))
+                    .group_by(
+                        PythonPackageVersionEntity.package_name,
+                        PythonPackageVersionEntity.package_version,
+                        PythonPackageIndex.url)
+                    )
 
             query = query.offset(start_offset).limit(count)
 
@@ -2425,6 +2819,21 @@ class GraphDatabase(SQLBase):
         package_name = self.normalize_python_package_name(package_name)
         package_version = self.normalize_python_package_version(package_version)
 
+        prefetched = self._prefetched.pop(
+            (
+                "get_python_package_version_records",
+                package_name,
+                package_version,
+                index_url,
+                os_name,
+                os_version,
+                python_version,
+            ),
+            None,
+        )
+        if prefetched is not None:
+            return prefetched
+
         with self._session_scope() as session:
             query = session.query(PythonPackageVersion).filter_by(
                 package_name=package_name, package_version=package_version
@@ -2482,6 +2891,7 @@ class GraphDatabase(SQLBase):
         os_version: str = None,
         python_version: str = None,
         extras: FrozenSet[Optional[str]] = None,
+        engine: TransitiveDependenciesEngineEnum = None,
     ) -> List[
         Tuple[
             Tuple[str, str, str],
@@ -2504,61 +2914,427 @@ class GraphDatabase(SQLBase):
         Extras are taken into account only for direct dependencies. Any extras required in libraries used in
         transitive dependencies are not required as solver directly report dependencies regardless extras
         configuration - see get_depends_on docs for extras parameter values..
+
+        The engine used to compute transitive dependencies can be selected explicitly, if not provided,
+        the one configured on adapter instantiation is used (see TransitiveDependenciesEngineEnum).
         """
         package_name = self.normalize_python_package_name(package_name)
         package_version = self.normalize_python_package_version(package_version)
+        engine = TransitiveDependenciesEngineEnum(engine) if engine else self.transitive_dependencies_engine
+
+        if engine == TransitiveDependenciesEngineEnum.RECURSIVE_CTE:
+            return self._retrieve_transitive_dependencies_python_recursive_cte(
+                package_name,
+                package_version,
+                index_url,
+                os_name=os_name,
+                os_version=os_version,
+                python_version=python_version,
+                extras=extras,
+            )
 
         result = []
-        initial_stack_entry = (extras, package_name, package_version, index_url)
-        stack = deque((initial_stack_entry,))
+        frontier = [(extras, package_name, package_version, index_url)]
         seen_tuples = {(package_name, package_version, index_url)}
-        while stack:
-            extras, *package_tuple = stack.pop()
+        try:
+            while frontier:
+                # Retrieve records and dependencies of all the package tuples in the frontier at once,
+                # results are handed over to memory caches via get_* calls bellow.
+                self._prefetch_frontier(
+                    frontier, os_name=os_name, os_version=os_version, python_version=python_version
+                )
+
+                expanded = []
+                for extras, *package_tuple in frontier:
+                    package_tuple = tuple(package_tuple)
+                    configurations = self.get_python_package_version_records(
+                        package_name=package_tuple[0],
+                        package_version=package_tuple[1],
+                        index_url=package_tuple[2],
+                        os_name=os_name,
+                        os_version=os_version,
+                        python_version=python_version,
+                    )
+
+                    for configuration in configurations:
+                        dependencies = self.get_depends_on(
+                            package_name=configuration["package_name"],
+                            package_version=configuration["package_version"],
+                            index_url=configuration["index_url"],
+                            os_name=configuration["os_name"],
+                            os_version=configuration["os_version"],
+                            python_version=configuration["python_version"],
+                            extras=extras,
+                        )
+                        expanded.append((package_tuple, configuration, dependencies))
+
+                self._prefetch_dependency_records(expanded)
+
+                frontier = []
+                for package_tuple, configuration, dependencies in expanded:
+                    for dependency_name, dependency_version in itertools.chain(*dependencies.values()):
+                        records = self.get_python_package_version_records(
+                            package_name=dependency_name,
+                            package_version=dependency_version,
+                            index_url=None,  # Do cross-index resolution...
+                            os_name=configuration["os_name"],
+                            os_version=configuration["os_version"],
+                            python_version=configuration["python_version"],
+                        )
+
+                        if not records:
+                            # Not resolved yet.
+                            result.append((package_tuple, (dependency_name, dependency_version, None)))
+                        else:
+                            for record in records:
+                                dependency_tuple = (
+                                    record["package_name"],
+                                    record["package_version"],
+                                    record["index_url"],
+                                )
+                                result.append((package_tuple, dependency_tuple))
+
+                                if dependency_tuple not in seen_tuples:
+                                    # Explicitly set extras to None as we do not have direct dependency anymore.
+                                    frontier.append((None, *dependency_tuple))
+                                    seen_tuples.add(dependency_tuple)
+
+                # Drop results not consumed as they were already present in memory caches.
+                self._prefetched.clear()
+        finally:
+            self._prefetched.clear()
+
+        return result
+
+    def _prefetch_frontier(
+        self,
+        frontier: List[Tuple[Optional[FrozenSet[Optional[str]]], str, str, Optional[str]]],
+        *,
+        os_name: Optional[str],
+        os_version: Optional[str],
+        python_version: Optional[str],
+    ) -> None:
+        """Retrieve records and dependencies of all the given package tuples in one query.
+
+        Results are stored so that subsequent calls to get_python_package_version_records and get_depends_on
+        are served without querying the database and populate memory caches.
+        """
+        with_index_url = [(item[1], item[2], item[3]) for item in frontier if item[3] is not None]
+        without_index_url = [(item[1], item[2]) for item in frontier if item[3] is None]
+
+        conditions = []
+        if with_index_url:
+            conditions.append(
+                tuple_(
+                    PythonPackageVersion.package_name, PythonPackageVersion.package_version, PythonPackageIndex.url
+                ).in_(with_index_url)
+            )
+
+        if without_index_url:
+            conditions.append(
+                tuple_(PythonPackageVersion.package_name, PythonPackageVersion.package_version).in_(without_index_url)
+            )
+
+        with self._session_scope() as session:
+            query = session.query(PythonPackageVersion).join(PythonPackageIndex).filter(or_(*conditions))
+
+            if os_name is not None:
+                query = query.filter(PythonPackageVersion.os_name == os_name)
+
+            if os_version is not None:
+                query = query.filter(PythonPackageVersion.os_version == os_version)
+
+            if python_version is not None:
+                query = query.filter(PythonPackageVersion.python_version == python_version)
+
+            query_result = (
+                query.outerjoin(DependsOn, DependsOn.version_id == PythonPackageVersion.id)
+                .outerjoin(PythonPackageVersionEntity, PythonPackageVersionEntity.id == DependsOn.entity_id)
+                .with_entities(
+                    PythonPackageVersion.package_name,
+                    PythonPackageVersion.package_version,
+                    PythonPackageIndex.url,
+                    PythonPackageVersion.os_name,
+                    PythonPackageVersion.os_version,
+                    PythonPackageVersion.python_version,
+                    DependsOn.extra,
+                    PythonPackageVersionEntity.package_name,
+                    PythonPackageVersionEntity.package_version,
+                )
+                .distinct()
+                .all()
+            )
+
+        configurations = {}
+        dependencies = {}
+        for item in query_result:
+            configuration = item[:6]
+            if configuration not in configurations:
+                configurations[configuration] = []
+                dependencies[configuration] = []
+
+            if item[7] is not None:
+                dependencies[configuration].append((item[6], item[7], item[8]))
+
+        records = {(item[1], item[2], item[3]): [] for item in frontier}
+        for configuration in configurations:
+            record = {
+                "package_name": configuration[0],
+                "package_version": configuration[1],
+                "index_url": configuration[2],
+                "os_name": configuration[3],
+                "os_version": configuration[4],
+                "python_version": configuration[5],
+            }
+            for index_url in (configuration[2], None):
+                if (configuration[0], configuration[1], index_url) in records:
+                    records[(configuration[0], configuration[1], index_url)].append(record)
+
+        for package_tuple, package_records in records.items():
+            self._prefetched[
+                ("get_python_package_version_records", *package_tuple, os_name, os_version, python_version)
+            ] = package_records
+
+        for extras in {item[0] for item in frontier}:
+            for configuration, configuration_dependencies in dependencies.items():
+                result = {}
+                for extra, dependency_name, dependency_version in configuration_dependencies:
+                    if extras and extra not in extras:
+                        continue
+
+                    if extra not in result:
+                        result[extra] = []
+
+                    result[extra].append((dependency_name, dependency_version))
+
+                self._prefetched[("get_depends_on", *configuration, extras)] = result
+
+    def _prefetch_dependency_records(
+        self, expanded: List[Tuple[Tuple[str, str, Optional[str]], Dict[str, str], Dict[str, List[Tuple[str, str]]]]]
+    ) -> None:
+        """Retrieve records of all the dependencies of the expanded packages in one query, cross-index.
+
+        Results are stored so that subsequent calls to get_python_package_version_records are served without
+        querying the database and populate memory caches.
+        """
+        records = {}
+        for _, configuration, dependencies in expanded:
+            for dependency_name, dependency_version in itertools.chain(*dependencies.values()):
+                records[
+                    (
+                        dependency_name,
+                        dependency_version,
+                        configuration["os_name"],
+                        configuration["os_version"],
+                        configuration["python_version"],
+                    )
+                ] = []
+
+        if not records:
+            return
+
+        with self._session_scope() as session:
+            query_result = (
+                session.query(PythonPackageVersion)
+                .filter(
+                    tuple_(
+                        PythonPackageVersion.package_name,
+                        PythonPackageVersion.package_version,
+                        PythonPackageVersion.os_name,
+                        PythonPackageVersion.os_version,
+                        PythonPackageVersion.python_version,
+                    ).in_(list(records.keys()))
+                )
+                .join(PythonPackageIndex)
+                .with_entities(
+                    PythonPackageVersion.package_name,
+                    PythonPackageVersion.package_version,
+                    PythonPackageIndex.url,
+                    PythonPackageVersion.os_name,
+                    PythonPackageVersion.os_version,
+                    PythonPackageVersion.python_version,
+                )
+                .distinct()
+                .all()
+            )
+
+        for item in query_result:
+            records[(item[0], item[1], item[3], item[4], item[5])].append(
+                {
+                    "package_name": item[0],
+                    "package_version": item[1],
+                    "index_url": item[2],
+                    "os_name": item[3],
+                    "os_version": item[4],
+                    "python_version": item[5],
+                }
+            )
+
+        for (package_name, package_version, os_name, os_version, python_version), value in records.items():
+            key = ("get_python_package_version_records", package_name, package_version, None)
+            self._prefetched[(*key, os_name, os_version, python_version)] = value
+
+    @staticmethod
+    def _join_transitive_dependencies(
+        query: Query,
+        node: Any,
+        *,
+        os_name: Optional[str],
+        os_version: Optional[str],
+        python_version: Optional[str],
+        extras: Optional[FrozenSet[Optional[str]]],
+    ) -> Tuple[Query, Any, Any, Any]:
+        """Join direct dependencies of package tuples stated in the node selectable.
+
+        Returns the adjusted query, dependency entity, a subquery with dependency records
+        and a condition to join dependency records with respect to the environment of the dependent package.
+        """
+        python_package_version = aliased(PythonPackageVersion)
+        python_package_index = aliased(PythonPackageIndex)
+        depends_on = aliased(DependsOn)
+        dependency_entity = aliased(PythonPackageVersionEntity)
+
+        query = query.join(
+            python_package_version,
+            and_(
+                python_package_version.package_name == node.c.package_name,
+                python_package_version.package_version == node.c.package_version,
+            ),
+        ).join(
+            python_package_index,
+            and_(
+                python_package_index.id == python_package_version.python_package_index_id,
+                or_(node.c.index_url.is_(None), python_package_index.url == node.c.index_url),
+            ),
+        )
+
+        if os_name is not None:
+            query = query.filter(python_package_version.os_name == os_name)
+
+        if os_version is not None:
+            query = query.filter(python_package_version.os_version == os_version)
+
+        if python_version is not None:
+            query = query.filter(python_package_version.python_version == python_version)
+
+        query = query.join(depends_on, depends_on.version_id == python_package_version.id)
+
+        if extras:
+            # Extras are respected only for direct dependencies of the package requested.
+            query = query.filter(or_(node.c.is_root.is_(False), *(depends_on.extra == i for i in extras)))
+
+        query = query.join(dependency_entity, dependency_entity.id == depends_on.entity_id)
+
+        dependency_version = aliased(PythonPackageVersion)
+        dependency_index = aliased(PythonPackageIndex)
+        dependency_records = (
+            query.session.query(
+                dependency_version.package_name,
+                dependency_version.package_version,
+                dependency_version.os_name,
+                dependency_version.os_version,
+                dependency_version.python_version,
+                dependency_index.url.label("index_url"),
+            )
+            .join(dependency_index, dependency_index.id == dependency_version.python_package_index_id)
+            .subquery()
+        )
+        # Do cross-index resolution in the environment the dependent package was solved for.
+        dependency_records_condition = and_(
+            dependency_records.c.package_name == dependency_entity.package_name,
+            dependency_records.c.package_version == dependency_entity.package_version,
+            dependency_records.c.os_name == python_package_version.os_name,
+            dependency_records.c.os_version == python_package_version.os_version,
+            dependency_records.c.python_version == python_package_version.python_version,
+        )
+
+        return query, dependency_entity, dependency_records, dependency_records_condition
 
-            configurations = self.get_python_package_version_records(
-                package_name=package_tuple[0],
-                package_version=package_tuple[1],
-                index_url=package_tuple[2],
+    def _retrieve_transitive_dependencies_python_recursive_cte(
+        self,
+        package_name: str,
+        package_version: str,
+        index_url: Optional[str],
+        *,
+        os_name: Optional[str],
+        os_version: Optional[str],
+        python_version: Optional[str],
+        extras: Optional[FrozenSet[Optional[str]]],
+    ) -> List[Tuple[Tuple[str, str, Optional[str]], Tuple[str, str, Optional[str]]]]:
+        """Get all transitive dependencies for the given package computing the closure on the database side.
+
+        The recursive part of the query computes all the package tuples reachable from the given package,
+        direct dependencies of all the package tuples in the closure are then retrieved in the very same query.
+        Unlike traversal in Python, each dependency relation is reported just once.
+        """
+        with self._session_scope() as session:
+            # Types have to match column types of the recursive term.
+            closure = session.query(
+                cast(literal(package_name), String(256)).label("package_name"),
+                cast(literal(package_version), String(256)).label("package_version"),
+                cast(literal(index_url), String(256)).label("index_url"),
+                true().label("is_root"),
+            ).cte("transitive_closure", recursive=True)
+
+            node = aliased(closure, name="node")
+            query, _, dependency_records, dependency_records_condition = self._join_transitive_dependencies(
+                session.query(node).select_from(node),
+                node,
                 os_name=os_name,
                 os_version=os_version,
                 python_version=python_version,
+                extras=extras,
+            )
+            query = query.join(dependency_records, dependency_records_condition).with_entities(
+                dependency_records.c.package_name,
+                dependency_records.c.package_version,
+                dependency_records.c.index_url,
+                false(),
             )
 
-            for configuration in configurations:
-                dependencies = self.get_depends_on(
-                    package_name=configuration["package_name"],
-                    package_version=configuration["package_version"],
-                    index_url=configuration["index_url"],
-                    os_name=configuration["os_name"],
-                    os_version=configuration["os_version"],
-                    python_version=configuration["python_version"],
-                    extras=extras,
+            if index_url is not None:
+                # The requested package was already expanded respecting extras, do not expand it again.
+                query = query.filter(
+                    tuple_(
+                        dependency_records.c.package_name,
+                        dependency_records.c.package_version,
+                        dependency_records.c.index_url,
+                    )
+                    != tuple_(package_name, package_version, index_url)
                 )
 
-                for dependency_name, dependency_version in itertools.chain(*dependencies.values()):
-                    records = self.get_python_package_version_records(
-                        package_name=dependency_name,
-                        package_version=dependency_version,
-                        index_url=None,  # Do cross-index resolution...
-                        os_name=configuration["os_name"],
-                        os_version=configuration["os_version"],
-                        python_version=configuration["python_version"],
-                    )
+            closure = closure.union(query)
 
-                    if not records:
-                        # Not resolved yet.
-                        result.append((package_tuple, (dependency_name, dependency_version, None)))
-                    else:
-                        for record in records:
-                            dependency_tuple = (record["package_name"], record["package_version"], record["index_url"])
-                            result.append((package_tuple, dependency_tuple))
+            query, dependency_entity, dependency_records, dependency_records_condition = (
+                self._join_transitive_dependencies(
+                    session.query(closure).select_from(closure),
+                    closure,
+                    os_name=os_name,
+                    os_version=os_version,
+                    python_version=python_version,
+                    extras=extras,
+                )
+            )
+            query_result = (
+                query.outerjoin(dependency_records, dependency_records_condition)
+                .with_entities(
+                    closure.c.package_name,
+                    closure.c.package_version,
+                    closure.c.index_url,
+                    dependency_entity.package_name,
+                    dependency_entity.package_version,
+                    dependency_records.c.index_url,
+                )
+                .distinct()
+                .all()
+            )
 
-                            if dependency_tuple not in seen_tuples:
-                                # Explicitly set extras to None as we do not have direct dependency anymore.
-                                stack.append((None, *dependency_tuple))
-                                seen_tuples.add(dependency_tuple)
+            result = []
+            for item in query_result:
+                # Dependencies not resolved yet have no index assigned.
+                result.append(((item[0], item[1], item[2]), (item[3], item[4], item[5])))
 
-        return result
+            return result
 
     def get_python_environment_marker(
         self,
@@ -2685,6 +3461,13 @@ class GraphDatabase(SQLBase):
         package_requested = locals()
         package_requested.pop("self")
 
+        prefetched = self._prefetched.pop(
+            ("get_depends_on", package_name, package_version, index_url, os_name, os_version, python_version, extras),
+            None,
+        )
+        if prefetched is not None:
+            return prefetched
+
         with self._session_scope() as session:
             query = (
                 session.query(PythonPackageVersion)
@@ -2745,6 +3528,7 @@ class GraphDatabase(SQLBase):
         os_name: str = None,
         os_version: str = None,
         python_version: str = None,
+        engine: TransitiveDependenciesEngineEnum = None,
     ) -> Dict[
         Tuple[str, str, str],
         Set[
@@ -2766,6 +3550,7 @@ class GraphDatabase(SQLBase):
                 os_name=os_name,
                 os_version=os_version,
                 python_version=python_version,
+                engine=engine,
             )
 
         return result
@@ -2842,6 +3627,53 @@ class GraphDatabase(SQLBase):
                 > 0
             )
 
+    def _get_document_ids(
+        self, column: Any, document_ids: Optional[List[str]] = None, *, batch_size: int = 1000
+    ) -> Set[str]:
+        """Get ids of documents synced stored in the given column.
+
+        If document ids are provided, only the ones present in the database are returned, queried in batches.
+        Otherwise all the document ids are retrieved in one query with results streamed from the database.
+        """
+        result = set()
+        with self._session_scope() as session:
+            if document_ids is None:
+                query = session.query(column).distinct().yield_per(batch_size)
+                result.update(item[0] for item in query)
+                return result
+
+            document_ids = list(document_ids)
+            for idx in range(0, len(document_ids), batch_size):
+                batch = document_ids[idx:idx + batch_size]  # Ignore PycodestyleBear (E203)
+                query = session.query(column).filter(column.in_(batch)).distinct()
+                result.update(item[0] for item in query.all())
+
+        return result
+
+    def get_solver_document_ids_all(self, document_ids: Optional[List[str]] = None) -> Set[str]:
+        """Get ids of solver documents synced, restrict to the given document ids if provided."""
+        return self._get_document_ids(Solved.document_id, document_ids)
+
+    def get_dependency_monkey_document_ids_all(self, document_ids: Optional[List[str]] = None) -> Set[str]:
+        """Get ids of dependency monkey reports synced, restrict to the given document ids if provided."""
+        return self._get_document_ids(DependencyMonkeyRun.dependency_monkey_document_id, document_ids)
+
+    def get_adviser_document_ids_all(self, document_ids: Optional[List[str]] = None) -> Set[str]:
+        """Get ids of adviser documents synced, restrict to the given document ids if provided."""
+        return self._get_document_ids(AdviserRun.adviser_document_id, document_ids)
+
+    def get_analysis_document_ids_all(self, document_ids: Optional[List[str]] = None) -> Set[str]:
+        """Get ids of analysis documents synced, restrict to the given document ids if provided."""
+        return self._get_document_ids(PackageExtractRun.analysis_document_id, document_ids)
+
+    def get_package_analysis_document_ids_all(self, document_ids: Optional[List[str]] = None) -> Set[str]:
+        """Get ids of package analysis documents synced, restrict to the given document ids if provided."""
+        return self._get_document_ids(PackageAnalyzerRun.package_analysis_document_id, document_ids)
+
+    def get_provenance_checker_document_ids_all(self, document_ids: Optional[List[str]] = None) -> Set[str]:
+        """Get ids of provenance-checker documents synced, restrict to the given document ids if provided."""
+        return self._get_document_ids(ProvenanceCheckerRun.provenance_checker_document_id, document_ids)
+
     @lru_cache(maxsize=256)
     def get_python_cve_records_all(self, package_name: str, package_version: str) -> List[dict]:
         """Get known vulnerabilities for the given package-version."""
@@ -3123,6 +3955,33 @@ class GraphDatabase(SQLBase):
             result = query.all()
             return [(item[0], item[1]) for item in result]
 
+    def get_python_packages_all_keyset(
+        self,
+        *,
+        continuation_token: Optional[str] = None,
+        count: int = DEFAULT_COUNT,
+        os_name: str = None,
+        os_version: str = None,
+        python_version: str = None,
+    ) -> Tuple[List[Tuple[str, str]], Optional[str]]:
+        """Retrieve Python packages with index in Thoth Database, paginated using continuation tokens.
+
+        Results are ordered by Python package version records they come from, pass the returned continuation
+        token to retrieve the next page. None is returned as continuation token once there are no more results.
+
+        Examples:
+        >>> from thoth.storages import GraphDatabase
+        >>> graph = GraphDatabase()
+        >>> graph.get_python_packages_all_keyset()
+        ([('regex', 'https://pypi.org/simple'), ('tensorflow', 'https://pypi.org/simple')], 'eyJpZCI6IDEwMH0=')
+        """
+        with self._session_scope() as session:
+            query = self._construct_python_package_versions_query(
+                session, os_name=os_name, os_version=os_version, python_version=python_version
+            ).with_entities(PythonPackageVersion.package_name, PythonPackageIndex.url)
+
+            return self._query_keyset_page(query, PythonPackageVersion.id, continuation_token, count)
+
     @staticmethod
     def _construct_python_packages_query(
         session: Session,
@@ -3228,6 +4087,7 @@ class GraphDatabase(SQLBase):
         os_version: str = None,
         python_version: str = None,
         distinct: bool = False,
+        use_cached: bool = False,
     ) -> Dict[Tuple[str, str, str], int]:
         """Retrieve number of Python Package (package_name, package_version, index_url) in Thoth Database.
 
@@ -3238,33 +4098,43 @@ class GraphDatabase(SQLBase):
         {('absl-py', '0.1.10', 'https://pypi.org/simple'): 1, ('absl-py', '0.2.1', 'https://pypi.org/simple'): 1}
         """
         with self._session_scope() as session:
-            query = (
-                session.query(PythonPackageVersion)
-                .join(PythonPackageIndex)
-                .group_by(
-                    PythonPackageVersion.package_name,
-                    PythonPackageVersion.package_version,
-                    PythonPackageIndex.url)
-                .with_entities(
-                    PythonPackageVersion.package_name,
-                    PythonPackageVersion.package_version,
-                    PythonPackageIndex.url,
-                    func.count(
-                        tuple_(
-                            PythonPackageVersion.package_name,
-                            PythonPackageVersion.package_version,
-                            PythonPackageIndex.url)
-                            ))
-            )
+            if use_cached:
+                query = self._construct_count_view_query(
+                    session,
+                    "python_package_version_count",
+                    ("package_name", "package_version", "index_url"),
+                    os_name=os_name,
+                    os_version=os_version,
+                    python_version=python_version,
+                )
+            else:
+                query = (
+                    session.query(PythonPackageVersion)
+                    .join(PythonPackageIndex)
+                    .group_by(
+                        PythonPackageVersion.package_name,
+                        PythonPackageVersion.package_version,
+                        PythonPackageIndex.url)
+                    .with_entities(
+                        PythonPackageVersion.package_name,
+                        PythonPackageVersion.package_version,
+                        PythonPackageIndex.url,
+                        func.count(
+                            tuple_(
+                                PythonPackageVersion.package_name,
+                                PythonPackageVersion.package_version,
+                                PythonPackageIndex.url)
+                                ))
+                )
 
-            if os_name is not None:
-                query = query.filter(PythonPackageVersion.os_name == os_name)
+                if os_name is not None:
+                    query = query.filter(PythonPackageVersion.os_name == os_name)
 
-            if os_version is not None:
-                query = query.filter(PythonPackageVersion.os_version == os_version)
+                if os_version is not None:
+                    query = query.filter(PythonPackageVersion.os_version == os_version)
 
-            if python_version is not None:
-                query = query.filter(PythonPackageVersion.python_version == python_version)
+                if python_version is not None:
+                    query = query.filter(PythonPackageVersion.python_version == python_version)
 
             query = query.offset(start_offset).limit(count)
 
@@ -3352,6 +4222,7 @@ class GraphDatabase(SQLBase):
         os_version: str = None,
         python_version: str = None,
         distinct: bool = False,
+        use_cached: bool = False,
     ) -> Dict[str, Dict[Tuple[str, str], int]]:
         """Retrieve number of Python package versions per index url in Thoth Database.
 
@@ -3362,33 +4233,44 @@ class GraphDatabase(SQLBase):
         {'https://pypi.org/simple': {('absl-py', '0.1.10'): 1, ('absl-py', '0.2.1'): 1}}
         """
         with self._session_scope() as session:
-            query = (
-                session.query(PythonPackageVersion)
-                .join(PythonPackageIndex)
-                .filter(PythonPackageIndex.url == index_url)
-                .with_entities(
-                    PythonPackageVersion.package_name,
-                    PythonPackageVersion.package_version,
-                    PythonPackageIndex.url,
-                    func.count(
-                        tuple_(
-                            PythonPackageVersion.package_name,
-                            PythonPackageVersion.package_version)
-                            ))
-                .group_by(
-                    PythonPackageVersion.package_name,
-                    PythonPackageVersion.package_version,
-                    PythonPackageIndex.url)
+            if use_cached:
+                query = self._construct_count_view_query(
+                    session,
+                    "python_package_version_count",
+                    ("package_name", "package_version", "index_url"),
+                    index_url=index_url,
+                    os_name=os_name,
+                    os_version=os_version,
+                    python_version=python_version,
                 )
+            else:
+                query = (
+                    session.query(PythonPackageVersion)
+                    .join(PythonPackageIndex)
+                    .filter(PythonPackageIndex.url == index_url)
+                    .with_entities(
+                        PythonPackageVersion.package_name,
+                        PythonPackageVersion.package_version,
+                        PythonPackageIndex.url,
+                        func.count(
+                            tuple_(
+                                PythonPackageVersion.package_name,
+                                PythonPackageVersion.package_version)
+                                ))
+                    .group_by(
+                        PythonPackageVersion.package_name,
+                        PythonPackageVersion.package_version,
+                        PythonPackageIndex.url)
+                    )
 
-            if os_name is not None:
-                query = query.filter(PythonPackageVersion.os_name == os_name)
+                if os_name is not None:
+                    query = query.filter(PythonPackageVersion.os_name == os_name)
 
-            if os_version is not None:
-                query = query.filter(PythonPackageVersion.os_version == os_version)
+                if os_version is not None:
+                    query = query.filter(PythonPackageVersion.os_version == os_version)
 
-            if python_version is not None:
-                query = query.filter(PythonPackageVersion.python_version == python_version)
+                if python_version is not None:
+                    query = query.filter(PythonPackageVersion.python_version == python_version)
 
             query = query.offset(start_offset).limit(count)
 
@@ -3416,6 +4298,7 @@ class GraphDatabase(SQLBase):
         os_version: str = None,
         python_version: str = None,
         distinct: bool = False,
+        use_cached: bool = False,
     ) -> Dict[str, Dict[str, int]]:
         """Retrieve number of Python package versions per index url in Thoth Database.
 
@@ -3428,34 +4311,45 @@ class GraphDatabase(SQLBase):
         package_name = self.normalize_python_package_name(package_name)
 
         with self._session_scope() as session:
-            query = (
-                session.query(PythonPackageVersion)
-                .join(PythonPackageIndex)
-                .filter(PythonPackageVersion.package_name == package_name)
-                .with_entities(
-                    PythonPackageVersion.package_name,
-                    PythonPackageVersion.package_version,
-                    PythonPackageIndex.url,
-                    func.count(
-                        tuple_(
-                            PythonPackageVersion.package_name,
-                            PythonPackageVersion.package_version,
-                            PythonPackageIndex.url)
-                            ))
-                .group_by(
-                    PythonPackageVersion.package_name,
-                    PythonPackageVersion.package_version,
-                    PythonPackageIndex.url)
+            if use_cached:
+                query = self._construct_count_view_query(
+                    session,
+                    "python_package_version_count",
+                    ("package_name", "package_version", "index_url"),
+                    package_name=package_name,
+                    os_name=os_name,
+                    os_version=os_version,
+                    python_version=python_version,
                 )
+            else:
+                query = (
+                    session.query(PythonPackageVersion)
+                    .join(PythonPackageIndex)
+                    .filter(PythonPackageVersion.package_name == package_name)
+                    .with_entities(
+                        PythonPackageVersion.package_name,
+                        PythonPackageVersion.package_version,
+                        PythonPackageIndex.url,
+                        func.count(
+                            tuple_(
+                                PythonPackageVersion.package_name,
+                                PythonPackageVersion.package_version,
+                                PythonPackageIndex.url)
+                                ))
+                    .group_by(
+                        PythonPackageVersion.package_name,
+                        PythonPackageVersion.package_version,
+                        PythonPackageIndex.url)
+                    )
 
-            if os_name is not None:
-                query = query.filter(PythonPackageVersion.os_name == os_name)
+                if os_name is not None:
+                    query = query.filter(PythonPackageVersion.os_name == os_name)
 
-            if os_version is not None:
-                query = query.filter(PythonPackageVersion.os_version == os_version)
+                if os_version is not None:
+                    query = query.filter(PythonPackageVersion.os_version == os_version)
 
-            if python_version is not None:
-                query = query.filter(PythonPackageVersion.python_version == python_version)
+                if python_version is not None:
+                    query = query.filter(PythonPackageVersion.python_version == python_version)
 
             query = query.offset(start_offset).limit(count)
 
@@ -3559,6 +4453,35 @@ class GraphDatabase(SQLBase):
 
             return query.all()
 
+    def get_python_package_versions_all_keyset(
+        self,
+        package_name: str = None,
+        package_version: str = None,
+        index_url: str = None,
+        *,
+        continuation_token: Optional[str] = None,
+        count: int = DEFAULT_COUNT,
+        os_name: str = None,
+        os_version: str = None,
+        python_version: str = None,
+    ) -> Tuple[List[Tuple[str, str, str]], Optional[str]]:
+        """Retrieve Python package versions in Thoth Database, paginated using continuation tokens.
+
+        See get_python_packages_all_keyset for details on pagination.
+        """
+        with self._session_scope() as session:
+            query = self._construct_python_package_versions_query(
+                session,
+                package_name=package_name,
+                package_version=package_version,
+                index_url=index_url,
+                os_name=os_name,
+                os_version=os_version,
+                python_version=python_version
+            )
+
+            return self._query_keyset_page(query, PythonPackageVersion.id, continuation_token, count)
+
     def get_python_package_versions_count_all(
         self,
         package_name: str = None,
@@ -3569,8 +4492,27 @@ class GraphDatabase(SQLBase):
         os_version: str = None,
         python_version: str = None,
         distinct: bool = False,
+        use_cached: bool = False,
     ) -> int:
         """Retrieve Python package versions number in Thoth Database."""
+        if use_cached:
+            if package_name is not None:
+                package_name = self.normalize_python_package_name(package_name)
+
+            if package_version is not None:
+                package_version = self.normalize_python_package_version(package_version)
+
+            return self._get_count_view_count_all(
+                "python_package_version_count",
+                distinct=distinct,
+                package_name=package_name,
+                package_version=package_version,
+                index_url=index_url,
+                os_name=os_name,
+                os_version=os_version,
+                python_version=python_version,
+            )
+
         with self._session_scope() as session:
             query = self._construct_python_package_versions_query(
                 session,
@@ -3780,18 +4722,17 @@ class GraphDatabase(SQLBase):
                 if seen_count == 0:
                     return None
 
-                with session.begin(subtransactions=True):
-                    index = None
-                    if index_url:
-                        index = self._get_or_create_python_package_index(session, index_url, only_if_enabled=False)
+            with session.begin(subtransactions=True):
+                index = None
+                if index_url:
+                    index = self._get_or_create_python_package_index(session, index_url, only_if_enabled=False)
 
-                    entity, existed = PythonPackageVersionEntity.get_or_create(
-                        session,
-                        package_name=package_name,
-                        package_version=package_version,
-                        python_package_index_id=index.id if index else None,
-                    )
-                    return entity, existed
+                return self._get_or_create_python_package_version_entity(
+                    session,
+                    package_name=package_name,
+                    package_version=package_version,
+                    python_package_index_id=index.id if index else None,
+                )
 
     def _create_python_package_version(
         self,
@@ -3819,7 +4760,7 @@ class GraphDatabase(SQLBase):
         package_name = self.normalize_python_package_name(package_name)
         package_version = self.normalize_python_package_version(package_version)
 
-        entity, _ = PythonPackageVersionEntity.get_or_create(
+        entity, _ = self._get_or_create_python_package_version_entity(
             session,
             package_name=package_name,
             package_version=package_version,
@@ -3924,7 +4865,9 @@ class GraphDatabase(SQLBase):
         """Sync the given inspection document into the graph database."""
         # Check if we have such performance model before creating any other records.
         inspection_document_id = InspectionResultsStore.get_document_id(document)
-        with self._session_scope() as session, session.begin(subtransactions=True):
+        with self._session_scope(get_or_create_cache="sync_inspection_result") as session, session.begin(
+            subtransactions=True
+        ):
             build_cpu = OpenShift.parse_cpu_spec(document["specification"]["build"]["requests"]["cpu"])
             build_memory = OpenShift.parse_memory_spec(document["specification"]["build"]["requests"]["memory"])
             run_cpu = OpenShift.parse_cpu_spec(document["specification"]["run"]["requests"]["cpu"])
@@ -4067,7 +5010,7 @@ class GraphDatabase(SQLBase):
                 session, cve_id=record_id, version_range=version_range, advisory=advisory, cve_name=cve
             )
             index = self._get_or_create_python_package_index(session, index_url, only_if_enabled=False)
-            entity, _ = PythonPackageVersionEntity.get_or_create(
+            entity, _ = self._get_or_create_python_package_version_entity(
                 session,
                 package_name=package_name,
                 package_version=package_version,
@@ -4298,7 +5241,9 @@ class GraphDatabase(SQLBase):
             image_tag = parts[1]
 
         # TODO: capture errors on image analysis? result of package-extract should be a JSON with error flag
-        with self._session_scope() as session, session.begin(subtransactions=True):
+        with self._session_scope(get_or_create_cache="sync_analysis_result") as session, session.begin(
+            subtransactions=True
+        ):
             if is_external:
                 sw_class = ExternalSoftwareEnvironment
             else:
@@ -4372,12 +5317,14 @@ class GraphDatabase(SQLBase):
             package_version,
             index_url,
         )
-        with self._session_scope() as session, session.begin(subtransactions=True):
+        with self._session_scope(get_or_create_cache="sync_package_analysis_result") as session, session.begin(
+            subtransactions=True
+        ):
             python_package_index, _ = PythonPackageIndex.get_or_create(
                 session,
                 url=index_url,
             )
-            python_package_version_entity, _ = PythonPackageVersionEntity.get_or_create(
+            python_package_version_entity, _ = self._get_or_create_python_package_version_entity(
                 session,
                 package_name=package_name,
                 package_version=package_version,
@@ -4450,9 +5397,7 @@ class GraphDatabase(SQLBase):
         session: Session, index_url: str, only_if_enabled: bool = True
     ) -> Optional[PythonPackageIndex]:
         """Get or create Python package index entry with a check the given index is enabled."""
-        python_package_index = (
-            session.query(PythonPackageIndex).filter(PythonPackageIndex.url == index_url).first()
-        )
+        python_package_index = PythonPackageIndex.get_first(session, url=index_url)
 
         if python_package_index is None:
             if only_if_enabled:
@@ -4564,19 +5509,39 @@ class GraphDatabase(SQLBase):
 
         return importlib_metadata
 
-    def sync_solver_result(self, document: dict) -> None:
-        """Sync the given solver result to the graph database."""
+    def sync_solver_result(self, document: dict, *, bulk: bool = None) -> None:
+        """Sync the given solver result to the graph database.
+
+        In bulk mode, artifacts, dependencies and solver records are collected for the whole document and
+        created in batches instead of one by one - the resulting content of the database is the same.
+        """
         solver_document_id = SolverResultsStore.get_document_id(document)
         solver_name = SolverResultsStore.get_solver_name_from_document_id(solver_document_id)
         solver_info = self.parse_python_solver_name(solver_name)
         solver_datetime = document["metadata"]["datetime"]
         solver_version = document["metadata"]["analyzer_version"]
-        solver_duration = document["metadata"].get("duration"),
+        solver_duration = document["metadata"].get("duration")
         os_name = solver_info["os_name"]
         os_version = solver_info["os_version"]
         python_version = solver_info["python_version"]
-
-        with self._session_scope() as session, session.begin(subtransactions=True):
+        bulk = self.bulk_sync if bulk is None else bulk
+
+        if bulk:
+            # Records are matched on client side, use the type returned by the database driver.
+            solver_datetime = parse_datetime(solver_datetime).replace(tzinfo=None)
+
+        # Rows collected in bulk mode.
+        artifact_rows = []
+        has_artifact_entity_ids = []
+        dependency_entity_rows = []
+        depends_on_rows = []
+        solved_rows = []
+        # Entities solved in the solver environment, maintained in the queue of pending solves.
+        solved_entity_ids = []
+
+        with self._session_scope(get_or_create_cache="sync_solver_result") as session, session.begin(
+            subtransactions=True
+        ):
             ecosystem_solver, _ = EcosystemSolver.get_or_create(
                 session,
                 ecosystem="python",
@@ -4651,39 +5616,54 @@ class GraphDatabase(SQLBase):
                 )
 
                 for sha256 in python_package_info["sha256"]:
-                    artifact, _ = PythonArtifact.get_or_create(
-                        session,
+                    artifact_row = dict(
                         artifact_hash_sha256=sha256,
                         artifact_name=None,  # TODO: aggregate artifact names
                     )
+
+                    if bulk:
+                        artifact_rows.append(artifact_row)
+                        has_artifact_entity_ids.append(python_package_version.entity_id)
+                        continue
+
+                    artifact, _ = PythonArtifact.get_or_create(session, **artifact_row)
                     HasArtifact.get_or_create(
                         session,
                         python_artifact_id=artifact.id,
                         python_package_version_entity_id=python_package_version.entity_id,
                     )
 
-                solved, _ = Solved.get_or_create(
-                    session,
+                solved_entity_ids.append(python_package_version.entity_id)
+                solved_row = dict(
                     datetime=solver_datetime,
                     document_id=solver_document_id,
-                    version=python_package_version,
-                    ecosystem_solver=ecosystem_solver,
+                    version_id=python_package_version.id,
+                    ecosystem_solver_id=ecosystem_solver.id,
                     duration=solver_duration,
                     error=False,
                     error_unparseable=False,
                     error_unsolvable=False,
                 )
 
+                if bulk:
+                    solved_rows.append(solved_row)
+                else:
+                    Solved.get_or_create(session, **solved_row)
+
                 for dependency in python_package_info["dependencies"]:
                     for index_entry in dependency["resolved_versions"]:
                         for dependency_version in index_entry["versions"]:
-                            dependency_entity, _ = PythonPackageVersionEntity.get_or_create(
-                                session,
+                            dependency_entity_row = dict(
                                 package_name=self.normalize_python_package_name(dependency["package_name"]),
                                 package_version=self.normalize_python_package_version(dependency_version),
                                 python_package_index_id=None,
                             )
 
+                            if not bulk:
+                                dependency_entity, _ = self._get_or_create_python_package_version_entity(
+                                    session, **dependency_entity_row
+                                )
+
                             if len(dependency.get("extra") or []) > 1:
                                 # Not sure if this can happen in the ecosystem, report error
                                 # if this incident happens.
@@ -4700,16 +5680,20 @@ class GraphDatabase(SQLBase):
                                     dependency_version["extra"]
                                 )
 
-                            DependsOn.get_or_create(
-                                session,
-                                version=python_package_version,
-                                entity=dependency_entity,
+                            depends_on_row = dict(
+                                version_id=python_package_version.id,
                                 version_range=dependency.get("required_version") or "*",
                                 marker=dependency.get("marker"),
                                 extra=dependency["extra"][0] if dependency.get("extra") else None,
                                 marker_evaluation_result=dependency.get("marker_evaluation_result"),
                             )
 
+                            if bulk:
+                                dependency_entity_rows.append(dependency_entity_row)
+                                depends_on_rows.append(depends_on_row)
+                            else:
+                                DependsOn.get_or_create(session, entity_id=dependency_entity.id, **depends_on_row)
+
             for error_info in document["result"]["errors"]:
                 # Normalized in `_create_python_package_version'.
                 package_name = error_info.get("package_name") or error_info["package"]
@@ -4733,12 +5717,12 @@ class GraphDatabase(SQLBase):
                     index_url=index_url,
                 )
 
-                solved, _ = Solved.get_or_create(
-                    session,
+                solved_entity_ids.append(python_package_version.entity_id)
+                solved_row = dict(
                     datetime=solver_datetime,
                     document_id=solver_document_id,
                     version_id=python_package_version.id,
-                    ecosystem_solver=ecosystem_solver,
+                    ecosystem_solver_id=ecosystem_solver.id,
                     duration=solver_duration,
                     error=True,
                     error_unparseable=False,
@@ -4746,6 +5730,11 @@ class GraphDatabase(SQLBase):
                     is_provided=error_info.get("is_provided"),
                 )
 
+                if bulk:
+                    solved_rows.append(solved_row)
+                else:
+                    Solved.get_or_create(session, **solved_row)
+
             for unsolvable in document["result"]["unresolved"]:
                 if not unsolvable["version_spec"].startswith("=="):
                     # No resolution can be performed so no identifier is captured, report warning and continue.
@@ -4778,18 +5767,23 @@ class GraphDatabase(SQLBase):
                     index_url=index_url,
                 )
 
-                solved, _ = Solved.get_or_create(
-                    session,
+                solved_entity_ids.append(python_package_version.entity_id)
+                solved_row = dict(
                     datetime=solver_datetime,
                     document_id=solver_document_id,
                     version_id=python_package_version.id,
-                    ecosystem_solver=ecosystem_solver,
+                    ecosystem_solver_id=ecosystem_solver.id,
                     duration=solver_duration,
                     error=True,
                     error_unparseable=False,
                     error_unsolvable=True,
                 )
 
+                if bulk:
+                    solved_rows.append(solved_row)
+                else:
+                    Solved.get_or_create(session, **solved_row)
+
             for unparsed in document["result"]["unparsed"]:
                 parts = unparsed["requirement"].rsplit("==", maxsplit=1)
                 if len(parts) != 2:
@@ -4817,18 +5811,52 @@ class GraphDatabase(SQLBase):
                     index_url=None
                 )
 
-                solved, _ = Solved.get_or_create(
-                    session,
+                solved_entity_ids.append(python_package_version.entity_id)
+                solved_row = dict(
                     datetime=solver_datetime,
                     document_id=solver_document_id,
-                    version=python_package_version,
-                    ecosystem_solver=ecosystem_solver,
+                    version_id=python_package_version.id,
+                    ecosystem_solver_id=ecosystem_solver.id,
                     duration=solver_duration,
                     error=True,
                     error_unparseable=True,
                     error_unsolvable=False,
                 )
 
+                if bulk:
+                    solved_rows.append(solved_row)
+                else:
+                    Solved.get_or_create(session, **solved_row)
+
+            if bulk:
+                artifact_ids = PythonArtifact.bulk_get_or_create(session, artifact_rows)
+                HasArtifact.bulk_get_or_create(
+                    session,
+                    [
+                        dict(python_artifact_id=artifact_id, python_package_version_entity_id=entity_id)
+                        for artifact_id, entity_id in zip(artifact_ids, has_artifact_entity_ids)
+                    ],
+                )
+
+                dependency_entity_ids = PythonPackageVersionEntity.bulk_get_or_create(session, dependency_entity_rows)
+                # Bulk creation does not report newly created entities, enqueueing is idempotent.
+                self._enqueue_pending_solve(session, dependency_entity_ids)
+                for depends_on_row, dependency_entity_id in zip(depends_on_rows, dependency_entity_ids):
+                    depends_on_row["entity_id"] = dependency_entity_id
+
+                DependsOn.bulk_get_or_create(session, depends_on_rows)
+                Solved.bulk_get_or_create(session, solved_rows)
+
+            # Entities can be pending in environments of other solvers, the solved one is removed from the queue.
+            self._enqueue_pending_solve(session, solved_entity_ids)
+            self._delete_pending_solve(
+                session,
+                solved_entity_ids,
+                os_name=ecosystem_solver.os_name,
+                os_version=ecosystem_solver.os_version,
+                python_version=ecosystem_solver.python_version,
+            )
+
     def sync_adviser_result(self, document: dict) -> None:
         """Sync adviser result into graph database."""
         adviser_document_id = AdvisersResultsStore.get_document_id(document)
@@ -4840,7 +5868,9 @@ class GraphDatabase(SQLBase):
         if not origin:
             _LOGGER.warning("No origin stated in the adviser result %r", adviser_document_id)
 
-        with self._session_scope() as session, session.begin(subtransactions=True):
+        with self._session_scope(get_or_create_cache="sync_adviser_result") as session, session.begin(
+            subtransactions=True
+        ):
             external_hardware_info, external_run_software_environment = self._runtime_environment_conf2models(
                 session,
                 runtime_environment=runtime_environment,
@@ -4930,7 +5960,9 @@ class GraphDatabase(SQLBase):
         if not origin:
             _LOGGER.warning("No origin stated in the provenance-checker result %r", provenance_checker_document_id)
 
-        with self._session_scope() as session, session.begin(subtransactions=True):
+        with self._session_scope(get_or_create_cache="sync_provenance_checker_result") as session, session.begin(
+            subtransactions=True
+        ):
             parameters = document["result"]["parameters"]
             software_stack = self._create_python_software_stack(
                 session,
@@ -4958,7 +5990,9 @@ class GraphDatabase(SQLBase):
 
     def sync_dependency_monkey_result(self, document: dict) -> None:
         """Sync reports of dependency monkey runs."""
-        with self._session_scope() as session, session.begin(subtransactions=True):
+        with self._session_scope(get_or_create_cache="sync_dependency_monkey_result") as session, session.begin(
+            subtransactions=True
+        ):
             parameters = document["result"]["parameters"]
             run_hardware_information, run_software_environment = self._runtime_environment_conf2models(
                 session,
@@ -5017,6 +6051,137 @@ class GraphDatabase(SQLBase):
 
                 inspection_run.dependency_monkey_run_id = dependency_monkey_run.id
 
+    def create_count_views(self) -> None:
+        """Create materialized views holding counts of package versions, used by count queries with use_cached.
+
+        Views are populated on creation, creating views which already exist is a no-op. Views are also created
+        on the first query using them, creating them explicitly avoids populating them on a query.
+        """
+        for count_view in COUNT_VIEWS.values():
+            self._refresh_count_view(count_view, only_if_missing=True)
+
+    def drop_count_views(self) -> None:
+        """Drop materialized views holding counts of package versions."""
+        with self._session_scope() as session:
+            for count_view in COUNT_VIEWS.values():
+                session.execute(f"DROP MATERIALIZED VIEW IF EXISTS {count_view.name}")
+
+            # The table is dropped with other tables, views are dropped before it.
+            if self._engine.dialect.has_table(session.connection(), CountViewRefresh.__tablename__):
+                session.query(CountViewRefresh).delete(synchronize_session=False)
+
+    def refresh_count_views(self, *, concurrently: bool = True) -> None:
+        """Refresh materialized views holding counts of package versions.
+
+        Views refreshed concurrently can be queried during the refresh. Views which do not exist yet are created.
+        """
+        for count_view in COUNT_VIEWS.values():
+            self._refresh_count_view(count_view, concurrently=concurrently)
+
+    def _refresh_count_view(
+        self, count_view: CountView, *, concurrently: bool = True, wait: bool = True, only_if_missing: bool = False
+    ) -> None:
+        """Refresh the given materialized count view, create it if it does not exist.
+
+        The view is refreshed by one caller at a time, if wait is not set and the view is being refreshed
+        by another caller, the view is left as is. If only_if_missing is set, the view is refreshed only if
+        it was not refreshed yet (it is created or was created by a version not recording refreshes).
+        """
+        refreshed = datetime.utcnow()
+
+        with self._session_scope() as session:
+            # The lock is released at the end of the transaction.
+            if wait:
+                session.execute("SELECT pg_advisory_xact_lock(hashtext(:name))", {"name": count_view.name})
+            elif not session.execute(
+                "SELECT pg_try_advisory_xact_lock(hashtext(:name))", {"name": count_view.name}
+            ).scalar():
+                _LOGGER.debug("Materialized count view %r is being refreshed by another caller", count_view.name)
+                return
+
+            if only_if_missing and session.query(CountViewRefresh).filter(
+                CountViewRefresh.name == count_view.name
+            ).first() is not None:
+                return
+
+            view_exists = session.execute(
+                "SELECT 1 FROM pg_matviews WHERE matviewname = :name", {"name": count_view.name}
+            ).first()
+
+            if view_exists:
+                _LOGGER.info("Refreshing materialized count view %r", count_view.name)
+                session.execute(
+                    f"REFRESH MATERIALIZED VIEW {'CONCURRENTLY ' if concurrently else ''}{count_view.name}"
+                )
+            else:
+                statement = count_view.construct_query(session).statement.compile(
+                    dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}
+                )
+                _LOGGER.info("Creating materialized count view %r", count_view.name)
+                session.execute(f"CREATE MATERIALIZED VIEW {count_view.name} AS {statement}")
+                # A unique index is required to refresh the view concurrently.
+                session.execute(
+                    f"CREATE UNIQUE INDEX {count_view.name}_idx ON {count_view.name} "
+                    f"({', '.join(count_view.key_columns)})"
+                )
+
+            session.execute(
+                insert(CountViewRefresh)
+                .values(name=count_view.name, refreshed=refreshed)
+                .on_conflict_do_update(index_elements=[CountViewRefresh.name], set_={"refreshed": refreshed})
+            )
+
+    def _construct_count_view_query(
+        self, session: Session, name: str, key_columns: Tuple[str, ...], **filters: Optional[str]
+    ) -> Query:
+        """Construct query summing counts in the given view per key columns, refresh the view if it is stale.
+
+        Stale views are refreshed by one of the callers, others use the stale view meanwhile. Callers wait only
+        for the view to be created. Filters not set to None restrict view columns named after the filter
+        to the given value.
+        """
+        count_view = COUNT_VIEWS[name]
+
+        refreshed = (
+            session.query(CountViewRefresh.refreshed).filter(CountViewRefresh.name == count_view.name).scalar()
+        )
+        if refreshed is None:
+            self._refresh_count_view(count_view, only_if_missing=True)
+        elif refreshed < datetime.utcnow() - timedelta(seconds=self.count_views_max_age):
+            self._refresh_count_view(count_view, wait=False)
+
+        view = count_view.table
+        columns = [view.c[key_column] for key_column in key_columns]
+        query = session.query(*columns, cast(func.sum(view.c["count"]), BigInteger).label("count"))
+        for column_name, value in filters.items():
+            if value is not None:
+                query = query.filter(view.c[column_name] == value)
+
+        return query.group_by(*columns)
+
+    def _get_count_view_count_all(self, name: str, *, distinct: bool = False, **filters: Optional[str]) -> int:
+        """Retrieve number of records counted in the given view, count each key once if distinct is set."""
+        with self._session_scope() as session:
+            query = self._construct_count_view_query(
+                session, name, ("package_name", "package_version", "index_url"), **filters
+            )
+
+            if distinct:
+                return query.count()
+
+            return int(session.query(func.coalesce(func.sum(query.subquery().c["count"]), 0)).scalar())
+
+    @staticmethod
+    def _check_unsolved_count_view_environment(
+        os_name: Optional[str], os_version: Optional[str], python_version: Optional[str]
+    ) -> None:
+        """Check the given environment can be used to query cached counts of unsolved packages."""
+        if os_name is None or os_version is None or python_version is None:
+            raise ValueError(
+                "Cached counts of unsolved Python package versions are available only per solver environment, "
+                "os_name, os_version and python_version have to be provided"
+            )
+
     def get_pi_count(self, framework: str) -> Dict[str, int]:
         """Get dictionary with number of Performance Indicators per type for the ML Framework selected."""
         result = {}
@@ -5026,36 +6191,159 @@ class GraphDatabase(SQLBase):
 
         return result
 
-    def get_performance_table_count(self) -> Dict[str, int]:
-        """Get dictionary mapping performance tables to records count."""
-        result = {}
+    def _get_table_count(self, models: FrozenSet[Any], *, approximate: bool = False) -> Dict[str, int]:
+        """Retrieve dictionary mapping tables of the given models to records count, in a single query.
+
+        Approximate counts are estimates kept by PostgreSQL statistics, read from catalogs without scanning tables.
+        """
+        models = sorted(models, key=lambda model: model.__tablename__)
+        table_names = [model.__tablename__ for model in models]
 
         with self._session_scope() as session:
-            for performance_model in ALL_PERFORMANCE_MODELS:
-                result[performance_model.__tablename__] = session.query(func.count(performance_model.id)).scalar()
+            if not approximate:
+                query = session.query(
+                    *(session.query(func.count()).select_from(model).label(model.__tablename__) for model in models)
+                )
+                return dict(zip(table_names, query.one()))
+
+            # Live tuples are maintained by the statistics collector, fall back to estimates stored on analyze
+            # also when statistics were reset (e.g. after restart or failover) and report no live tuples.
+            statement = text(
+                "SELECT c.relname, COALESCE(NULLIF(s.n_live_tup, 0), GREATEST(c.reltuples, 0)::bigint) "
+                "FROM pg_class c "
+                "JOIN pg_namespace n ON n.oid = c.relnamespace "
+                "LEFT JOIN pg_stat_user_tables s ON s.relid = c.oid "
+                "WHERE n.nspname = current_schema() AND c.relkind = 'r' AND c.relname IN :table_names"
+            ).bindparams(bindparam("table_names", expanding=True))
+
+            result = dict.fromkeys(table_names, 0)
+            result.update(session.execute(statement, {"table_names": table_names}).fetchall())
+            return result
 
-        return result
+    def get_performance_table_count(self, *, approximate: bool = False) -> Dict[str, int]:
+        """Get dictionary mapping performance tables to records count."""
+        return self._get_table_count(ALL_PERFORMANCE_MODELS, approximate=approximate)
 
-    def get_main_table_count(self) -> Dict[str, int]:
+    def get_main_table_count(self, *, approximate: bool = False) -> Dict[str, int]:
         """Retrieve dictionary mapping main tables to records count."""
-        result = {}
-
-        with self._session_scope() as session:
-            for main_model in ALL_MAIN_MODELS:
-                result[main_model.__tablename__] = session.query(func.count(main_model.id)).scalar()
-
-        return result
+        return self._get_table_count(ALL_MAIN_MODELS, approximate=approximate)
 
-    def get_relation_table_count(self) -> Dict[str, int]:
+    def get_relation_table_count(self, *, approximate: bool = False) -> Dict[str, int]:
         """Retrieve dictionary mapping relation tables to records count."""
+        return self._get_table_count(ALL_RELATION_MODELS, approximate=approximate)
+
+    @staticmethod
+    def _get_table_rows_tables() -> list:
+        """Get main, relation and performance tables in order of their dependencies, referenced tables go first."""
+        tables = {model.__table__ for model in ALL_MAIN_MODELS | ALL_RELATION_MODELS | ALL_PERFORMANCE_MODELS}
+        return [table for table in Base.metadata.sorted_tables if table in tables]
+
+    def export_table_rows(
+        self, directory: str, since_ids: Optional[Dict[str, int]] = None, *, timeout: float = 3600
+    ) -> Dict[str, Dict[str, Any]]:
+        """Export rows inserted since the given ids from main, relation and performance tables to the directory.
+
+        Rows are selected based on their monotonic ids - rows with id greater than the id given for the table
+        (all rows if no id is given) up to the greatest id present are exported. Rows of each table are written
+        to a file named after the table using binary COPY format. All the tables are exported from the same
+        snapshot of the database. Returns mapping of table names to ids and columns exported.
+
+        Ids are assigned when rows are inserted, transactions in progress can still commit rows with ids lower
+        than the greatest id present. The export thus waits (at most timeout seconds) for transactions in
+        progress at the time the greatest ids were obtained to finish, so that no rows up to these ids are
+        skipped by subsequent incremental exports.
+
+        Note only inserted rows are exported, updates and deletions of rows exported before are not.
+        """
+        since_ids = since_ids or {}
+        tables = self._get_table_rows_tables()
         result = {}
+        connection = self._engine.raw_connection()
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute("SET TRANSACTION ISOLATION LEVEL REPEATABLE READ, READ ONLY")
+                until_ids = {}
+                for table in tables:
+                    since_id = since_ids.get(table.name, 0)
+                    cursor.execute(f'SELECT max(id) FROM "{table.name}"')
+                    until_ids[table.name] = max(cursor.fetchone()[0] or 0, since_id)
+
+                cursor.execute("SELECT txid_snapshot_xmax(txid_current_snapshot())")
+                xmax = cursor.fetchone()[0]
+                connection.rollback()
+
+                # Wait until the oldest transaction in progress started after the greatest ids were obtained.
+                deadline = time.monotonic() + timeout
+                while True:
+                    cursor.execute("SELECT txid_snapshot_xmin(txid_current_snapshot())")
+                    xmin = cursor.fetchone()[0]
+                    connection.rollback()
+                    if xmin >= xmax:
+                        break
+
+                    if time.monotonic() > deadline:
+                        raise TimeoutError(
+                            f"Transactions in progress did not finish in {timeout} seconds, oldest "
+                            f"transaction in progress is {xmin}, waiting for transactions before {xmax}"
+                        )
 
-        with self._session_scope() as session:
-            for relation_model in ALL_RELATION_MODELS:
-                result[relation_model.__tablename__] = session.query(relation_model.id).count()
+                    _LOGGER.debug("Waiting for transactions in progress before %d to finish", xmax)
+                    time.sleep(1)
+
+                cursor.execute("SET TRANSACTION ISOLATION LEVEL REPEATABLE READ, READ ONLY")
+                for table in tables:
+                    since_id = since_ids.get(table.name, 0)
+                    until_id = until_ids[table.name]
+                    columns = [column.name for column in table.columns]
+                    query = (
+                        "COPY (SELECT {} FROM \"{}\" WHERE id > {:d} AND id <= {:d} ORDER BY id) "
+                        "TO STDOUT WITH (FORMAT binary)"
+                    ).format(", ".join(f'"{column}"' for column in columns), table.name, since_id, until_id)
+                    with open(os.path.join(directory, table.name), "wb") as table_file:
+                        cursor.copy_expert(query, table_file)
+
+                    result[table.name] = {
+                        "since_id": since_id,
+                        "until_id": until_id,
+                        "columns": columns,
+                        "row_count": cursor.rowcount,
+                    }
+        finally:
+            connection.rollback()
+            connection.close()
 
         return result
 
+    def import_table_rows(self, directory: str, exports: Dict[str, Dict[str, Any]]) -> None:
+        """Import rows of tables exported using export_table_rows from the directory.
+
+        Tables are imported in order of their dependencies in a single transaction, sequences generating ids are
+        adjusted to follow ids imported.
+        """
+        connection = self._engine.raw_connection()
+        try:
+            with connection.cursor() as cursor:
+                for table in self._get_table_rows_tables():
+                    export = exports.get(table.name)
+                    if export is None:
+                        continue
+
+                    columns = ", ".join(f'"{column}"' for column in export["columns"])
+                    query = f'COPY "{table.name}" ({columns}) FROM STDIN WITH (FORMAT binary)'
+                    with open(os.path.join(directory, table.name), "rb") as table_file:
+                        cursor.copy_expert(query, table_file)
+
+                    cursor.execute(
+                        f"SELECT setval(pg_get_serial_sequence('\"{table.name}\"', 'id'), max(id)) "
+                        f'FROM "{table.name}"'
+                    )
+            connection.commit()
+        except Exception:
+            connection.rollback()
+            raise
+        finally:
+            connection.close()
+
     def get_ml_frameworks_all(self) -> List[str]:
         """Retrieve ML frameworks in Thoth database."""
         result = []
@@ -5083,4 +6371,4 @@ class GraphDatabase(SQLBase):
         ):
             stats[method_name] = dict(method.cache_info()._asdict())
 
-        return {"memory_cache_info": stats}
+        return {"memory_cache_info": stats, "get_or_create_cache_info": self._get_or_create_cache_stats}
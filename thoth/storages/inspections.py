@@ -19,8 +19,10 @@
 
 
 import typing
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict
 
+from .ceph import CephStore
 from .result_base import ResultStorageBase
 from .inspection_schema import INSPECTION_SCHEMA
 
@@ -36,18 +38,46 @@ class InspectionResultsStore(ResultStorageBase):
         """Get id under which the given document will be stored."""
         return document["inspection_id"]
 
-    def filter_document_ids(cls, inspection_identifiers: List[str]) -> Dict[str, List]:
+    def filter_document_ids(
+        cls, inspection_identifiers: List[str], *, concurrency: typing.Optional[int] = None
+    ) -> Dict[str, List]:
         """Filter inspection document ids list according to the inspection identifiers selected.
 
+        Documents for each identifier are listed concurrently, only documents with ids prefixed with the identifier
+        are listed. If manifest is enabled, documents are listed from manifest once for all the identifiers.
+
         :param inspection_identifiers: list of identifier/s to filter inspection ids
+        :param concurrency: number of listings run concurrently, defaults to CephStore.DEFAULT_CONCURRENCY
         """
-        inspection_document_ids = list(cls.get_document_listing())
         filtered_inspection_document_ids = dict((i, []) for i in inspection_identifiers)
+        # Empty identifiers never match an inspection id.
+        identifiers = [i for i in filtered_inspection_document_ids if i]
+        if not identifiers:
+            return filtered_inspection_document_ids
+
+        if cls.manifest_enabled:
+            selected = {f"inspection-{identifier}": identifier for identifier in identifiers}
+            for document_id in cls.get_manifest_document_listing():
+                identifier = selected.get(document_id.rsplit("-", maxsplit=1)[0])
+                if identifier is not None:
+                    filtered_inspection_document_ids[identifier].append(document_id)
+
+            for document_ids in filtered_inspection_document_ids.values():
+                document_ids.sort()
+
+            return filtered_inspection_document_ids
 
-        for sid in inspection_document_ids:
-            inspection_filter = "-".join(sid.split("-")[1:(len(sid.split("-")) - 1)])
+        def list_identifier(identifier: str) -> List[str]:
+            # The prefix also matches ids of identifiers starting with the given identifier followed by a dash.
+            return [
+                sid
+                for sid in cls.get_document_listing(prefix=f"inspection-{identifier}-")
+                if sid.rsplit("-", maxsplit=1)[0] == f"inspection-{identifier}"
+            ]
 
-            if inspection_filter and inspection_filter in inspection_identifiers:
-                filtered_inspection_document_ids[inspection_filter].append(sid)
+        concurrency = min(concurrency or CephStore.DEFAULT_CONCURRENCY, len(identifiers))
+        with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="inspection-listing") as executor:
+            for identifier, document_ids in zip(identifiers, executor.map(list_identifier, identifiers)):
+                filtered_inspection_document_ids[identifier] = document_ids
 
         return filtered_inspection_document_ids
@@ -17,12 +17,14 @@
 
 """Adapter for storing analysis results onto a persistence remote store."""
 
+import datetime
 import os
 import typing
 
 from .base import StorageBase
 from .ceph import CephStore
 from .result_schema import RESULT_SCHEMA
+from .exceptions import NotFoundError
 from .exceptions import SchemaError
 
 
@@ -33,6 +35,11 @@ class ResultStorageBase(StorageBase):
     RESULT_TYPE = ""
     # Use core analyzers schema as default one, derived classes can adjust this.
     SCHEMA = RESULT_SCHEMA
+    # Paths to sections of documents parsed incrementally when retrieving documents streamed.
+    STREAMED_DOCUMENT_PATHS: typing.Tuple[str, ...] = ()
+    # Manifest entries of documents are written to a journal, one object per document, and compacted to shards.
+    _MANIFEST_JOURNAL = "journal"
+    _MANIFEST_SHARD = "shard"
 
     def __init__(
         self,
@@ -55,12 +62,21 @@ class ResultStorageBase(StorageBase):
         ), "Make sure RESULT_TYPE in derived classes to distinguish between adapter type instances is non-empty."
 
         self.deployment_name = deployment_name or os.environ["THOTH_DEPLOYMENT_NAME"]
-        self.prefix = "{}/{}/{}".format(
-            prefix or os.environ["THOTH_CEPH_BUCKET_PREFIX"], self.deployment_name, self.RESULT_TYPE
-        )
+        bucket_prefix = prefix or os.environ["THOTH_CEPH_BUCKET_PREFIX"]
+        self.prefix = "{}/{}/{}".format(bucket_prefix, self.deployment_name, self.RESULT_TYPE)
         self.ceph = CephStore(
             self.prefix, host=host, key_id=key_id, secret_key=secret_key, bucket=bucket, region=region
         )
+        # Manifest is kept outside of prefix with documents so that it does not show up in document listing.
+        self.manifest_enabled = bool(int(os.getenv("THOTH_STORAGES_MANIFEST", 0)))
+        self.manifest_ceph = CephStore(
+            "{}/{}/manifest/{}".format(bucket_prefix, self.deployment_name, self.RESULT_TYPE),
+            host=host,
+            key_id=key_id,
+            secret_key=secret_key,
+            bucket=bucket,
+            region=region,
+        )
 
     @classmethod
     def get_document_id(cls, document: dict) -> str:
@@ -79,13 +95,49 @@ class ResultStorageBase(StorageBase):
         """Connect the given storage adapter."""
         self.ceph.connect()
 
-    def get_document_listing(self) -> typing.Generator[str, None, None]:
-        """Get listing of documents available in Ceph as a generator."""
-        return self.ceph.get_document_listing()
+    def _get_manifest_ceph(self) -> CephStore:
+        """Get connected store with manifest of stored documents, the store is connected lazily."""
+        if not self.manifest_ceph.is_connected():
+            self.manifest_ceph.connect()
+
+        return self.manifest_ceph
+
+    def get_document_listing(
+        self, start_after: typing.Optional[str] = None, *, limit: typing.Optional[int] = None, prefix: str = ""
+    ) -> typing.Generator[str, None, None]:
+        """Get listing of documents available in Ceph as a generator.
+
+        Listing can start after the given document id, be limited to the given number of documents and to documents
+        with ids starting with the given prefix. Documents are listed based on manifest if it is enabled.
+        """
+        if self.manifest_enabled:
+            return self._get_manifest_sorted_listing(start_after, limit=limit, prefix=prefix)
+
+        return self.ceph.get_document_listing(start_after=start_after, limit=limit, prefix=prefix)
+
+    def _get_manifest_sorted_listing(
+        self, start_after: typing.Optional[str] = None, *, limit: typing.Optional[int] = None, prefix: str = ""
+    ) -> typing.Generator[str, None, None]:
+        """Get listing of documents based on manifest in lexicographical order, as listed from Ceph."""
+        if limit is not None and limit <= 0:
+            return
+
+        document_ids = sorted(
+            document_id
+            for document_id in self.get_manifest_document_listing()
+            if document_id.startswith(prefix) and (start_after is None or document_id > start_after)
+        )
+        yield from document_ids[:limit]
+
+    def get_document_count(self, prefix: str = "") -> int:
+        """Get number of documents present, optionally only documents with ids starting with the given prefix.
 
-    def get_document_count(self) -> int:
-        """Get number of documents present."""
-        return len(tuple(self.get_document_listing()))
+        Documents are counted based on manifest if it is enabled.
+        """
+        if self.manifest_enabled:
+            return sum(1 for document_id in self.get_manifest_document_listing() if document_id.startswith(prefix))
+
+        return self.ceph.get_document_count(prefix=prefix)
 
     def store_document(self, document: dict) -> str:
         """Store the given document in Ceph."""
@@ -96,17 +148,159 @@ class ResultStorageBase(StorageBase):
                 raise SchemaError("Failed to validate document schema") from exc
 
         document_id = self.get_document_id(document)
-        self.ceph.store_document(document, document_id)
+        if not self.manifest_enabled:
+            self.ceph.store_document(document, document_id)
+            return document_id
+
+        blob = self.ceph.encode_document(document)
+        self.ceph.store_encoded_document(blob, document_id)
+        # The entry is written once the document is stored so that the manifest never lists missing documents.
+        self._store_manifest_entry(document_id, document, len(blob))
         return document_id
 
+    def _store_manifest_entry(self, document_id: str, document: dict, size: int) -> None:
+        """Store manifest entry of the given document to the journal of the current day."""
+        metadata = document.get("metadata") or {}
+        entry = {
+            "document_id": document_id,
+            "size": size,
+            "datetime": metadata.get("datetime"),
+            "analyzer_version": metadata.get("analyzer_version"),
+        }
+        self._get_manifest_ceph().store_document(
+            entry, f"{self._MANIFEST_JOURNAL}/{self._get_manifest_day()}/{document_id}"
+        )
+
     def retrieve_document(self, document_id: str) -> dict:
         """Retrieve a document from Ceph by its id."""
         return self.ceph.retrieve_document(document_id)
 
-    def iterate_results(self) -> typing.Generator[tuple, None, None]:
-        """Iterate over results available in the Ceph."""
-        return self.ceph.iterate_results()
+    def retrieve_document_streamed(self, document_id: str) -> dict:
+        """Retrieve a document from Ceph by its id, sections in STREAMED_DOCUMENT_PATHS are parsed incrementally."""
+        return self.ceph.retrieve_document_streamed(document_id, self.STREAMED_DOCUMENT_PATHS)
+
+    def retrieve_many(
+        self,
+        document_ids: typing.Iterable[str],
+        *,
+        concurrency: typing.Optional[int] = None,
+        max_in_flight_bytes: typing.Optional[int] = None,
+    ) -> typing.Generator[typing.Tuple[str, dict], None, None]:
+        """Retrieve documents from Ceph concurrently, yield pairs of document id and document as retrieved."""
+        return self.ceph.retrieve_many(
+            document_ids, concurrency=concurrency, max_in_flight_bytes=max_in_flight_bytes
+        )
+
+    def iterate_results(self, concurrency: typing.Optional[int] = None) -> typing.Generator[tuple, None, None]:
+        """Iterate over results available in the Ceph, retrieve them concurrently if concurrency is provided."""
+        return self.ceph.iterate_results(concurrency=concurrency)
 
     def document_exists(self, document_id: str) -> bool:
         """Check if the there is an object with the given key in bucket."""
         return self.ceph.document_exists(document_id)
+
+    @staticmethod
+    def _get_manifest_day() -> datetime.date:
+        """Get day to which manifest entries of documents stored now belong."""
+        return datetime.datetime.utcnow().date()
+
+    def _iterate_manifest_days(
+        self, directory: str, since: typing.Optional[datetime.date], until: typing.Optional[datetime.date]
+    ) -> typing.Generator[typing.Tuple[datetime.date, str], None, None]:
+        """Iterate over keys in the given manifest directory with day they belong to, in the given range of days."""
+        for key in self._get_manifest_ceph().get_document_listing(prefix=f"{directory}/"):
+            day = datetime.datetime.strptime(key.split("/", maxsplit=2)[1], "%Y-%m-%d").date()
+            if (since is None or day >= since) and (until is None or day < until):
+                yield day, key
+
+    def iterate_manifest(
+        self, since: typing.Optional[datetime.date] = None, until: typing.Optional[datetime.date] = None
+    ) -> typing.Generator[dict, None, None]:
+        """Iterate over manifest entries of documents stored in the given range of days, until is exclusive.
+
+        Entries compacted to daily shards are read one shard at a time, entries not compacted yet are read from
+        the journal. A document stored multiple times has an entry for each day it was stored on.
+        """
+        manifest_ceph = self._get_manifest_ceph()
+        for _, key in self._iterate_manifest_days(self._MANIFEST_SHARD, since, until):
+            yield from manifest_ceph.retrieve_document(key)["entries"]
+
+        journal = (key for _, key in self._iterate_manifest_days(self._MANIFEST_JOURNAL, since, until))
+        for _, entry in manifest_ceph.retrieve_many(journal):
+            yield entry
+
+    def get_manifest_document_listing(
+        self, since: typing.Optional[datetime.date] = None, until: typing.Optional[datetime.date] = None
+    ) -> typing.Generator[str, None, None]:
+        """Get listing of documents stored in the given range of days based on manifest, each id is listed once.
+
+        Unlike get_document_listing, documents are not listed in lexicographical order.
+        """
+        manifest_ceph = self._get_manifest_ceph()
+        seen = set()
+        for _, key in self._iterate_manifest_days(self._MANIFEST_SHARD, since, until):
+            for entry in manifest_ceph.retrieve_document(key)["entries"]:
+                if entry["document_id"] not in seen:
+                    seen.add(entry["document_id"])
+                    yield entry["document_id"]
+
+        # Journal keys carry document ids, there is no need to retrieve entries.
+        for _, key in self._iterate_manifest_days(self._MANIFEST_JOURNAL, since, until):
+            document_id = key.split("/", maxsplit=2)[2]
+            if document_id not in seen:
+                seen.add(document_id)
+                yield document_id
+
+    def get_manifest_document_count(
+        self, since: typing.Optional[datetime.date] = None, until: typing.Optional[datetime.date] = None
+    ) -> int:
+        """Get number of documents stored in the given range of days based on manifest."""
+        return sum(1 for _ in self.get_manifest_document_listing(since=since, until=until))
+
+    def compact_manifest(self, until: typing.Optional[datetime.date] = None) -> int:
+        """Compact journal entries of days before the given day (today by default) to daily shards.
+
+        Journal entries are removed once the shard is written, so compaction can be safely re-run if it fails.
+        Compaction should be run from a single place, entries written concurrently to the same day are lost
+        otherwise. Returns number of journal entries compacted.
+        """
+        until = until or self._get_manifest_day()
+        journal = {}
+        for day, key in self._iterate_manifest_days(self._MANIFEST_JOURNAL, None, until):
+            journal.setdefault(day, []).append(key)
+
+        manifest_ceph = self._get_manifest_ceph()
+        compacted = 0
+        for day, keys in sorted(journal.items()):
+            shard_key = f"{self._MANIFEST_SHARD}/{day}"
+            try:
+                shard = manifest_ceph.retrieve_document(shard_key)
+            except NotFoundError:
+                shard = {"entries": []}
+
+            entries = {entry["document_id"]: entry for entry in shard["entries"]}
+
+            for _, entry in manifest_ceph.retrieve_many(keys):
+                entries[entry["document_id"]] = entry
+
+            shard["entries"] = sorted(entries.values(), key=lambda entry: entry["document_id"])
+            manifest_ceph.store_document(shard, shard_key)
+            manifest_ceph.delete_documents(keys)
+            compacted += len(keys)
+
+        return compacted
+
+    def index_manifest(self) -> int:
+        """Write manifest entries of documents not listed in manifest (e.g. stored before it was enabled).
+
+        Entries are written to the journal of the current day. Returns number of documents indexed.
+        """
+        indexed = set(self.get_manifest_document_listing())
+        sizes = {
+            document_id: size for document_id, size in self.ceph.iterate_document_sizes() if document_id not in indexed
+        }
+
+        for document_id, document in self.ceph.retrieve_many(sizes):
+            self._store_manifest_entry(document_id, document, sizes[document_id])
+
+        return len(sizes)
@@ -20,18 +20,30 @@
 import logging
 import json
 import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import FIRST_COMPLETED
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import wait
 from pathlib import Path
+from typing import Any
+from typing import Callable
 from typing import Dict
+from typing import Generator
 from typing import Tuple
 from typing import List
 from typing import Optional
 
+import attr
 from amun import get_inspection_build_log
 from amun import get_inspection_job_log
 from amun import get_inspection_specification
 from amun import get_inspection_status
 from amun import is_inspection_finished
 from amun import has_inspection_job
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm.exc import NoResultFound
 
 from .solvers import SolverResultsStore
 from .analyses import AnalysisResultsStore
@@ -41,219 +53,429 @@ from .inspections import InspectionResultsStore
 from .provenance import ProvenanceResultsStore
 from .dependency_monkey_reports import DependencyMonkeyReportsStore
 from .graph import GraphDatabase
+from .result_base import ResultStorageBase
 
 _LOGGER = logging.getLogger(__name__)
 
+# Number of attempts to sync a document in a pipelined sync, concurrently running sync workers can create
+# the same records and transaction of one of them is rolled back in such cases.
+_SYNC_ATTEMPTS = 5
+_CONCURRENT_WRITE_ERRORS = (IntegrityError, NoResultFound, OperationalError)
 
-def sync_adviser_documents(
-    document_ids: Optional[List[str]] = None,
-    force: bool = False,
-    graceful: bool = False,
-    graph: Optional[GraphDatabase] = None,
-    is_local: bool = False,
-) -> tuple:
-    """Sync adviser documents into graph."""
-    if is_local and not document_ids:
-        raise ValueError(
-            "Cannot sync documents from local directory without explicitly specifying a list of documents to be synced"
-        )
 
-    if not graph:
-        graph = GraphDatabase()
-        graph.connect()
+@attr.s(slots=True)
+class SyncCheckpoint:
+    """A checkpoint of a sync going through documents listed on Ceph, persisted in a local file.
 
-    if not is_local:
-        adviser_store = AdvisersResultsStore()
-        adviser_store.connect()
+    Documents are listed in lexicographical order. The checkpoint keeps id of the last document for which all the
+    documents listed before it were processed, so a failed sync can be resumed by listing documents after it.
+    The file holds checkpoints of all document types, keyed by the name of the checkpoint.
+    """
 
-    processed, synced, skipped, failed = 0, 0, 0, 0
-    for document_id in document_ids or adviser_store.get_document_listing():
-        processed += 1
+    path = attr.ib(type=str)
+    name = attr.ib(type=str)
+    interval = attr.ib(type=int, default=100)
+    _pending = attr.ib(type=OrderedDict, factory=OrderedDict)
+    _last_processed = attr.ib(type=Optional[str], default=None)
+    _unsaved = attr.ib(type=int, default=0)
+
+    def _load_all(self) -> Dict[str, str]:
+        """Load all the checkpoints stored in the checkpoint file."""
+        try:
+            return json.loads(Path(self.path).read_text())
+        except FileNotFoundError:
+            return {}
+
+    def _store(self, document_id: Optional[str]) -> None:
+        """Store the checkpoint, replace the checkpoint file atomically."""
+        checkpoints = self._load_all()
+        if document_id is None:
+            checkpoints.pop(self.name, None)
+        else:
+            checkpoints[self.name] = document_id
 
-        if force or not graph.adviser_document_id_exist(os.path.basename(document_id)):
-            try:
-                if is_local:
-                    _LOGGER.debug("Loading document from a local file: %r", document_id)
-                    document = json.loads(Path(document_id).read_text())
-                else:
-                    _LOGGER.info(
-                        "Syncing adviser document from %r with id %r to graph",
-                        adviser_store.ceph.host,
-                        document_id
-                    )
-                    document = adviser_store.retrieve_document(document_id)
+        tmp_path = f"{self.path}.tmp"
+        Path(tmp_path).write_text(json.dumps(checkpoints, sort_keys=True, indent=2))
+        os.replace(tmp_path, self.path)
 
-                graph.sync_adviser_result(document)
-                synced += 1
-            except Exception:
-                if not graceful:
-                    raise
+    def load(self) -> Optional[str]:
+        """Load id of the last processed document, None if there is no checkpoint stored."""
+        self._last_processed = self._load_all().get(self.name)
+        return self._last_processed
 
-                _LOGGER.exception("Failed to sync adviser result with document id %r", document_id)
-                failed += 1
-        else:
-            _LOGGER.info(f"Sync of adviser document with id {document_id!r} skipped - already synced")
-            skipped += 1
+    def listed(self, document_id: str) -> None:
+        """Mark the given document as listed, documents have to be marked in the listing order."""
+        self._pending[document_id] = False
 
-    return processed, synced, skipped, failed
+    def processed(self, document_id: str) -> None:
+        """Mark the given listed document as processed, store checkpoint each interval documents."""
+        self._pending[document_id] = True
+        while self._pending and next(iter(self._pending.values())):
+            self._last_processed, _ = self._pending.popitem(last=False)
+            self._unsaved += 1
 
+        if self._unsaved >= self.interval:
+            self.save()
 
-def sync_solver_documents(
-    document_ids: Optional[List[str]] = None,
-    force: bool = False,
-    graceful: bool = False,
-    graph: Optional[GraphDatabase] = None,
-    is_local: bool = False,
+    def save(self) -> None:
+        """Store id of the last document processed with all the documents listed before it."""
+        if self._unsaved:
+            self._store(self._last_processed)
+            self._unsaved = 0
+
+    def clear(self) -> None:
+        """Remove the checkpoint once all the documents were processed."""
+        self._store(None)
+        self._pending.clear()
+        self._last_processed = None
+        self._unsaved = 0
+
+
+def _get_worker_count(workers: Optional[int], env_variable: str) -> Optional[int]:
+    """Get number of workers to be used in a sync pipeline stage, None if not configured."""
+    if workers is None:
+        workers = int(os.getenv(env_variable, 0)) or None
+
+    if workers is not None and workers < 1:
+        raise ValueError(f"Number of workers has to be a positive integer, got {workers!r}")
+
+    return workers
+
+
+def _sync_documents(
+    document_ids: Optional[List[str]],
+    *,
+    store_class: type,
+    document_type: str,
+    document_ids_all: str,
+    sync_result: str,
+    force: bool,
+    graceful: bool,
+    graph: Optional[GraphDatabase],
+    is_local: bool,
+    download_workers: Optional[int],
+    sync_workers: Optional[int],
+    checkpoint_path: Optional[str],
+    streamed: bool = False,
 ) -> tuple:
-    """Sync solver documents into graph."""
+    """Sync documents of the given type into graph.
+
+    Documents are retrieved and synced one by one in the current thread unless number of download or sync workers
+    is configured. In that case documents are retrieved from Ceph and synced into graph in a pipeline - downloads
+    are done in a pool of download workers, each with its own store adapter, and documents retrieved are synced
+    by a pool of sync workers, each with its own database adapter.
+
+    If a checkpoint file is provided, the sync of documents listed on Ceph is resumed from the checkpoint and
+    the checkpoint is stored as documents are processed. The checkpoint is removed once the sync finishes.
+
+    If streamed, large sections of documents retrieved from Ceph are parsed incrementally as they are synced.
+    """
     if is_local and not document_ids:
         raise ValueError(
             "Cannot sync documents from local directory without explicitly specifying a list of documents to be synced"
         )
 
+    download_workers = _get_worker_count(download_workers, "THOTH_STORAGES_SYNC_DOWNLOAD_WORKERS")
+    sync_workers = _get_worker_count(sync_workers, "THOTH_STORAGES_SYNC_WORKERS")
+    checkpoint_path = checkpoint_path or os.getenv("THOTH_STORAGES_SYNC_CHECKPOINT_PATH")
+
     if not graph:
         graph = GraphDatabase()
         graph.connect()
 
+    store = None
     if not is_local:
-        solver_store = SolverResultsStore()
-        solver_store.connect()
+        store = store_class()
+        store.connect()
 
     processed, synced, skipped, failed = 0, 0, 0, 0
-    for document_id in document_ids or solver_store.get_document_listing():
-        processed += 1
-        if force or not graph.solver_document_id_exist(os.path.basename(document_id)):
-            try:
-                if is_local:
-                    _LOGGER.debug("Loading document from a local file: %r", document_id)
-                    document = json.loads(Path(document_id).read_text())
-                else:
-                    _LOGGER.info(
-                        "Syncing solver document from %r with id %r to graph",
-                        solver_store.ceph.host,
-                        document_id
-                    )
-                    document = solver_store.retrieve_document(document_id)
 
-                graph.sync_solver_result(document)
-                synced += 1
-            except Exception:
-                if not graceful:
-                    raise
+    checkpoint = None
+    start_after = None
+    if checkpoint_path and not document_ids:
+        checkpoint = SyncCheckpoint(checkpoint_path, store.prefix)
+        start_after = checkpoint.load()
+        if start_after:
+            _LOGGER.info("Resuming sync of %s documents after document with id %r", document_type, start_after)
+
+    # Obtain documents already synced at once instead of querying the database for each document listed.
+    synced_document_ids = set()
+    if not force:
+        synced_document_ids = getattr(graph, document_ids_all)(
+            [os.path.basename(document_id) for document_id in document_ids] if document_ids else None
+        )
 
-                _LOGGER.exception("Failed to sync solver result with document id %r", document_id)
-                failed += 1
-        else:
-            _LOGGER.info(f"Sync of solver document with id {document_id!r} skipped - already synced")
-            skipped += 1
+    def to_sync() -> Generator[str, None, None]:
+        """Iterate over ids of documents which should be synced, account processed and skipped documents."""
+        nonlocal processed, skipped
 
-    return processed, synced, skipped, failed
+        for document_id in document_ids or store.get_document_listing(start_after=start_after):
+            processed += 1
+            if checkpoint:
+                checkpoint.listed(document_id)
 
+            if os.path.basename(document_id) not in synced_document_ids:
+                yield document_id
+            else:
+                _LOGGER.info(f"Sync of {document_type} document with id {document_id!r} skipped - already synced")
+                skipped += 1
+                if checkpoint:
+                    checkpoint.processed(document_id)
 
-def sync_analysis_documents(
-    document_ids: Optional[List[str]] = None,
-    force: bool = False,
-    graceful: bool = False,
-    graph: Optional[GraphDatabase] = None,
-    is_local: bool = False,
-) -> tuple:
-    """Sync image analysis documents into graph."""
-    if is_local and not document_ids:
-        raise ValueError(
-            "Cannot sync documents from local directory without explicitly specifying a list of documents to be synced"
-        )
+    def sync_finished(document_id: str, exc: Optional[Exception] = None) -> None:
+        """Account result of a document sync."""
+        nonlocal synced, failed
 
-    if not graph:
-        graph = GraphDatabase()
-        graph.connect()
+        if exc is not None:
+            if not graceful:
+                raise exc
 
-    if not is_local:
-        analysis_store = AnalysisResultsStore()
-        analysis_store.connect()
+            _LOGGER.error(
+                "Failed to sync %s result with document id %r", document_type, document_id, exc_info=exc
+            )
+            failed += 1
+        else:
+            synced += 1
 
-    processed, synced, skipped, failed = 0, 0, 0, 0
-    for document_id in document_ids or analysis_store.get_document_listing():
-        processed += 1
+        if checkpoint:
+            checkpoint.processed(document_id)
 
-        if force or not graph.analysis_document_id_exist(os.path.basename(document_id)):
+    def retrieve_document(document_store: Optional[ResultStorageBase], document_id: str) -> dict:
+        """Retrieve the given document from a local file or from Ceph."""
+        if is_local:
+            _LOGGER.debug("Loading document from a local file: %r", document_id)
+            return json.loads(Path(document_id).read_text())
+
+        _LOGGER.info(
+            "Syncing %s document from %r with id %r to graph", document_type, document_store.ceph.host, document_id
+        )
+        if streamed:
+            return document_store.retrieve_document_streamed(document_id)
+
+        return document_store.retrieve_document(document_id)
+
+    def sync_sequentially() -> None:
+        """Retrieve and sync documents one by one in the current thread."""
+        for document_id in to_sync():
             try:
-                if is_local:
-                    _LOGGER.debug("Loading document from a local file: %r", document_id)
-                    document = json.loads(Path(document_id).read_text())
-                else:
-                    _LOGGER.info(
-                        "Syncing analysis document from %r with id %r to graph",
-                        analysis_store.ceph.host,
-                        document_id,
+                document = retrieve_document(store, document_id)
+                getattr(graph, sync_result)(document)
+            except Exception as exc:
+                sync_finished(document_id, exc)
+            else:
+                sync_finished(document_id)
+
+    def sync_in_pipeline() -> None:
+        """Retrieve documents in download workers and sync them in sync workers."""
+        worker_state = threading.local()
+        worker_graphs = []
+        worker_graphs_lock = threading.Lock()
+
+        def download_worker_init() -> None:
+            """Instantiate a store adapter for a download worker."""
+            worker_state.store = None
+            if not is_local:
+                worker_state.store = store_class()
+                worker_state.store.connect()
+
+        def sync_worker_init() -> None:
+            """Instantiate a database adapter for a sync worker, configured the same way as the given adapter."""
+            worker_state.graph = attr.evolve(graph, engine=None, sessionmaker=None)
+            worker_state.graph.connect()
+            with worker_graphs_lock:
+                worker_graphs.append(worker_state.graph)
+
+        def download(document_id: str) -> dict:
+            """Retrieve document in a download worker."""
+            return retrieve_document(worker_state.store, document_id)
+
+        def sync(document: dict) -> None:
+            """Sync document in a sync worker, retry if the transaction clashed with a concurrent one."""
+            for attempt in range(1, _SYNC_ATTEMPTS + 1):
+                try:
+                    getattr(worker_state.graph, sync_result)(document)
+                    return
+                except _CONCURRENT_WRITE_ERRORS as exc:
+                    if attempt == _SYNC_ATTEMPTS:
+                        raise
+
+                    _LOGGER.warning(
+                        "Failed to sync %s document, this can be due to concurrent writes to database, "
+                        "retrying (attempt %d/%d): %s",
+                        document_type,
+                        attempt,
+                        _SYNC_ATTEMPTS,
+                        str(exc),
                     )
-                    document = analysis_store.retrieve_document(document_id)
 
-                graph.sync_analysis_result(document)
-                synced += 1
-            except Exception:
-                if not graceful:
-                    raise
+        # Keep number of documents downloaded and not yet synced bounded.
+        max_in_flight = 2 * ((download_workers or 1) + (sync_workers or 1))
+        in_flight: Dict[Any, Tuple[Callable, str]] = {}
 
-                _LOGGER.exception("Failed to sync analysis result with document id %r", document_id)
-                failed += 1
+        download_pool = ThreadPoolExecutor(
+            max_workers=download_workers or 1, thread_name_prefix="sync-download", initializer=download_worker_init
+        )
+        sync_pool = ThreadPoolExecutor(
+            max_workers=sync_workers or 1, thread_name_prefix="sync", initializer=sync_worker_init
+        )
+
+        def collect(timeout: Optional[float] = None) -> None:
+            """Collect finished downloads and syncs, pass downloaded documents to sync workers."""
+            done, _ = wait(in_flight, timeout=timeout, return_when=FIRST_COMPLETED)
+            for future in done:
+                stage, document_id = in_flight.pop(future)
+                exc = future.exception()
+                if exc is not None:
+                    sync_finished(document_id, exc)
+                elif stage is download:
+                    in_flight[sync_pool.submit(sync, future.result())] = (sync, document_id)
+                else:
+                    sync_finished(document_id)
+
+        try:
+            for document_id in to_sync():
+                in_flight[download_pool.submit(download, document_id)] = (download, document_id)
+                collect(timeout=0)
+                while len(in_flight) >= max_in_flight:
+                    collect()
+
+            while in_flight:
+                collect()
+        finally:
+            for future in in_flight:
+                future.cancel()
+
+            download_pool.shutdown(wait=True)
+            sync_pool.shutdown(wait=True)
+
+            for worker_graph in worker_graphs:
+                worker_graph.disconnect()
+
+    completed = False
+    try:
+        if download_workers is None and sync_workers is None:
+            sync_sequentially()
         else:
-            _LOGGER.info(f"Sync of analysis document with id {document_id!r} skipped - already synced")
-            skipped += 1
+            sync_in_pipeline()
+
+        completed = True
+    finally:
+        if checkpoint and completed:
+            # Document ids are not ordered by time of creation, the next sync goes through the whole listing.
+            checkpoint.clear()
+        elif checkpoint:
+            checkpoint.save()
 
     return processed, synced, skipped, failed
 
 
-def sync_package_analysis_documents(
+def sync_adviser_documents(
     document_ids: Optional[List[str]] = None,
     force: bool = False,
     graceful: bool = False,
     graph: Optional[GraphDatabase] = None,
     is_local: bool = False,
+    download_workers: Optional[int] = None,
+    sync_workers: Optional[int] = None,
+    checkpoint_path: Optional[str] = None,
 ) -> tuple:
-    """Sync package analysis documents into graph."""
-    if is_local and not document_ids:
-        raise ValueError(
-            "Cannot sync documents from local directory without explicitly specifying a list of documents to be synced"
-        )
-
-    if not graph:
-        graph = GraphDatabase()
-        graph.connect()
+    """Sync adviser documents into graph."""
+    return _sync_documents(
+        document_ids,
+        store_class=AdvisersResultsStore,
+        document_type="adviser",
+        document_ids_all="get_adviser_document_ids_all",
+        sync_result="sync_adviser_result",
+        force=force,
+        graceful=graceful,
+        graph=graph,
+        is_local=is_local,
+        download_workers=download_workers,
+        sync_workers=sync_workers,
+        checkpoint_path=checkpoint_path,
+    )
 
-    if not is_local:
-        package_analysis_store = PackageAnalysisResultsStore()
-        package_analysis_store.connect()
 
-    processed, synced, skipped, failed = 0, 0, 0, 0
-    for document_id in document_ids or package_analysis_store.get_document_listing():
-        processed += 1
+def sync_solver_documents(
+    document_ids: Optional[List[str]] = None,
+    force: bool = False,
+    graceful: bool = False,
+    graph: Optional[GraphDatabase] = None,
+    is_local: bool = False,
+    download_workers: Optional[int] = None,
+    sync_workers: Optional[int] = None,
+    checkpoint_path: Optional[str] = None,
+) -> tuple:
+    """Sync solver documents into graph."""
+    return _sync_documents(
+        document_ids,
+        store_class=SolverResultsStore,
+        document_type="solver",
+        document_ids_all="get_solver_document_ids_all",
+        sync_result="sync_solver_result",
+        force=force,
+        graceful=graceful,
+        graph=graph,
+        is_local=is_local,
+        download_workers=download_workers,
+        sync_workers=sync_workers,
+        checkpoint_path=checkpoint_path,
+    )
 
-        if force or not graph.package_analysis_document_id_exist(os.path.basename(document_id)):
-            try:
-                if is_local:
-                    _LOGGER.debug("Loading document from a local file: %r", document_id)
-                    document = json.loads(Path(document_id).read_text())
-                else:
-                    _LOGGER.info(
-                        "Syncing package analysis document from %r with id %r to graph",
-                        package_analysis_store.ceph.host,
-                        document_id,
-                    )
-                    document = package_analysis_store.retrieve_document(document_id)
 
-                graph.sync_package_analysis_result(document)
-                synced += 1
-            except Exception:
-                if not graceful:
-                    raise
+def sync_analysis_documents(
+    document_ids: Optional[List[str]] = None,
+    force: bool = False,
+    graceful: bool = False,
+    graph: Optional[GraphDatabase] = None,
+    is_local: bool = False,
+    download_workers: Optional[int] = None,
+    sync_workers: Optional[int] = None,
+    checkpoint_path: Optional[str] = None,
+) -> tuple:
+    """Sync image analysis documents into graph."""
+    return _sync_documents(
+        document_ids,
+        store_class=AnalysisResultsStore,
+        document_type="analysis",
+        document_ids_all="get_analysis_document_ids_all",
+        sync_result="sync_analysis_result",
+        force=force,
+        graceful=graceful,
+        graph=graph,
+        is_local=is_local,
+        download_workers=download_workers,
+        sync_workers=sync_workers,
+        checkpoint_path=checkpoint_path,
+        streamed=True,
+    )
 
-                _LOGGER.exception("Failed to sync package analysis result with document id %r", document_id)
-                failed += 1
-        else:
-            _LOGGER.info(f"Sync of package analysis document with id {document_id!r} skipped - already synced")
-            skipped += 1
 
-    return processed, synced, skipped, failed
+def sync_package_analysis_documents(
+    document_ids: Optional[List[str]] = None,
+    force: bool = False,
+    graceful: bool = False,
+    graph: Optional[GraphDatabase] = None,
+    is_local: bool = False,
+    download_workers: Optional[int] = None,
+    sync_workers: Optional[int] = None,
+    checkpoint_path: Optional[str] = None,
+) -> tuple:
+    """Sync package analysis documents into graph."""
+    return _sync_documents(
+        document_ids,
+        store_class=PackageAnalysisResultsStore,
+        document_type="package analysis",
+        document_ids_all="get_package_analysis_document_ids_all",
+        sync_result="sync_package_analysis_result",
+        force=force,
+        graceful=graceful,
+        graph=graph,
+        is_local=is_local,
+        download_workers=download_workers,
+        sync_workers=sync_workers,
+        checkpoint_path=checkpoint_path,
+    )
 
 
 def sync_provenance_checker_documents(
@@ -262,51 +484,25 @@ def sync_provenance_checker_documents(
     graceful: bool = False,
     graph: Optional[GraphDatabase] = None,
     is_local: bool = False,
+    download_workers: Optional[int] = None,
+    sync_workers: Optional[int] = None,
+    checkpoint_path: Optional[str] = None,
 ) -> tuple:
     """Sync provenance check documents into graph."""
-    if is_local and not document_ids:
-        raise ValueError(
-            "Cannot sync documents from local directory without explicitly specifying a list of documents to be synced"
-        )
-
-    if not graph:
-        graph = GraphDatabase()
-        graph.connect()
-
-    if not is_local:
-        provenance_check_store = ProvenanceResultsStore()
-        provenance_check_store.connect()
-
-    processed, synced, skipped, failed = 0, 0, 0, 0
-    for document_id in document_ids or provenance_check_store.get_document_listing():
-        processed += 1
-
-        if force or not graph.provenance_checker_document_id_exist(os.path.basename(document_id)):
-            try:
-                if is_local:
-                    _LOGGER.debug("Loading document from a local file: %r", document_id)
-                    document = json.loads(Path(document_id).read_text())
-                else:
-                    _LOGGER.info(
-                        "Syncing provenance-checker document from %r with id %r to graph",
-                        provenance_check_store.ceph.host,
-                        document_id,
-                    )
-                    document = provenance_check_store.retrieve_document(document_id)
-
-                graph.sync_provenance_checker_result(document)
-                synced += 1
-            except Exception:
-                if not graceful:
-                    raise
-
-                _LOGGER.exception("Failed to sync provenance-checker result with document id %r", document_id)
-                failed += 1
-        else:
-            _LOGGER.info(f"Sync of provenance-checker document with id {document_id!r} skipped - already synced")
-            skipped += 1
-
-    return processed, synced, skipped, failed
+    return _sync_documents(
+        document_ids,
+        store_class=ProvenanceResultsStore,
+        document_type="provenance-checker",
+        document_ids_all="get_provenance_checker_document_ids_all",
+        sync_result="sync_provenance_checker_result",
+        force=force,
+        graceful=graceful,
+        graph=graph,
+        is_local=is_local,
+        download_workers=download_workers,
+        sync_workers=sync_workers,
+        checkpoint_path=checkpoint_path,
+    )
 
 
 def sync_dependency_monkey_documents(
@@ -315,51 +511,25 @@ def sync_dependency_monkey_documents(
     graceful: bool = False,
     graph: Optional[GraphDatabase] = None,
     is_local: bool = False,
+    download_workers: Optional[int] = None,
+    sync_workers: Optional[int] = None,
+    checkpoint_path: Optional[str] = None,
 ) -> tuple:
     """Sync dependency monkey reports into graph database."""
-    if is_local and not document_ids:
-        raise ValueError(
-            "Cannot sync documents from local directory without explicitly specifying a list of documents to be synced"
-        )
-
-    if not graph:
-        graph = GraphDatabase()
-        graph.connect()
-
-    if not is_local:
-        dependency_monkey_reports_store = DependencyMonkeyReportsStore()
-        dependency_monkey_reports_store.connect()
-
-    processed, synced, skipped, failed = 0, 0, 0, 0
-    for document_id in document_ids or dependency_monkey_reports_store.get_document_listing():
-        processed += 1
-
-        if force or not graph.dependency_monkey_document_id_exist(os.path.basename(document_id)):
-            try:
-                if is_local:
-                    _LOGGER.debug("Loading document from a local file: %r", document_id)
-                    document = json.loads(Path(document_id).read_text())
-                else:
-                    _LOGGER.info(
-                        f"Syncing dependency monkey report document from %r with id %r to graph",
-                        dependency_monkey_reports_store.ceph.host,
-                        document_id,
-                    )
-                    document = dependency_monkey_reports_store.retrieve_document(document_id)
-
-                graph.sync_dependency_monkey_result(document)
-                synced += 1
-            except Exception:
-                if not graceful:
-                    raise
-
-                _LOGGER.exception("Failed to sync dependency-monkey result with document id %r", document_id)
-                failed += 1
-        else:
-            _LOGGER.info(f"Sync of dependency-monkey document with id {document_id!r} skipped - already synced")
-            skipped += 1
-
-    return processed, synced, skipped, failed
+    return _sync_documents(
+        document_ids,
+        store_class=DependencyMonkeyReportsStore,
+        document_type="dependency-monkey",
+        document_ids_all="get_dependency_monkey_document_ids_all",
+        sync_result="sync_dependency_monkey_result",
+        force=force,
+        graceful=graceful,
+        graph=graph,
+        is_local=is_local,
+        download_workers=download_workers,
+        sync_workers=sync_workers,
+        checkpoint_path=checkpoint_path,
+    )
 
 
 def sync_inspection_documents(
@@ -470,10 +640,16 @@ def sync_documents(
     inspection_only_graph_sync: bool = False,
     inspection_only_ceph_sync: bool = False,
     is_local: bool = False,
+    download_workers: Optional[int] = None,
+    sync_workers: Optional[int] = None,
+    checkpoint_path: Optional[str] = None,
 ) -> Dict[str, Tuple[int, int, int, int]]:
     """Sync documents based on document type.
 
-    If no list of document ids is provided, all documents will be synced.
+    If no list of document ids is provided, all documents will be synced. Documents stored as results of jobs
+    can be synced in a pipeline, number of workers retrieving documents from Ceph and number of workers
+    syncing documents to graph are configured using download_workers and sync_workers. If checkpoint_path
+    is provided, a failed sync of all the documents is resumed from the last checkpoint stored in the given file.
     >>> from thoth.storages.sync import sync_documents
     >>> sync_documents(["adviser-efa7213babd12911", "package-extract-f8e354d9597a1203"])
     """
@@ -482,48 +658,59 @@ def sync_documents(
     if inspection_only_ceph_sync and inspection_only_graph_sync:
         raise ValueError("Parameters `inspection_only_ceph_sync' and `inspection_only_graph_sync' are disjoint")
 
-    for document_id in document_ids or [None] * len(_HANDLERS_MAPPING):
-        for document_prefix, handler in _HANDLERS_MAPPING.items():
-            # Basename for local syncs, document_id should not have slash otherwise.
-            if document_id is None or os.path.basename(document_id).startswith(document_prefix):
-                to_sync_document_id = [document_id] if document_id is not None else None
-                if handler == sync_inspection_documents:
-                    # A special case with additional arguments to obtain results from Amun API.
-                    if amun_api_url is None:
-                        error_msg = f"Cannot sync document with id {document_id!r} without specifying Amun API URL"
-                        if not graceful:
-                            raise ValueError(error_msg)
-
-                        _LOGGER.error(error_msg)
-
-                    stats_change = handler(
-                        to_sync_document_id,
-                        amun_api_url=amun_api_url,
-                        force=force,
-                        graceful=graceful,
-                        graph=graph,
-                        only_ceph_sync=inspection_only_ceph_sync,
-                        only_graph_sync=inspection_only_graph_sync,
-                        is_local=is_local,
-                    )
-                else:
-                    stats_change = handler(
-                        to_sync_document_id,
-                        force=force,
-                        graceful=graceful,
-                        graph=graph,
-                        is_local=is_local
-                    )
-
-                stats[document_prefix] = tuple(map(sum, zip(stats[document_prefix], stats_change)))
-                if document_id is not None:
+    # Group documents by their type so that each handler syncs all the documents of the given type at once.
+    to_sync: Dict[str, Optional[List[str]]] = {}
+    if document_ids:
+        for document_id in document_ids:
+            for document_prefix in _HANDLERS_MAPPING:
+                # Basename for local syncs, document_id should not have slash otherwise.
+                if os.path.basename(document_id).startswith(document_prefix):
+                    to_sync.setdefault(document_prefix, []).append(document_id)
                     break
-        else:
-            if document_id is not None:
+            else:
                 error_msg = f"No handler defined for document identifier {document_id!r}"
                 if not graceful:
                     raise ValueError(error_msg)
 
                 _LOGGER.error(error_msg)
+    else:
+        to_sync = dict.fromkeys(_HANDLERS_MAPPING)
+
+    for document_prefix, to_sync_document_ids in to_sync.items():
+        handler = _HANDLERS_MAPPING[document_prefix]
+        if handler == sync_inspection_documents:
+            # A special case with additional arguments to obtain results from Amun API.
+            if amun_api_url is None:
+                error_msg = (
+                    f"Cannot sync inspection documents {to_sync_document_ids or []!r} without specifying Amun API URL"
+                )
+                if not graceful:
+                    raise ValueError(error_msg)
+
+                _LOGGER.error(error_msg)
+
+            stats_change = handler(
+                to_sync_document_ids,
+                amun_api_url=amun_api_url,
+                force=force,
+                graceful=graceful,
+                graph=graph,
+                only_ceph_sync=inspection_only_ceph_sync,
+                only_graph_sync=inspection_only_graph_sync,
+                is_local=is_local,
+            )
+        else:
+            stats_change = handler(
+                to_sync_document_ids,
+                force=force,
+                graceful=graceful,
+                graph=graph,
+                is_local=is_local,
+                download_workers=download_workers,
+                sync_workers=sync_workers,
+                checkpoint_path=checkpoint_path,
+            )
+
+        stats[document_prefix] = tuple(map(sum, zip(stats[document_prefix], stats_change)))
 
     return stats